@@ -172,7 +172,7 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--controls",
-        nargs="*",
+        nargs="+",
         help="optional subset of control_ids to evaluate; if omitted, all controls are run",
     )
 
@@ -1,6 +1,6 @@
 # C:\4th\4th.GRC\policyengine\__init__.py
 
-from .core import evaluate
+from .core import evaluate, evaluate_stream
 from .models import EvalRequest, EvalResponse
 
-__all__ = ["evaluate", "EvalRequest", "EvalResponse"]
+__all__ = ["evaluate", "evaluate_stream", "EvalRequest", "EvalResponse"]
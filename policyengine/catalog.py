@@ -0,0 +1,158 @@
+"""
+In-memory profile catalog.
+
+Built once from PROFILES_DIR, then every lookup is served from memory:
+
+- entries sorted by id (the profile file stem, i.e. the profile_ref id)
+- inverted indexes standard -> ids and tag -> ids (case-insensitive)
+- keyset ("cursor") pagination over the sorted ids
+- a catalog digest plus a per-profile file digest, usable as ETags
+
+The catalog reads the same fields as scripts/render_profile_index.py and
+is tolerant of legacy profile layouts: any YAML mapping is listed, and
+`evaluable` says whether it validates as a PolicyProfile.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+from pydantic import ValidationError
+
+from . import profiles
+from .schema import PolicyProfile
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _as_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+def catalog_entry(path: Path, content: bytes) -> Optional[Dict[str, Any]]:
+    """Catalog entry for one profile file, or None if it is not a YAML mapping."""
+    try:
+        data = yaml.safe_load(content)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    meta = data.get("metadata") if isinstance(data.get("metadata"), dict) else {}
+    try:
+        PolicyProfile.model_validate(data)
+        evaluable = True
+    except ValidationError:
+        evaluable = False
+
+    version = data.get("version")
+    rules = data.get("rules") if isinstance(data.get("rules"), list) else []
+    return {
+        "id": path.stem,
+        "profile_id": data.get("profile_id") or data.get("profile") or path.stem,
+        "profile_ref": f"{path.stem}@{version}" if version else path.stem,
+        "name": meta.get("title") or data.get("name"),
+        "version": str(version) if version is not None else None,
+        "description": meta.get("description") or data.get("description") or "",
+        "standards": _as_list(meta.get("standards")),
+        "tags": _as_list(meta.get("tags")),
+        "rules": [str(r.get("id")) for r in rules if isinstance(r, dict) and r.get("id")],
+        "evaluable": evaluable,
+        "digest": hashlib.sha256(content).hexdigest(),
+    }
+
+
+def encode_cursor(last_id: str) -> str:
+    return base64.urlsafe_b64encode(last_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Raises ValueError for a malformed cursor."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return base64.b64decode(padded.encode("ascii"), altchars=b"-_", validate=True).decode(
+            "utf-8"
+        )
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+class ProfileCatalog:
+    """Immutable, indexed snapshot of the profile catalog."""
+
+    def __init__(self, entries: Iterable[Dict[str, Any]]) -> None:
+        self._entries: Dict[str, Dict[str, Any]] = {e["id"]: e for e in entries}
+        self._ids: List[str] = sorted(self._entries)
+        self._by_standard: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        for entry in self._entries.values():
+            for standard in entry["standards"]:
+                self._by_standard.setdefault(standard.lower(), set()).add(entry["id"])
+            for tag in entry["tags"]:
+                self._by_tag.setdefault(tag.lower(), set()).add(entry["id"])
+        digest = hashlib.sha256()
+        for entry_id in self._ids:
+            digest.update(f"{entry_id}:{self._entries[entry_id]['digest']}\n".encode("utf-8"))
+        self.digest = digest.hexdigest()
+
+    @classmethod
+    def build(cls, profiles_dir: Optional[Path] = None) -> "ProfileCatalog":
+        root = Path(profiles_dir or profiles.PROFILES_DIR)
+        entries = []
+        for path in sorted(root.glob("*.yaml")):
+            entry = catalog_entry(path, path.read_bytes())
+            if entry is not None:
+                entries.append(entry)
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(profile_id)
+
+    def standards(self) -> List[str]:
+        return sorted(self._by_standard)
+
+    def tags(self) -> List[str]:
+        return sorted(self._by_tag)
+
+    def _matching_ids(self, standards: Iterable[str], tags: Iterable[str]) -> List[str]:
+        selected: Optional[Set[str]] = None
+        for index, values in ((self._by_standard, standards), (self._by_tag, tags)):
+            for value in values:
+                ids = index.get(value.lower(), set())
+                selected = set(ids) if selected is None else selected & ids
+        if selected is None:
+            return self._ids
+        return sorted(selected)
+
+    def query(
+        self,
+        standards: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Entries matching every given standard and tag, one page at a time.
+
+        Returns (entries, next_cursor); next_cursor is None on the last page.
+        Raises ValueError for a malformed cursor.
+        """
+        ids = self._matching_ids(standards, tags)
+        start = bisect.bisect_right(ids, decode_cursor(cursor)) if cursor else 0
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        page = ids[start : start + limit]
+        next_cursor = encode_cursor(page[-1]) if start + limit < len(ids) else None
+        return [self._entries[i] for i in page], next_cursor
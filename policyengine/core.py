@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import contextvars
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from . import hot_reload, timing
+from .evidence import resolve_evidence
 from .exceptions import EvaluationError, ProfileNotFoundError
 from .models import Finding
 from .profiles import load_profile_by_ref
-from .rules_engine import run_rules
+from .rules_engine import iter_rules, run_rules, select_rules
 from .schema import PolicyProfile
 
 
@@ -15,6 +18,7 @@ def evaluate(
     profile_ref: str,
     context: Dict[str, Any],
     evidence: Dict[str, Any],
+    controls: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     Core evaluation entrypoint used by:
@@ -22,12 +26,84 @@ def evaluate(
     - scripts/run_agentic_demo.py
     - any external tools calling PolicyEngine
 
-    It loads the profile, runs all rules, and returns a dict that matches
-    the EvalResponse schema.
+    It loads the profile, fetches every evidence spec in `evidence` in
+    parallel (policyengine.evidence.resolve_evidence), runs all rules (or
+    only those for `controls`, plus their dependencies), and returns a
+    dict that matches the EvalResponse schema. Phases (profile, evidence,
+    rules, scoring) are timed when the caller records with
+    policyengine.timing.record().
     """
+    timer = timing.current()
+    # Keep profile and rule lookups on one registry if it is hot-swapped meanwhile.
+    with hot_reload.pinned():
+        with timer.phase("profile"):
+            profile = _load_profile(profile_ref)
+            positions = select_rules(profile, controls)
+        evidence = resolve_evidence(evidence or {})
+
+        # Run rules for this profile
+        with timer.phase("rules"):
+            findings: List[Finding] = run_rules(
+                profile=profile,
+                context=context or {},
+                evidence=evidence,
+                positions=positions,
+            )
+    with timer.phase("scoring"):
+        return _build_result(profile_ref, profile, findings)
+
+
+def evaluate_stream(
+    profile_ref: str,
+    context: Dict[str, Any],
+    evidence: Dict[str, Any],
+    max_workers: int = 8,
+    controls: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Streaming variant of evaluate(): runs the rules concurrently and yields
+    ("finding", Finding) as each rule completes, then ("summary", result)
+    with the same EvalResponse-shaped dict evaluate() returns (findings in
+    profile order).
+
+    The profile is loaded, `controls` and evidence specs resolved before
+    this returns, so ProfileNotFoundError, UnknownControlError,
+    EvidenceResolutionError and EvaluationError are raised to the caller
+    rather than mid-stream.
+    """
+    # Pin the registry in a dedicated context: the stream may be consumed
+    # from other threads, and every rule runs in a copy of this context.
+    pinned_ctx = contextvars.copy_context()
+    pinned_ctx.run(hot_reload.pin)
+    profile = pinned_ctx.run(_load_profile, profile_ref)
+    positions = select_rules(profile, controls)
+    evidence = resolve_evidence(evidence or {})
+    rules = pinned_ctx.run(iter_rules, profile, context or {}, evidence, max_workers, positions)
+    return _stream(profile_ref, profile, pinned_ctx, rules)
+
+
+def _stream(
+    profile_ref: str,
+    profile: PolicyProfile,
+    pinned_ctx: contextvars.Context,
+    rules: Iterator[Tuple[int, Finding]],
+) -> Iterator[Tuple[str, Any]]:
+    completed: Dict[int, Finding] = {}
+    while True:
+        item = pinned_ctx.run(next, rules, None)
+        if item is None:
+            break
+        position, finding = item
+        completed[position] = finding
+        yield "finding", finding
+    findings = [completed[position] for position in sorted(completed)]
+    yield "summary", _build_result(profile_ref, profile, findings)
+
+
+def _load_profile(profile_ref: str) -> PolicyProfile:
     try:
-        profile: PolicyProfile = load_profile_by_ref(profile_ref)
-    except ProfileNotFoundError as exc:
+        return load_profile_by_ref(profile_ref)
+    except ProfileNotFoundError:
         # Re-raise so API layer can turn into a 404
         raise
     except Exception as exc:  # noqa: BLE001
@@ -36,13 +112,11 @@ def evaluate(
             f"Failed to load profile '{profile_ref}': {exc}"
         ) from exc
 
-    # Run rules for this profile
-    findings: List[Finding] = run_rules(
-        profile=profile,
-        context=context or {},
-        evidence=evidence or {},
-    )
 
+def _build_result(
+    profile_ref: str, profile: PolicyProfile, findings: List[Finding]
+) -> Dict[str, Any]:
+    """Score the findings and assemble the EvalResponse-shaped dict."""
     finding_count = len(findings)
 
     # Simple scoring: all pass => 1.0, any warn/fail => 0.8/0.5, etc.
@@ -0,0 +1,549 @@
+"""
+Evidence resolution for the PolicyEngine.
+
+Agents and profiles describe evidence as *specs* rather than payloads
+(see agents/tools/evidence_tool.discover_evidence), e.g.:
+
+    {"type": "inline",   "payload": {...}}
+    {"type": "json",     "payload": {...}}          # or {"path": "..."}
+    {"type": "blob_uri", "uri": "https://.../model_card.json"}
+    {"type": "blob_uri", "pattern": "evidence/<system_id>/logs/*.json"}
+    {"type": "purview",  "uri": "purview://assets?system=<system_id>"}
+
+`resolve(specs)` returns one resolved item (a dict) per spec, in order.
+`resolve_evidence(evidence)` is what `core.evaluate` calls: it resolves
+every spec among an evaluation's evidence values in one `resolve` call and
+replaces each spec by its data.
+Resolution is asyncio-based: glob patterns are expanded first, then every
+file behind every spec is fetched concurrently, bounded by a global
+concurrency limit and a per-backend limit. Each backend keeps its own
+connection pool. A spec that fails to resolve yields an item with an
+"error" key instead of failing the whole call.
+
+Backends:
+- LocalFileBackend: files under a root directory (default: repo root);
+                    locations outside the root are rejected
+- BlobBackend:      Azure Blob REST API (works against Azurite locally);
+                    absolute URLs outside its container are rejected
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+import weakref
+import xml.etree.ElementTree as ET
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from urllib.parse import quote, unquote, urlparse, urlsplit
+
+import httpx
+
+from . import timing
+from .evidence_cache import EvidenceCache, get_default_cache
+from .evidence_handles import EvidenceHandle, EvidenceSet
+from .exceptions import EvidenceResolutionError
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_BACKEND_CONNECTIONS = 8
+
+_GLOB_CHARS = "*?["
+
+SPEC_TYPES = frozenset({"inline", "json", "blob_uri", "file", "purview"})
+_SPEC_KEYS = ("payload", "uri", "path", "pattern")
+
+# backend name -> bytes fetched, for service metrics.
+_bytes_read: Dict[str, int] = {}
+_bytes_lock = threading.Lock()
+
+EvidenceSpec = Dict[str, Any]
+
+
+def _has_glob(pattern: str) -> bool:
+    return any(ch in pattern for ch in _GLOB_CHARS)
+
+
+def _static_prefix(pattern: str) -> str:
+    """Longest prefix of `pattern` before the first glob character."""
+    for i, ch in enumerate(pattern):
+        if ch in _GLOB_CHARS:
+            return pattern[:i]
+    return pattern
+
+
+def decode_payload(name: str, content: bytes) -> Dict[str, Any]:
+    """
+    Decode fetched bytes by file type.
+
+    JSON is parsed into "data"; NDJSON/JSONL into a list of records.
+    Other content (PDFs, images, ...) is described by size and sha256 only.
+    """
+    suffix = PurePosixPath(name).suffix.lower()
+    item: Dict[str, Any] = {"size": len(content)}
+    if suffix == ".json":
+        item["data"] = json.loads(content)
+    elif suffix in (".ndjson", ".jsonl"):
+        item["data"] = [json.loads(line) for line in content.splitlines() if line.strip()]
+    else:
+        item["sha256"] = hashlib.sha256(content).hexdigest()
+    return item
+
+
+class EvidenceBackend:
+    """
+    Base class for evidence storage backends.
+
+    Subclasses implement `list` (glob expansion) and `read`. Each backend
+    bounds its own in-flight operations with `max_concurrency`.
+    """
+
+    name = "base"
+
+    def __init__(self, max_concurrency: int = DEFAULT_BACKEND_CONNECTIONS) -> None:
+        self.max_concurrency = max_concurrency
+        self._semaphores: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the running loop; keep one per loop.
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    async def list(self, pattern: str) -> List[str]:
+        raise NotImplementedError
+
+    async def read(self, location: str) -> bytes:
+        raise NotImplementedError
+
+    async def fetch(self, location: str) -> bytes:
+        async with self._semaphore():
+            content = await self.read(location)
+        with _bytes_lock:
+            _bytes_read[self.name] = _bytes_read.get(self.name, 0) + len(content)
+        return content
+
+    async def aclose(self) -> None:
+        return None
+
+
+class LocalFileBackend(EvidenceBackend):
+    """Evidence stored on the local filesystem under `root`."""
+
+    name = "file"
+
+    def __init__(
+        self,
+        root: Optional[Path | str] = None,
+        max_concurrency: int = DEFAULT_BACKEND_CONNECTIONS,
+    ) -> None:
+        super().__init__(max_concurrency=max_concurrency)
+        self.root = (Path(root) if root else ROOT_DIR).resolve()
+
+    def path_for(self, location: str) -> Path:
+        """
+        Absolute path of `location`, which must lie under `root`.
+
+        Raises:
+            PermissionError: The location (after resolving "..", symlinks
+                and absolute paths) is outside `root`.
+        """
+        if location.startswith("file://"):
+            path = Path(urlparse(location).path)
+        else:
+            path = Path(location)
+            path = path if path.is_absolute() else self.root / path
+        resolved = path.resolve()
+        if not resolved.is_relative_to(self.root):
+            raise PermissionError(f"Evidence location outside the evidence root: {location}")
+        return resolved
+
+    async def list(self, pattern: str) -> List[str]:
+        if ".." in PurePosixPath(pattern).parts:
+            raise PermissionError(f"Evidence pattern outside the evidence root: {pattern}")
+
+        def _glob() -> List[str]:
+            return sorted(
+                p.relative_to(self.root).as_posix()
+                for p in self.root.glob(pattern)
+                if p.is_file() and p.resolve().is_relative_to(self.root)
+            )
+
+        return await asyncio.to_thread(_glob)
+
+    async def read(self, location: str) -> bytes:
+        return await asyncio.to_thread(self.path_for(location).read_bytes)
+
+
+class BlobBackend(EvidenceBackend):
+    """
+    Azure Blob Storage via the Blob REST API.
+
+    Works against a real storage account or a local Azurite emulator
+    (e.g. account_url="http://127.0.0.1:10000/devstoreaccount1"). A SAS
+    token, if given, is appended to every request. Only blobs of
+    `container` are read, so the token is never sent to another host or
+    container. One pooled httpx.AsyncClient is kept per event loop.
+
+    With an EvidenceCache, reads of previously fetched blobs are sent with
+    If-None-Match and a 304 is served from the cache.
+    """
+
+    name = "blob"
+
+    def __init__(
+        self,
+        account_url: str,
+        container: str,
+        *,
+        sas_token: Optional[str] = None,
+        max_concurrency: int = DEFAULT_BACKEND_CONNECTIONS,
+        timeout_seconds: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[EvidenceCache] = None,
+    ) -> None:
+        super().__init__(max_concurrency=max_concurrency)
+        self.cache = cache
+        self.account_url = account_url.rstrip("/")
+        self.container = container
+        self.sas_token = (sas_token or "").lstrip("?")
+        self.timeout = timeout_seconds
+        self._transport = transport
+        self._clients: "weakref.WeakKeyDictionary[Any, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                transport=self._transport,
+                headers={"x-ms-version": "2021-08-06"},
+            )
+            self._clients[loop] = client
+        return client
+
+    def _with_sas(self, params: Dict[str, str]) -> Dict[str, str]:
+        if self.sas_token:
+            for part in self.sas_token.split("&"):
+                key, _, value = part.partition("=")
+                params.setdefault(key, value)
+        return params
+
+    def blob_url(self, name: str) -> str:
+        return f"{self.account_url}/{self.container}/{quote(name)}"
+
+    def url_for(self, location: str) -> str:
+        """
+        Blob URL of `location`: a blob name, or an absolute URL that must lie
+        under `account_url/container/`.
+
+        Raises:
+            PermissionError: The location is a URL outside the container or
+                has ".." segments; it is never requested.
+        """
+        name = location
+        if "://" in location:
+            base = f"{self.account_url}/{self.container}/"
+            if not location.startswith(base):
+                raise PermissionError(f"Evidence location outside the blob container: {location}")
+            name = unquote(urlsplit(location.removeprefix(base)).path)
+        if not name or ".." in PurePosixPath(name).parts:
+            raise PermissionError(f"Evidence location outside the blob container: {location}")
+        return self.blob_url(name)
+
+    async def list(self, pattern: str) -> List[str]:
+        client = self._client()
+        prefix = _static_prefix(pattern)
+        names: List[str] = []
+        marker: Optional[str] = None
+        while True:
+            params = {"restype": "container", "comp": "list", "prefix": prefix}
+            if marker:
+                params["marker"] = marker
+            async with self._semaphore():
+                resp = await client.get(
+                    f"{self.account_url}/{self.container}", params=self._with_sas(params)
+                )
+            resp.raise_for_status()
+            root = ET.fromstring(resp.content)
+            names.extend(el.text or "" for el in root.iter("Name"))
+            marker = (root.findtext("NextMarker") or "").strip() or None
+            if not marker:
+                break
+        return sorted(n for n in names if fnmatch.fnmatchcase(n, pattern))
+
+    async def read(self, location: str) -> bytes:
+        url = self.url_for(location)
+        cached = await asyncio.to_thread(self.cache.lookup, url) if self.cache else None
+
+        headers = {"If-None-Match": cached[0]} if cached and cached[0] else {}
+        resp = await self._client().get(url, params=self._with_sas({}), headers=headers)
+        if resp.status_code == 304 and cached is not None:
+            self.cache.record_hit()
+            return cached[1]
+        resp.raise_for_status()
+
+        if self.cache is not None:
+            self.cache.record_miss()
+            await asyncio.to_thread(self.cache.store, url, resp.content, resp.headers.get("ETag"))
+        return resp.content
+
+    async def aclose(self) -> None:
+        """Close the clients of every loop; each is closed on its own loop."""
+        current = asyncio.get_running_loop()
+        clients = list(self._clients.items())
+        self._clients.clear()
+        for loop, client in clients:
+            if loop is current:
+                await client.aclose()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+            # A stopped loop's connections cannot be closed from here; they go with it.
+
+
+def evidence_bytes_read() -> Dict[str, int]:
+    """Bytes fetched so far in this process, by backend name."""
+    with _bytes_lock:
+        return dict(_bytes_read)
+
+
+def default_blob_backend() -> EvidenceBackend:
+    """
+    Backend for blob_uri specs, from the environment:
+
+    - EVIDENCE_BLOB_ACCOUNT_URL / EVIDENCE_BLOB_CONTAINER / EVIDENCE_BLOB_SAS
+      select a BlobBackend (Azure or Azurite); EVIDENCE_CACHE_DIR enables
+      the shared on-disk evidence cache for it.
+    - Otherwise blob paths are read from EVIDENCE_ROOT (default: repo root).
+    """
+    account_url = os.getenv("EVIDENCE_BLOB_ACCOUNT_URL")
+    if account_url:
+        return BlobBackend(
+            account_url,
+            os.getenv("EVIDENCE_BLOB_CONTAINER", "evidence"),
+            sas_token=os.getenv("EVIDENCE_BLOB_SAS"),
+            cache=get_default_cache(),
+        )
+    return LocalFileBackend(os.getenv("EVIDENCE_ROOT") or None)
+
+
+class EvidenceResolver:
+    """
+    Resolve evidence specs concurrently across pluggable backends.
+
+    Args:
+        backends:
+            Mapping of spec type -> backend. "blob_uri" and "file" are
+            used for blob and local specs; other spec types (e.g. "purview")
+            can be plugged in the same way.
+        concurrency:
+            Maximum number of fetches in flight across all backends.
+        lazy:
+            If True, local JSON/NDJSON files are not read at all; their
+            items carry an EvidenceHandle in "data" instead (see
+            policyengine.evidence_handles).
+    """
+
+    def __init__(
+        self,
+        backends: Optional[Mapping[str, EvidenceBackend]] = None,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        lazy: bool = False,
+    ) -> None:
+        self.lazy = lazy
+        self.backends: Dict[str, EvidenceBackend] = dict(backends or {})
+        self.backends.setdefault("blob_uri", default_blob_backend())
+        self.backends.setdefault("file", LocalFileBackend())
+        self.concurrency = concurrency
+
+    def register_backend(self, spec_type: str, backend: EvidenceBackend) -> None:
+        self.backends[spec_type] = backend
+
+    def _backend_for(self, spec_type: str, location: str) -> Optional[EvidenceBackend]:
+        if location.startswith("file://"):
+            return self.backends.get("file")
+        return self.backends.get(spec_type)
+
+    async def _fetch(
+        self, backend: EvidenceBackend, location: str, limit: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        if self.lazy and isinstance(backend, LocalFileBackend):
+            path = backend.path_for(location)
+            if path.suffix.lower() in (".json", ".ndjson", ".jsonl"):
+                size = (await asyncio.to_thread(path.stat)).st_size
+                return {"uri": location, "size": size, "data": EvidenceHandle(path)}
+        async with limit:
+            content = await backend.fetch(location)
+        item = {"uri": location}
+        item.update(decode_payload(location, content))
+        return item
+
+    async def _resolve_one(
+        self, spec: Mapping[str, Any], limit: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        spec_type = str(spec.get("type") or "")
+        item: Dict[str, Any] = {"type": spec_type}
+        try:
+            if spec_type in ("inline", "json") and "payload" in spec:
+                item["data"] = spec["payload"]
+                return item
+
+            location = spec.get("uri") or spec.get("path")
+            pattern = spec.get("pattern")
+            backend = self._backend_for(
+                spec_type if spec_type != "json" else "file", str(location or "")
+            )
+            if backend is None:
+                item.update({"uri": location, "status": "unsupported"})
+                return item
+
+            if pattern:
+                item["pattern"] = pattern
+                names = await backend.list(pattern) if _has_glob(pattern) else [pattern]
+                item["items"] = list(
+                    await asyncio.gather(*(self._fetch(backend, n, limit) for n in names))
+                )
+                return item
+
+            if not location:
+                raise ValueError("evidence spec needs one of: payload, uri, path, pattern")
+            item.update(await self._fetch(backend, str(location), limit))
+            return item
+        except Exception as exc:  # noqa: BLE001
+            item["error"] = f"{type(exc).__name__}: {exc}"
+            for key in ("uri", "path", "pattern"):
+                if key in spec:
+                    item.setdefault(key, spec[key])
+            return item
+
+    async def resolve_async(self, specs: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        limit = asyncio.Semaphore(self.concurrency)
+        return list(await asyncio.gather(*(self._resolve_one(s, limit) for s in specs)))
+
+    async def aclose(self) -> None:
+        for backend in self.backends.values():
+            await backend.aclose()
+
+
+async def resolve_async(
+    specs: Sequence[Mapping[str, Any]],
+    *,
+    resolver: Optional[EvidenceResolver] = None,
+    lazy: bool = False,
+) -> List[Dict[str, Any]]:
+    """Async variant of `resolve` for callers already inside an event loop."""
+    if resolver is not None:
+        return await resolver.resolve_async(specs)
+    resolver = EvidenceResolver(lazy=lazy)
+    try:
+        return await resolver.resolve_async(specs)
+    finally:
+        await resolver.aclose()
+
+
+def is_spec(value: Any) -> bool:
+    """True if `value` is an evidence spec rather than evidence data."""
+    return (
+        isinstance(value, Mapping)
+        and value.get("type") in SPEC_TYPES
+        and any(key in value for key in _SPEC_KEYS)
+    )
+
+
+def _resolved_value(item: Mapping[str, Any]) -> Any:
+    if "error" in item:
+        location = item.get("uri") or item.get("path") or item.get("pattern") or ""
+        raise EvidenceResolutionError(str(location), item["error"])
+    if "items" in item:
+        return EvidenceSet(_resolved_value(sub) for sub in item["items"])
+    if item.get("status") == "unsupported":
+        return None
+    # Non-JSON files (PDFs, ...) are described by size and sha256 instead of data.
+    return item["data"] if "data" in item else {k: v for k, v in item.items() if k != "type"}
+
+
+def resolve_evidence(
+    evidence: Mapping[str, Any],
+    *,
+    resolver: Optional[EvidenceResolver] = None,
+) -> Dict[str, Any]:
+    """
+    Replace every evidence spec among `evidence` values with its data.
+
+    A value may be a spec or a list of specs; everything else is passed
+    through unchanged. All specs are fetched in a single concurrent
+    `resolve` call. A pattern spec, or a list of specs, becomes an
+    EvidenceSet of its files' data, which ops read as one record stream
+    (policyengine.evidence_handles.iter_records). Local JSON/NDJSON files
+    become lazy EvidenceHandles, so large files are streamed by the ops
+    instead of parsed up front.
+    Returns `evidence` itself when it holds no specs.
+
+    Raises:
+        EvidenceResolutionError: A spec could not be resolved.
+    """
+    specs: List[Mapping[str, Any]] = []
+    slots: Dict[str, Any] = {}
+    for name, value in evidence.items():
+        if is_spec(value):
+            slots[name] = len(specs)
+            specs.append(value)
+        elif isinstance(value, list) and value and all(is_spec(v) for v in value):
+            slots[name] = list(range(len(specs), len(specs) + len(value)))
+            specs.extend(value)
+    if not specs:
+        return dict(evidence)
+
+    items = resolve(specs, resolver=resolver, lazy=True)
+    resolved = dict(evidence)
+    for name, slot in slots.items():
+        if isinstance(slot, list):
+            resolved[name] = EvidenceSet(_resolved_value(items[i]) for i in slot)
+        else:
+            resolved[name] = _resolved_value(items[slot])
+    return resolved
+
+
+def resolve(
+    specs: Sequence[Mapping[str, Any]],
+    *,
+    resolver: Optional[EvidenceResolver] = None,
+    lazy: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Resolve evidence specs and return one dict per spec, in order.
+
+    Without `resolver`, a default one (with `lazy`) is created and closed
+    afterwards. Safe to call from synchronous code; if an event loop is
+    already running in this thread, resolution runs on a helper thread.
+    Time spent is recorded as the "evidence" phase of the active timing
+    recorder.
+    """
+    with timing.current().phase("evidence"):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(resolve_async(specs, resolver=resolver, lazy=lazy))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(
+                asyncio.run, resolve_async(specs, resolver=resolver, lazy=lazy)
+            ).result()
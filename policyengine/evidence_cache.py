@@ -0,0 +1,293 @@
+"""
+Content-addressed on-disk cache for evidence blobs.
+
+The same evidence (model inventories, supplier lists, ...) is fetched
+over and over across systems and evaluations. This cache stores each
+distinct payload once, keyed by its sha256, and keeps small "refs" that
+map a location (e.g. a blob URL) to the ETag and digest last seen for it,
+so blob reads can be revalidated with If-None-Match.
+
+Layout under the cache root:
+
+    objects/<aa>/<sha256>   payload bytes
+    refs/<sha256(key)>      {"key": ..., "etag": ..., "digest": ...}
+    tmp/                    staging area for atomic writes
+
+All writes go to tmp/ and are renamed into place with os.replace, so
+several uvicorn workers and Function instances on a node can share one
+cache directory. File mtimes act as the LRU clock: hits touch the
+object (and the ref that led to it), and eviction removes the least
+recently used objects and refs once the directory grows past
+`max_bytes`. Eviction also removes tmp/ files left behind by writers
+that died mid-write.
+
+`lookup` does not count toward the hit rate: a blob read only knows
+after revalidation whether the cached bytes were served, and reports
+that with `record_hit` / `record_miss`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# After eviction the cache is trimmed down to this fraction of max_bytes.
+EVICT_LOW_WATERMARK = 0.9
+# tmp/ files older than this belong to a dead writer.
+STALE_TMP_SECONDS = 3600
+
+
+def _default_root() -> Path:
+    return Path(
+        os.getenv("EVIDENCE_CACHE_DIR") or Path(tempfile.gettempdir()) / "4thgrc-evidence-cache"
+    )
+
+
+class EvidenceCache:
+    """
+    Shared, size-capped, content-addressed evidence cache.
+
+    Args:
+        root: Cache directory (default: EVIDENCE_CACHE_DIR or a temp dir).
+        max_bytes: Size cap for stored objects; LRU eviction keeps the
+            cache under it.
+    """
+
+    def __init__(
+        self, root: Optional[Path | str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.root = Path(root) if root else _default_root()
+        self.max_bytes = max_bytes
+        self._objects = self.root / "objects"
+        self._refs = self.root / "refs"
+        self._tmp = self.root / "tmp"
+        for directory in (self._objects, self._refs, self._tmp):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        # Approximate size; other processes write too, so the real size is
+        # re-measured whenever this estimate crosses max_bytes.
+        self._approx_bytes = self._scan_size()
+        self.clean_tmp()
+
+    # ------------------------------------------------------------------
+    # Paths and atomic writes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self._objects / digest[:2] / digest
+
+    def _ref_path(self, key: str) -> Path:
+        return self._refs / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _atomic_write(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+    # ------------------------------------------------------------------
+    # Objects
+    # ------------------------------------------------------------------
+
+    def _read_object(self, digest: str) -> Optional[bytes]:
+        path = self._object_path(digest)
+        try:
+            content = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return content
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """Return cached bytes for `digest`, or None on a miss."""
+        content = self._read_object(digest)
+        if content is None:
+            self.record_miss()
+        else:
+            self.record_hit()
+        return content
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self._hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self._misses += 1
+
+    def put(self, content: bytes) -> str:
+        """Store `content` (if new) and return its sha256 digest."""
+        digest = self.digest(content)
+        path = self._object_path(digest)
+        if path.exists():
+            try:
+                os.utime(path)
+                return digest
+            except FileNotFoundError:
+                pass  # evicted concurrently; store it again
+
+        self._atomic_write(path, content)
+        with self._lock:
+            self._stores += 1
+        self._grow(len(content))
+        return digest
+
+    def _grow(self, size: int) -> None:
+        with self._lock:
+            self._approx_bytes += size
+            over = self._approx_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    # ------------------------------------------------------------------
+    # Refs (location -> etag/digest)
+    # ------------------------------------------------------------------
+
+    def get_ref(self, key: str) -> Optional[Tuple[Optional[str], str]]:
+        """Return (etag, digest) last stored for `key`, or None."""
+        path = self._ref_path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return data.get("etag"), data["digest"]
+
+    def put_ref(self, key: str, digest: str, etag: Optional[str] = None) -> None:
+        payload = json.dumps({"key": key, "etag": etag, "digest": digest}).encode("utf-8")
+        path = self._ref_path(key)
+        try:
+            previous = path.stat().st_size
+        except FileNotFoundError:
+            previous = 0
+        self._atomic_write(path, payload)
+        self._grow(len(payload) - previous)
+
+    def lookup(self, key: str) -> Optional[Tuple[Optional[str], bytes]]:
+        """
+        Return (etag, bytes) cached for `key`, or None. Not counted as a hit
+        or miss; see `record_hit` / `record_miss`.
+        """
+        ref = self.get_ref(key)
+        if ref is None:
+            return None
+        etag, digest = ref
+        content = self._read_object(digest)
+        if content is None:
+            return None
+        return etag, content
+
+    def store(self, key: str, content: bytes, etag: Optional[str] = None) -> str:
+        """Store `content` and point `key` at it."""
+        digest = self.put(content)
+        self.put_ref(key, digest, etag)
+        return digest
+
+    # ------------------------------------------------------------------
+    # Eviction and metrics
+    # ------------------------------------------------------------------
+
+    def _scan(self):
+        entries = []
+        for path in (*self._objects.glob("*/*"), *self._refs.glob("*")):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, path.name, path, st.st_size))
+        return entries
+
+    def clean_tmp(self, older_than_seconds: float = STALE_TMP_SECONDS) -> int:
+        """Remove tmp/ files abandoned by writers that died mid-write."""
+        cutoff = time.time() - older_than_seconds
+        removed = 0
+        for path in self._tmp.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def _scan_size(self) -> int:
+        return sum(size for *_, size in self._scan())
+
+    def evict(self) -> int:
+        """Evict least recently used objects and refs until under the low watermark."""
+        self.clean_tmp()
+        entries = sorted(self._scan())
+        total = sum(size for *_, size in entries)
+        target = int(self.max_bytes * EVICT_LOW_WATERMARK)
+        evicted = 0
+        for _mtime, _name, path, size in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        with self._lock:
+            self._approx_bytes = total
+            self._evictions += evicted
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate and size metrics for this process's view of the cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "bytes": self._approx_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_default_cache: Optional[EvidenceCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[EvidenceCache]:
+    """
+    Process-wide cache configured from EVIDENCE_CACHE_DIR and
+    EVIDENCE_CACHE_MAX_BYTES. Returns None when EVIDENCE_CACHE_DIR is unset.
+    """
+    global _default_cache
+    if not os.getenv("EVIDENCE_CACHE_DIR"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EvidenceCache(
+                max_bytes=int(os.getenv("EVIDENCE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+            )
+        return _default_cache
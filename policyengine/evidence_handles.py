@@ -0,0 +1,279 @@
+"""
+Lazy evidence handles for rule ops.
+
+Rules receive `evidence: Dict[str, Any]`. Besides plain parsed values, an
+evidence entry may be an `EvidenceHandle`: a lazy reference to a local
+JSON / NDJSON file that is memory-mapped and parsed incrementally, so ops
+can stream records out of multi-GB evidence without materializing it.
+
+    handle = EvidenceHandle("evidence/sys1/inventory.ndjson")
+    for row in handle.iter_fields("id", "tls_version"):
+        ...
+
+Consumed pages are released back to the OS as iteration advances
+(MADV_DONTNEED where available), so resident memory stays bounded by
+the chunk size rather than the file size.
+
+Ops should use `iter_records(value)` so they accept both handles and
+already-parsed lists. A glob pattern spec resolves to an `EvidenceSet`
+(one value per matched file); iterating it chains the files' records into
+a single stream.
+"""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import mmap
+import os
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+_WHITESPACE = " \t\r\n"
+_PAGE = mmap.PAGESIZE
+_MISSING = object()
+
+
+def _release(mm: mmap.mmap, upto: int) -> None:
+    """Drop already-consumed pages [0, upto) from resident memory."""
+    end = (upto // _PAGE) * _PAGE
+    if end > 0 and hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+        mm.madvise(mmap.MADV_DONTNEED, 0, end)
+
+
+def get_field(record: Any, path: str, default: Any = None) -> Any:
+    """Read a dotted field path (e.g. "tls.version") from a record."""
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, Mapping):
+            return default
+        value = value.get(part, _MISSING)
+        if value is _MISSING:
+            return default
+    return value
+
+
+class EvidenceHandle:
+    """
+    Lazy reference to a local JSON or NDJSON evidence file.
+
+    Args:
+        path: File path.
+        fmt: "json" or "ndjson"; inferred from the suffix when omitted.
+        chunk_size: Bytes decoded per step when streaming JSON arrays.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike | str,
+        *,
+        fmt: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.path = Path(path)
+        self.format = fmt or ("ndjson" if self.path.suffix.lower() in _NDJSON_SUFFIXES else "json")
+        self.chunk_size = chunk_size
+
+    def __repr__(self) -> str:
+        return f"EvidenceHandle({str(self.path)!r}, fmt={self.format!r})"
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    def fingerprint(self) -> str:
+        """Cheap identity for caching: path, size and mtime, not content."""
+        st = self.path.stat()
+        key = f"{self.path.resolve()}:{st.st_size}:{st.st_mtime_ns}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def load(self) -> Any:
+        """Fully parse the file (NDJSON as a list). Use sparingly."""
+        if self.format == "ndjson":
+            return list(self.iter_records())
+        with self._map() as mm:
+            return json.loads(mm[:]) if len(mm) else None
+
+    def iter_records(self) -> Iterator[Any]:
+        """
+        Yield records one at a time: NDJSON lines, elements of a top-level
+        JSON array, or a top-level JSON object as a single record.
+        """
+        if self.format == "ndjson":
+            yield from self._iter_ndjson()
+        else:
+            yield from self._iter_json()
+
+    __iter__ = iter_records
+
+    def iter_fields(self, *fields: str) -> Iterator[Dict[str, Any]]:
+        """Yield records projected onto `fields` (dotted paths allowed)."""
+        for record in self.iter_records():
+            yield {f: get_field(record, f) for f in fields}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _map(self) -> mmap.mmap:
+        with self.path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return _EmptyMap()
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return mm
+
+    def _iter_ndjson(self) -> Iterator[Any]:
+        loads = json.loads
+        with self._map() as mm:
+            size, offset, tail = len(mm), 0, b""
+            while offset < size:
+                chunk = mm[offset : offset + self.chunk_size]
+                offset += len(chunk)
+                _release(mm, offset)
+                lines = (tail + chunk).split(b"\n")
+                tail = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        yield loads(line)
+            if tail.strip():
+                yield loads(tail)
+
+    def _iter_json(self) -> Iterator[Any]:
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        with self._map() as mm:
+            size, offset = len(mm), 0
+            buf, idx = "", 0
+            eof = False
+
+            def fill() -> bool:
+                nonlocal buf, idx, offset, eof
+                if eof:
+                    return False
+                chunk = mm[offset : offset + self.chunk_size]
+                offset += len(chunk)
+                eof = offset >= size
+                buf = buf[idx:] + utf8.decode(chunk, final=eof)
+                idx = 0
+                _release(mm, offset)
+                return True
+
+            def skip_ws() -> bool:
+                nonlocal idx
+                while True:
+                    while idx < len(buf) and buf[idx] in _WHITESPACE:
+                        idx += 1
+                    if idx < len(buf):
+                        return True
+                    if not fill():
+                        return False
+
+            if not skip_ws():
+                return
+            if buf[idx] != "[":
+                # Not an array: the whole document is one record.
+                while fill():
+                    pass
+                yield decoder.raw_decode(buf, idx)[0]
+                return
+
+            idx += 1
+            while True:
+                if not skip_ws():
+                    raise ValueError(f"Unterminated JSON array in {self.path}")
+                if buf[idx] == "]":
+                    return
+                if buf[idx] == ",":
+                    idx += 1
+                    continue
+                while True:
+                    try:
+                        record, end = decoder.raw_decode(buf, idx)
+                    except json.JSONDecodeError:
+                        if not fill():
+                            raise
+                        continue
+                    # A number at the buffer edge may be cut short; make sure
+                    # the next non-space char is visible before accepting it.
+                    if end >= len(buf) and not eof:
+                        fill()
+                        continue
+                    break
+                idx = end
+                yield record
+
+
+class _EmptyMap(bytes):
+    """Stand-in for mmap of an empty file (mmap refuses zero-length maps)."""
+
+    def __enter__(self) -> "_EmptyMap":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+class EvidenceSet(list):
+    """
+    Values of the files matched by one pattern spec, in match order. Each
+    element is a handle, a parsed list or a single record; iter_records and
+    iter_projected flatten them into one record stream.
+    """
+
+    def fingerprint(self) -> Optional[str]:
+        """Combined handle fingerprints, or None if any member is parsed."""
+        if not all(isinstance(v, EvidenceHandle) for v in self):
+            return None
+        parts = ",".join(v.fingerprint() for v in self)
+        return hashlib.sha256(parts.encode("utf-8")).hexdigest()
+
+
+def iter_records(value: Any) -> Iterator[Any]:
+    """Iterate records from an EvidenceHandle, EvidenceSet, list, or single value."""
+    if value is None:
+        return iter(())
+    if isinstance(value, EvidenceSet):
+        return chain.from_iterable(iter_records(v) for v in value)
+    if isinstance(value, EvidenceHandle):
+        return value.iter_records()
+    if isinstance(value, (list, tuple)):
+        return iter(value)
+    return iter((value,))
+
+
+def iter_projected(value: Any, fields: Iterable[str]) -> Iterator[Any]:
+    """Like iter_records, but handles only materialize the given fields."""
+    if isinstance(value, EvidenceSet):
+        fields = tuple(fields)
+        return chain.from_iterable(iter_projected(v, fields) for v in value)
+    if isinstance(value, EvidenceHandle):
+        return value.iter_fields(*fields)
+    return iter_records(value)
+
+
+def open_evidence_dir(root: os.PathLike | str, pattern: str = "*") -> Dict[str, EvidenceHandle]:
+    """
+    Map each JSON/NDJSON file under `root` to a lazy handle keyed by file
+    stem, e.g. evidence/sys1/encryption.ndjson -> {"encryption": handle}.
+    """
+    handles: Dict[str, EvidenceHandle] = {}
+    for path in sorted(Path(root).glob(pattern)):
+        if path.is_file() and path.suffix.lower() in (".json",) + _NDJSON_SUFFIXES:
+            handles[path.stem] = EvidenceHandle(path)
+    return handles
+
+
+def evidence_bytes(values: Iterable[Any]) -> int:
+    """Total on-disk size of the handles among `values`."""
+    return sum(v.size for v in values if isinstance(v, EvidenceHandle))
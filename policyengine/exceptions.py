@@ -27,6 +27,28 @@ class ProfileValidationError(PolicyEngineError):
         self.details = message
 
 
+class UnknownControlError(PolicyEngineError):
+    """Raised when requested controls match no rule or control id in the profile."""
+
+    def __init__(self, controls: list[str], profile_id: str | None = None):
+        where = f" in profile {profile_id}" if profile_id else ""
+        if controls:
+            super().__init__(f"Unknown controls{where}: {', '.join(controls)}")
+        else:
+            super().__init__(f"No controls requested{where}; omit controls to evaluate every rule")
+        self.controls = controls
+        self.profile_id = profile_id
+
+
+class EvidenceResolutionError(PolicyEngineError):
+    """Raised when an evidence spec cannot be resolved (missing, unreadable or not allowed)."""
+
+    def __init__(self, location: str, message: str):
+        super().__init__(f"Evidence could not be resolved [{location}]: {message}")
+        self.location = location
+        self.details = message
+
+
 class EvaluationError(PolicyEngineError):
     """
     Generic evaluation-level error.
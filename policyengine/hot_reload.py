@@ -0,0 +1,240 @@
+"""
+Hot reload of profiles and rules via an atomically swapped registry.
+
+Without hot reload, every profile lookup stats the YAML file so that an
+edit is picked up (parsed once per mtime). With it, a `LiveRegistry`
+holds every profile, rule definition and profile digest in memory, and
+lookups are plain dict reads with no filesystem access.
+
+A `RegistryWatcher` thread polls PROFILES_DIR and RULES_DIR. When a file
+changes it builds a new registry in the background and swaps it in with a
+single reference assignment. The build is copy-on-write: unchanged files
+reuse the previous registry's entries, and only changed files are parsed
+and compiled.
+
+`core.evaluate` pins the registry for the whole evaluation (`pinned()`).
+An evaluation that started before a swap finishes on the registry it
+started with, while new evaluations see the new one.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .schema import PolicyProfile
+
+logger = logging.getLogger(__name__)
+
+_current: Optional["LiveRegistry"] = None
+_pinned: contextvars.ContextVar[Optional["LiveRegistry"]] = contextvars.ContextVar(
+    "policyengine_pinned_registry", default=None
+)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    mtime_ns: int
+    value: Any  # PolicyProfile / RuleDefinition / None, or the load error
+    digest: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class LiveRegistry:
+    """Immutable, fully loaded view of PROFILES_DIR and RULES_DIR."""
+
+    generation: int
+    profiles_dir: str
+    rules_dir: str
+    entries: Dict[str, _Entry]  # source path -> entry
+    profiles: Dict[str, PolicyProfile] = field(default_factory=dict)
+    profile_errors: Dict[str, Exception] = field(default_factory=dict)
+    digests: Dict[str, str] = field(default_factory=dict)
+    rules: Dict[str, Any] = field(default_factory=dict)
+    rule_digests: Dict[str, str] = field(default_factory=dict)
+
+    def sources(self) -> Dict[str, int]:
+        return {path: entry.mtime_ns for path, entry in self.entries.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "profiles": len(self.profiles),
+            "invalid_profiles": sorted(self.profile_errors),
+            "rules": len(self.rules),
+        }
+
+
+def scan(directory: Path | str) -> Dict[str, int]:
+    """path -> mtime_ns of every YAML file in `directory`."""
+    return {str(p): p.stat().st_mtime_ns for p in sorted(Path(directory).glob("*.yaml"))}
+
+
+def _load_profile_entry(path: str, mtime_ns: int) -> _Entry:
+    from . import profiles
+
+    digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    try:
+        return _Entry(mtime_ns, profiles._parse_profile(path, mtime_ns), digest)
+    except Exception as exc:  # noqa: BLE001
+        return _Entry(mtime_ns, exc, digest)
+
+
+def _load_rule_entry(path: str, mtime_ns: int) -> _Entry:
+    from .rules_catalog import compile_pass_criteria, parse_rule_file
+
+    digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    try:
+        definition = parse_rule_file(path, mtime_ns)
+        if definition is not None and definition.pass_criteria:
+            compile_pass_criteria(definition.pass_criteria)
+    except Exception:  # noqa: BLE001
+        definition = None
+    return _Entry(mtime_ns, definition, digest)
+
+
+def build_registry(
+    profiles_dir: Optional[Path] = None,
+    rules_dir: Optional[Path] = None,
+    previous: Optional[LiveRegistry] = None,
+) -> LiveRegistry:
+    """
+    Load every profile and rule, reusing `previous` entries whose file
+    mtime is unchanged.
+    """
+    from . import profiles, rules_catalog
+
+    profiles_dir = Path(profiles_dir or profiles.PROFILES_DIR)
+    rules_dir = Path(rules_dir or rules_catalog.RULES_DIR)
+    old = previous.entries if previous is not None else {}
+
+    entries: Dict[str, _Entry] = {}
+    registry = LiveRegistry(
+        generation=previous.generation + 1 if previous is not None else 1,
+        profiles_dir=str(profiles_dir),
+        rules_dir=str(rules_dir),
+        entries=entries,
+    )
+    for path, mtime_ns in scan(profiles_dir).items():
+        entry = old.get(path)
+        if entry is None or entry.mtime_ns != mtime_ns:
+            entry = _load_profile_entry(path, mtime_ns)
+        entries[path] = entry
+        profile_id = Path(path).stem
+        registry.digests[profile_id] = entry.digest
+        if isinstance(entry.value, Exception):
+            registry.profile_errors[profile_id] = entry.value
+        else:
+            registry.profiles[profile_id] = entry.value
+    for path, mtime_ns in scan(rules_dir).items():
+        entry = old.get(path)
+        if entry is None or entry.mtime_ns != mtime_ns:
+            entry = _load_rule_entry(path, mtime_ns)
+        entries[path] = entry
+        registry.rule_digests[Path(path).stem] = entry.digest
+        if entry.value is not None:
+            registry.rules[Path(path).stem] = entry.value
+    return registry
+
+
+def install(registry: Optional[LiveRegistry]) -> None:
+    """Make `registry` the one new evaluations use (None turns hot reload off)."""
+    global _current
+    _current = registry
+
+
+def current() -> Optional[LiveRegistry]:
+    return _current
+
+
+def active() -> Optional[LiveRegistry]:
+    """The registry pinned by the running evaluation, else the current one."""
+    return _pinned.get() or _current
+
+
+@contextmanager
+def pinned(registry: Optional[LiveRegistry] = None) -> Iterator[Optional[LiveRegistry]]:
+    """Keep every lookup in this block on one registry, even across swaps."""
+    registry = registry or active()
+    token = _pinned.set(registry)
+    try:
+        yield registry
+    finally:
+        _pinned.reset(token)
+
+
+def pin(registry: Optional[LiveRegistry] = None) -> Optional[LiveRegistry]:
+    """Pin a registry for the rest of the current context (e.g. a copied
+    context that outlives a single call, such as a streamed evaluation)."""
+    registry = registry or active()
+    _pinned.set(registry)
+    return registry
+
+
+class RegistryWatcher:
+    """
+    Poll the profile and rule directories; rebuild and swap the live
+    registry when a file is added, changed or removed.
+
+    `on_swap` callbacks run on the watcher thread after each swap.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 2.0,
+        profiles_dir: Optional[Path] = None,
+        rules_dir: Optional[Path] = None,
+        on_swap: Optional[List[Callable[[LiveRegistry], None]]] = None,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.profiles_dir = profiles_dir
+        self.rules_dir = rules_dir
+        self.on_swap = list(on_swap or [])
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> LiveRegistry:
+        """Build and install the initial registry, then start polling."""
+        registry = build_registry(self.profiles_dir, self.rules_dir, previous=current())
+        install(registry)
+        self._thread = threading.Thread(target=self._run, name="registry-watcher", daemon=True)
+        self._thread.start()
+        return registry
+
+    def check(self) -> bool:
+        """Rebuild and swap if any source changed; True if a swap happened."""
+        registry = current()
+        if registry is None:
+            return False
+        sources = {**scan(registry.profiles_dir), **scan(registry.rules_dir)}
+        if sources == registry.sources():
+            return False
+        fresh = build_registry(
+            Path(registry.profiles_dir), Path(registry.rules_dir), previous=registry
+        )
+        install(fresh)
+        logger.info("Registry reloaded: generation %d", fresh.generation)
+        for callback in self.on_swap:
+            try:
+                callback(fresh)
+            except Exception:  # noqa: BLE001
+                logger.exception("Registry swap callback failed")
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.check()
+            except Exception:  # noqa: BLE001
+                logger.exception("Registry reload failed; keeping the current registry")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 1)
@@ -11,11 +11,25 @@ class EvalRequest(BaseModel):
     - profile_ref: e.g. "iso_42001-global@1.2.0"
     - context: system-level context (system_id, owner, environment, etc.)
     - evidence: evidence bundle (model cards, logs, configs, etc.)
+    - controls: optional subset of rule/control ids to evaluate
+    - request_id: optional client id; retries with the same id are idempotent
     """
 
     profile_ref: str = Field(..., description="Profile reference, e.g. iso_42001-global@1.2.0")
     context: Dict[str, Any] = Field(default_factory=dict)
     evidence: Dict[str, Any] = Field(default_factory=dict)
+    controls: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Evaluate only these rule/control ids (and their dependencies); all rules if omitted"
+        ),
+    )
+    request_id: Optional[str] = Field(
+        default=None,
+        description=(
+            "Client request id; a retry with the same id and content returns the stored result"
+        ),
+    )
 
 
 class Finding(BaseModel):
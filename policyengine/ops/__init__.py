@@ -0,0 +1,74 @@
+"""
+Registry of engine ops.
+
+Each rule YAML under rules/ names an `engine_op`. An op computes the
+rule's signals from (params, context, evidence); the rules engine then
+evaluates the rule's pass_criteria against those signals.
+
+An op returns None when the evidence it needs was not supplied, which
+the rules engine reports as a warning rather than a failure.
+
+Evidence values may be lazy EvidenceHandles (policyengine.evidence_handles);
+ops read them through iter_records / iter_projected so large files are
+streamed rather than parsed up front.
+
+An optional op observer (see set_op_observer) is called with
+(op name, seconds) after every op run; the service uses it for
+per-op latency metrics. With no observer, ops are not timed.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional
+
+OpFn = Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any]], Optional[Dict[str, Any]]]
+
+OpObserver = Callable[[str, float], None]
+
+_OPS: Dict[str, OpFn] = {}
+_observer: Optional[OpObserver] = None
+
+
+def register_op(name: str) -> Callable[[OpFn], OpFn]:
+    """Decorator registering a function as the implementation of `name`."""
+
+    def decorator(fn: OpFn) -> OpFn:
+        _OPS[name] = fn
+        return fn
+
+    return decorator
+
+
+def get_op(name: Optional[str]) -> Optional[OpFn]:
+    """Return the op registered under `name`, or None."""
+    if not name:
+        return None
+    return _OPS.get(name)
+
+
+def registered_ops() -> Dict[str, OpFn]:
+    return dict(_OPS)
+
+
+def set_op_observer(observer: Optional[OpObserver]) -> None:
+    """Install (or with None, remove) the process-wide op timing observer."""
+    global _observer
+    _observer = observer
+
+
+def get_op_observer() -> Optional[OpObserver]:
+    return _observer
+
+
+# Built-in ops register themselves on import.
+from . import encryption, lifecycle  # noqa: E402,F401
+
+__all__ = [
+    "OpFn",
+    "OpObserver",
+    "register_op",
+    "get_op",
+    "registered_ops",
+    "set_op_observer",
+    "get_op_observer",
+]
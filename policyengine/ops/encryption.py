@@ -0,0 +1,335 @@
+"""
+encryption_required op (rules/encryption.yaml).
+
+Signals:
+- TLS_OK:         every TLS endpoint meets require_tls_min with a non-weak cipher,
+                  and no endpoint has an unknown scheme (neither http nor https)
+- KMS_PRESENT:    every endpoint is backed by a KMS key (from the key inventory, if given)
+- HTTP_ENDPOINTS: ids of plaintext http endpoints (when disallow_http)
+
+Endpoint scans are normalized into columnar arrays (scheme, TLS version,
+cipher class, KMS key ref, system index) and all three signals are computed
+in one pass over the columns. When numpy is installed the pass is
+vectorized over zero-copy views of the same arrays. A system with no
+endpoint in the inventory cannot show compliance: TLS_OK and (when
+require_kms) KMS_PRESENT are false.
+
+`evaluate_fleet` applies the same evaluator to an endpoint stream spanning
+many systems in fixed-size batches, so memory stays bounded by batch size.
+Inventories given as EvidenceHandles are streamed straight into the
+columns, reading only the fields listed in ENDPOINT_FIELDS.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from ..evidence_handles import iter_projected, iter_records
+from . import register_op
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+ANY_SYSTEM = "*"
+
+SCHEME_OTHER = 0
+SCHEME_HTTP = 1
+SCHEME_HTTPS = 2
+
+CIPHER_UNKNOWN = 0
+CIPHER_STRONG = 1
+CIPHER_WEAK = 2
+
+_WEAK_CIPHER_MARKERS = ("RC4", "3DES", "DES-CBC", "NULL", "EXPORT", "MD5", "ANON")
+
+DEFAULT_BATCH_SIZE = 100_000
+
+# Fields normalize_endpoints reads from each endpoint record.
+ENDPOINT_FIELDS = (
+    "id",
+    "name",
+    "url",
+    "endpoint",
+    "system_id",
+    "scheme",
+    "tls_version",
+    "tls",
+    "cipher",
+    "cipher_class",
+    "kms_key_ref",
+    "kms_key_id",
+    "kms_key",
+)
+
+
+@dataclass
+class EndpointColumns:
+    """Columnar view of an endpoint inventory."""
+
+    ids: List[str] = field(default_factory=list)
+    systems: List[str] = field(default_factory=list)
+    system: array = field(default_factory=lambda: array("i"))
+    scheme: array = field(default_factory=lambda: array("b"))
+    tls: array = field(default_factory=lambda: array("h"))
+    cipher: array = field(default_factory=lambda: array("b"))
+    kms: array = field(default_factory=lambda: array("b"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def parse_tls_version(value: Any) -> int:
+    """
+    Map a TLS version to an int with one decimal (1.2 -> 12, "TLSv1.3" -> 13).
+    Unknown or missing versions map to 0.
+    """
+    if value is None or value == "":
+        return 0
+    text = str(value).strip().upper().replace("TLSV", "").replace("TLS", "").strip()
+    try:
+        return int(round(float(text) * 10))
+    except ValueError:
+        return 0
+
+
+def _scheme_code(record: Mapping[str, Any]) -> int:
+    scheme = record.get("scheme")
+    if not scheme:
+        url = str(record.get("url") or record.get("endpoint") or "")
+        scheme = url.split("://", 1)[0] if "://" in url else ""
+    scheme = str(scheme).lower()
+    if scheme == "http":
+        return SCHEME_HTTP
+    if scheme == "https":
+        return SCHEME_HTTPS
+    return SCHEME_OTHER
+
+
+def _cipher_code(record: Mapping[str, Any]) -> int:
+    klass = record.get("cipher_class")
+    if klass:
+        return CIPHER_WEAK if str(klass).lower() == "weak" else CIPHER_STRONG
+    cipher = record.get("cipher")
+    if not cipher:
+        return CIPHER_UNKNOWN
+    upper = str(cipher).upper()
+    if any(marker in upper for marker in _WEAK_CIPHER_MARKERS):
+        return CIPHER_WEAK
+    return CIPHER_STRONG
+
+
+def _kms_ref(record: Mapping[str, Any]) -> Optional[str]:
+    ref = record.get("kms_key_ref") or record.get("kms_key_id") or record.get("kms_key")
+    return str(ref) if ref else None
+
+
+def key_inventory_refs(keys: Optional[Iterable[Any]]) -> Optional[frozenset]:
+    """Set of enabled key references from a key inventory (None if no inventory)."""
+    if keys is None:
+        return None
+    refs = set()
+    for key in keys:
+        if isinstance(key, Mapping):
+            if key.get("enabled") is False:
+                continue
+            ref = key.get("id") or key.get("key_id") or key.get("kid")
+        else:
+            ref = key
+        if ref:
+            refs.add(str(ref))
+    return frozenset(refs)
+
+
+def normalize_endpoints(
+    endpoints: Iterable[Mapping[str, Any]],
+    keys: Optional[Iterable[Any]] = None,
+    *,
+    default_system: str = ANY_SYSTEM,
+    key_refs: Optional[frozenset] = None,
+) -> EndpointColumns:
+    """Normalize endpoint records into columnar arrays."""
+    if key_refs is None:
+        key_refs = key_inventory_refs(keys)
+
+    cols = EndpointColumns()
+    system_index: Dict[str, int] = {}
+    tls_cache: Dict[Any, int] = {}
+
+    # Bound appends keep the per-endpoint loop tight at fleet scale.
+    add_id, add_system = cols.ids.append, cols.system.append
+    add_scheme, add_tls = cols.scheme.append, cols.tls.append
+    add_cipher, add_kms = cols.cipher.append, cols.kms.append
+
+    for position, record in enumerate(endpoints):
+        system_id = str(record.get("system_id") or default_system)
+        idx = system_index.get(system_id)
+        if idx is None:
+            idx = system_index[system_id] = len(cols.systems)
+            cols.systems.append(system_id)
+
+        raw_tls = record.get("tls_version") or record.get("tls")
+        tls = tls_cache.get(raw_tls)
+        if tls is None:
+            tls = tls_cache[raw_tls] = parse_tls_version(raw_tls)
+
+        ref = _kms_ref(record)
+        has_kms = ref is not None and (key_refs is None or ref in key_refs)
+
+        add_id(str(record.get("id") or record.get("name") or record.get("url") or position))
+        add_system(idx)
+        add_scheme(_scheme_code(record))
+        add_tls(tls)
+        add_cipher(_cipher_code(record))
+        add_kms(1 if has_kms else 0)
+
+    return cols
+
+
+def _empty_signals(params: Mapping[str, Any]) -> Dict[str, Any]:
+    # No endpoint recorded for the system: nothing proves TLS or KMS coverage.
+    return {
+        "TLS_OK": False,
+        "KMS_PRESENT": not params.get("require_kms", True),
+        "HTTP_ENDPOINTS": [],
+    }
+
+
+def _signals_from_counts(
+    params: Mapping[str, Any],
+    tls_bad: int,
+    kms_missing: int,
+    http_ids: List[str],
+) -> Dict[str, Any]:
+    return {
+        "TLS_OK": tls_bad == 0,
+        "KMS_PRESENT": (kms_missing == 0) if params.get("require_kms", True) else True,
+        "HTTP_ENDPOINTS": http_ids if params.get("disallow_http", True) else [],
+    }
+
+
+def _counts_numpy(cols: EndpointColumns, tls_min: int):
+    n_systems = len(cols.systems)
+    system = np.frombuffer(cols.system, dtype=np.int32)
+    scheme = np.frombuffer(cols.scheme, dtype=np.int8)
+    tls = np.frombuffer(cols.tls, dtype=np.int16)
+    cipher = np.frombuffer(cols.cipher, dtype=np.int8)
+    kms = np.frombuffer(cols.kms, dtype=np.int8)
+
+    is_https = scheme == SCHEME_HTTPS
+    tls_bad = (is_https & ((tls < tls_min) | (cipher == CIPHER_WEAK))) | (scheme == SCHEME_OTHER)
+    http = scheme == SCHEME_HTTP
+
+    tls_bad_counts = np.bincount(system[tls_bad], minlength=n_systems).tolist()
+    kms_missing_counts = np.bincount(system[kms == 0], minlength=n_systems).tolist()
+    http_ids: List[List[str]] = [[] for _ in range(n_systems)]
+    for i in np.flatnonzero(http).tolist():
+        http_ids[cols.system[i]].append(cols.ids[i])
+    return tls_bad_counts, kms_missing_counts, http_ids
+
+
+def _counts_python(cols: EndpointColumns, tls_min: int):
+    n_systems = len(cols.systems)
+    tls_bad_counts = [0] * n_systems
+    kms_missing_counts = [0] * n_systems
+    http_ids: List[List[str]] = [[] for _ in range(n_systems)]
+    for i, (sys_idx, scheme, tls, cipher, kms) in enumerate(
+        zip(cols.system, cols.scheme, cols.tls, cols.cipher, cols.kms)
+    ):
+        if scheme == SCHEME_OTHER or (
+            scheme == SCHEME_HTTPS and (tls < tls_min or cipher == CIPHER_WEAK)
+        ):
+            tls_bad_counts[sys_idx] += 1
+        elif scheme == SCHEME_HTTP:
+            http_ids[sys_idx].append(cols.ids[i])
+        if not kms:
+            kms_missing_counts[sys_idx] += 1
+    return tls_bad_counts, kms_missing_counts, http_ids
+
+
+def compute_signals(
+    cols: EndpointColumns,
+    params: Mapping[str, Any],
+    *,
+    use_numpy: Optional[bool] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute TLS_OK / KMS_PRESENT / HTTP_ENDPOINTS for every system in `cols`
+    in a single pass. Returns system_id -> signals.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    tls_min = parse_tls_version(params.get("require_tls_min", "1.2"))
+    counts_fn = _counts_numpy if use_numpy and np is not None else _counts_python
+    tls_bad, kms_missing, http_ids = counts_fn(cols, tls_min)
+
+    return {
+        system_id: _signals_from_counts(params, tls_bad[i], kms_missing[i], http_ids[i])
+        for i, system_id in enumerate(cols.systems)
+    }
+
+
+def merge_signals(into: Dict[str, Any], other: Mapping[str, Any]) -> Dict[str, Any]:
+    """Combine signals of two endpoint batches belonging to the same system."""
+    into["TLS_OK"] = into["TLS_OK"] and other["TLS_OK"]
+    into["KMS_PRESENT"] = into["KMS_PRESENT"] and other["KMS_PRESENT"]
+    into["HTTP_ENDPOINTS"] = list(into["HTTP_ENDPOINTS"]) + list(other["HTTP_ENDPOINTS"])
+    return into
+
+
+def evaluate_fleet(
+    endpoints: Iterable[Mapping[str, Any]],
+    params: Mapping[str, Any],
+    keys: Optional[Iterable[Any]] = None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_numpy: Optional[bool] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluate an endpoint stream spanning many systems, `batch_size`
+    endpoints at a time. Returns system_id -> signals.
+    """
+    key_refs = key_inventory_refs(keys)
+    results: Dict[str, Dict[str, Any]] = {}
+    iterator = iter(endpoints)
+    while True:
+        batch: Sequence[Mapping[str, Any]] = list(islice(iterator, batch_size))
+        if not batch:
+            break
+        cols = normalize_endpoints(batch, key_refs=key_refs)
+        for system_id, signals in compute_signals(cols, params, use_numpy=use_numpy).items():
+            if system_id in results:
+                merge_signals(results[system_id], signals)
+            else:
+                results[system_id] = signals
+    return results
+
+
+@register_op("encryption_required")
+def encryption_required(
+    params: Dict[str, Any],
+    context: Dict[str, Any],
+    evidence: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    raw = evidence.get(params.get("evidence_key", "encryption"))
+    if raw is None:
+        return None
+
+    if isinstance(raw, Mapping):
+        endpoints = raw.get("endpoints") or []
+        keys = raw.get("keys")
+    else:
+        endpoints, keys = raw, None
+
+    system_id = str(context.get("system_id") or context.get("system_name") or ANY_SYSTEM)
+    cols = normalize_endpoints(
+        iter_projected(endpoints, ENDPOINT_FIELDS),
+        None if keys is None else iter_records(keys),
+        default_system=system_id,
+    )
+    signals = compute_signals(cols, params)
+    return signals.get(system_id) or _empty_signals(params)
@@ -0,0 +1,212 @@
+"""
+lifecycle_gate_checks op (rules/lifecycle.yaml).
+
+Signals:
+- ARTIFACT_GAPS: required artifact types with no artifact for the system
+- GATE_STATUS:   status of the latest gate approval for the system
+- ARTIFACT_MANIFEST: artifact type -> timestamp of the latest artifact
+
+The evidence listing is turned into a per-system manifest index once and
+cached by the listing's digest, so repeated evaluations over the same
+listing (several profiles, several rules, monitoring sweeps) reuse it.
+Gap detection is then a set difference against the compiled list of
+required artifact types. Listings given as an EvidenceHandle are streamed
+(only the manifest fields are read) and cached by the file fingerprint;
+an EvidenceSet from a pattern spec is read as one listing across its files.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import PurePosixPath
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from ..evidence_handles import EvidenceHandle, EvidenceSet, iter_projected
+from . import register_op
+
+# system_id -> artifact_type -> latest record
+ManifestIndex = Dict[str, Dict[str, Dict[str, Any]]]
+
+# Records without a system_id apply to every system.
+ANY_SYSTEM = "*"
+
+_INDEX_CACHE_SIZE = 128
+_index_cache: "OrderedDict[str, ManifestIndex]" = OrderedDict()
+_index_lock = threading.Lock()
+
+# Fields the manifest index reads from each listing record.
+MANIFEST_FIELDS = (
+    "system_id",
+    "artifact_type",
+    "type",
+    "path",
+    "name",
+    "uri",
+    "timestamp",
+    "status",
+)
+
+
+def listing_digest(listing: Iterable[Mapping[str, Any]]) -> str:
+    """Stable sha256 digest of an evidence listing."""
+    payload = json.dumps(list(listing), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _timestamp_key(value: Any) -> float:
+    if value is None:
+        return float("-inf")
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        return float("-inf")
+
+
+def _artifact_type(record: Mapping[str, Any]) -> Optional[str]:
+    kind = record.get("artifact_type") or record.get("type")
+    if not kind:
+        location = record.get("path") or record.get("name") or record.get("uri")
+        if location:
+            kind = PurePosixPath(str(location)).stem
+    return str(kind).lower() if kind else None
+
+
+def build_manifest_index(listing: Iterable[Mapping[str, Any]]) -> ManifestIndex:
+    """
+    Build system_id -> artifact_type -> latest record in a single pass.
+    """
+    index: ManifestIndex = {}
+    for record in listing:
+        kind = _artifact_type(record)
+        if kind is None:
+            continue
+        system_id = str(record.get("system_id") or ANY_SYSTEM)
+        by_type = index.setdefault(system_id, {})
+        current = by_type.get(kind)
+        if current is None or _timestamp_key(record.get("timestamp")) >= _timestamp_key(
+            current.get("timestamp")
+        ):
+            by_type[kind] = dict(record)
+    return index
+
+
+def _cached_index(key: str, build: Callable[[], ManifestIndex]) -> ManifestIndex:
+    with _index_lock:
+        cached = _index_cache.get(key)
+        if cached is not None:
+            _index_cache.move_to_end(key)
+            return cached
+
+    index = build()
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def get_manifest_index(
+    listing: List[Mapping[str, Any]] | EvidenceHandle | EvidenceSet,
+) -> ManifestIndex:
+    """
+    Return the manifest index for `listing`, cached by listing digest
+    (or by file fingerprints for an EvidenceHandle / EvidenceSet of handles).
+    """
+    if isinstance(listing, EvidenceHandle):
+        return _cached_index(
+            f"handle:{listing.fingerprint()}",
+            lambda: build_manifest_index(iter_projected(listing, MANIFEST_FIELDS)),
+        )
+    if isinstance(listing, EvidenceSet):
+        fingerprint = listing.fingerprint()
+        if fingerprint is not None:
+            return _cached_index(
+                f"set:{fingerprint}",
+                lambda: build_manifest_index(iter_projected(listing, MANIFEST_FIELDS)),
+            )
+        listing = list(iter_projected(listing, MANIFEST_FIELDS))
+    return _cached_index(listing_digest(listing), lambda: build_manifest_index(listing))
+
+
+def clear_manifest_cache() -> None:
+    with _index_lock:
+        _index_cache.clear()
+
+
+@lru_cache(maxsize=256)
+def compile_required_artifacts(required: Tuple[str, ...]) -> FrozenSet[str]:
+    return frozenset(str(a).lower() for a in required)
+
+
+def system_manifest(index: ManifestIndex, system_id: str) -> Dict[str, Dict[str, Any]]:
+    """Artifacts visible to `system_id`: its own plus system-agnostic ones."""
+    shared = index.get(ANY_SYSTEM, {})
+    own = index.get(system_id, {})
+    if not shared:
+        return own
+    merged = dict(shared)
+    for kind, record in own.items():
+        other = merged.get(kind)
+        if other is None or _timestamp_key(record.get("timestamp")) >= _timestamp_key(
+            other.get("timestamp")
+        ):
+            merged[kind] = record
+    return merged
+
+
+@register_op("lifecycle_gate_checks")
+def lifecycle_gate_checks(
+    params: Dict[str, Any],
+    context: Dict[str, Any],
+    evidence: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    raw = evidence.get(params.get("evidence_key", "lifecycle"))
+    if raw is None:
+        return None
+
+    gate_status: Optional[str] = None
+    if isinstance(raw, Mapping):
+        gate_status = raw.get("gate_status")
+        listing = raw.get("artifacts") or []
+    else:
+        listing = raw
+    if not isinstance(listing, (EvidenceHandle, EvidenceSet)):
+        listing = list(listing)
+
+    system_id = str(context.get("system_id") or context.get("system_name") or ANY_SYSTEM)
+    manifest = system_manifest(get_manifest_index(listing), system_id)
+
+    required = compile_required_artifacts(tuple(params.get("required_artifacts") or ()))
+    gaps = sorted(required - manifest.keys())
+
+    if gate_status is None:
+        gate_record = manifest.get(str(params.get("gate_artifact", "gate_approval")).lower())
+        gate_status = (gate_record or {}).get("status") or "pending"
+
+    return {
+        "ARTIFACT_GAPS": gaps,
+        "GATE_STATUS": str(gate_status).lower(),
+        "ARTIFACT_MANIFEST": {
+            kind: record.get("timestamp") for kind, record in sorted(manifest.items())
+        },
+    }
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import yaml
 
+from . import hot_reload, snapshot
 from .schema import PolicyProfile
 from .exceptions import ProfileNotFoundError
 
@@ -18,20 +21,19 @@ def load_profile_by_ref(profile_ref: str) -> PolicyProfile:
       profile_id@version  (e.g. iso_42001-global@1.2.0)
 
     For now we map profile_ref -> file name "<profile_id>.yaml".
-    You can change this strategy later as needed.
+    You can change this strategy later as needed. With hot reload on, the
+    profile comes from the live registry without touching the filesystem.
     """
-    if "@" in profile_ref:
-        profile_id, version = profile_ref.split("@", 1)
-    else:
-        profile_id = profile_ref
-        version = "latest"
-
-    path = PROFILES_DIR / f"{profile_id}.yaml"
-    if not path.exists():
-        raise ProfileNotFoundError(f"Profile file not found for id: {profile_id}")
+    profile_id, version = split_profile_ref(profile_ref)
 
-    data: Dict = yaml.safe_load(path.read_text(encoding="utf-8"))
-    profile = PolicyProfile.model_validate(data)
+    live = hot_reload.active()
+    if live is not None:
+        profile = _live_profile(live, profile_id)
+    else:
+        path = PROFILES_DIR / f"{profile_id}.yaml"
+        if not path.exists():
+            raise ProfileNotFoundError(f"Profile file not found for id: {profile_id}")
+        profile = load_profile_file(path)
 
     if version != "latest" and profile.version != version:
         raise ProfileNotFoundError(
@@ -39,3 +41,87 @@ def load_profile_by_ref(profile_ref: str) -> PolicyProfile:
         )
 
     return profile
+
+
+def _live_profile(live: "hot_reload.LiveRegistry", profile_id: str) -> PolicyProfile:
+    profile = live.profiles.get(profile_id)
+    if profile is not None:
+        return profile
+    error = live.profile_errors.get(profile_id)
+    if error is not None:
+        raise error
+    raise ProfileNotFoundError(f"Profile file not found for id: {profile_id}")
+
+
+def split_profile_ref(profile_ref: str) -> Tuple[str, str]:
+    """Split 'profile_id@version' into (profile_id, version); version defaults to 'latest'."""
+    if "@" in profile_ref:
+        profile_id, version = profile_ref.split("@", 1)
+        return profile_id, version
+    return profile_ref, "latest"
+
+
+def profile_digest(profile_ref: str) -> Optional[str]:
+    """
+    sha256 of the profile file behind `profile_ref`, or None if it does
+    not exist. Cached by (path, mtime) like the parsed profile, or taken
+    from the live registry with hot reload on.
+    """
+    profile_id = split_profile_ref(profile_ref)[0]
+    live = hot_reload.active()
+    if live is not None:
+        return live.digests.get(profile_id)
+    path = PROFILES_DIR / f"{profile_id}.yaml"
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    return _file_digest(str(path), mtime_ns)
+
+
+def profile_rule_digests(profile_ref: str) -> Dict[str, Optional[str]]:
+    """
+    sha256 of each rules/<id>.yaml the profile references, by rule id
+    (None for rules without a YAML definition). Empty if the profile
+    cannot be loaded.
+    """
+    from .rules_catalog import rule_digest
+
+    try:
+        profile = load_profile_by_ref(profile_ref)
+    except Exception:  # noqa: BLE001
+        return {}
+    return {ref.id: rule_digest(ref.id) for ref in profile.rules}
+
+
+@lru_cache(maxsize=256)
+def _file_digest(path: str, mtime_ns: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def profile_cache_info():
+    """functools cache statistics of the parsed-profile cache."""
+    return _parse_profile.cache_info()
+
+
+def load_profile_file(path: Path) -> PolicyProfile:
+    """Load and validate a single profile YAML file (cached by mtime)."""
+    return _parse_profile(str(path), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _parse_profile(path: str, mtime_ns: int) -> PolicyProfile:
+    """
+    Parse and validate a profile file once per (path, mtime).
+
+    Editing a profile changes its mtime, so the next lookup re-parses it.
+    An attached registry snapshot is used instead of YAML when it holds
+    this (path, mtime).
+    """
+    snap = snapshot.active()
+    if snap is not None:
+        profile = snap.profile(path, mtime_ns)
+        if profile is not None:
+            return profile
+    data: Dict = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+    return PolicyProfile.model_validate(data)
@@ -0,0 +1,60 @@
+"""
+Compiled profile registry.
+
+Profiles, rule definitions and pass_criteria are parsed/compiled lazily
+and cached on first use. `preload()` does that work up front for every
+profile under PROFILES_DIR so that a fresh process (e.g. a service
+worker) serves its first evaluation without paying YAML parsing and
+compilation costs.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import profiles
+from .ops import get_op
+from .rules_catalog import compile_pass_criteria, load_rule_definition
+from .schema import PolicyProfile
+
+
+def compile_profile(profile: PolicyProfile) -> int:
+    """
+    Load and compile the rule definitions referenced by `profile`.
+
+    Returns the number of rules backed by a registered engine op.
+    """
+    compiled = 0
+    for rule in profile.rules:
+        definition = load_rule_definition(rule.id)
+        if definition is None or get_op(definition.engine_op) is None:
+            continue
+        if definition.pass_criteria:
+            compile_pass_criteria(definition.pass_criteria)
+        compiled += 1
+    return compiled
+
+
+def preload(profiles_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Parse every profile under `profiles_dir` (default: PROFILES_DIR) and
+    compile the rules it references.
+
+    Invalid profiles, and profiles whose rules or pass_criteria fail to
+    compile, are skipped and reported, never raised.
+    """
+    root = Path(profiles_dir or profiles.PROFILES_DIR)
+    loaded: List[str] = []
+    skipped: List[str] = []
+    rules = 0
+    for path in sorted(root.glob("*.yaml")):
+        try:
+            profile = profiles.load_profile_file(path)
+            compiled = compile_profile(profile)
+        except Exception:  # noqa: BLE001
+            skipped.append(path.stem)
+            continue
+        rules += compiled
+        loaded.append(f"{profile.profile_id}@{profile.version}")
+    return {"profiles": loaded, "skipped": skipped, "compiled_rules": rules}
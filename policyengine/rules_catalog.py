@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, List, Mapping, Optional
+
+import yaml
+from pydantic import BaseModel, Field
+
+from . import hot_reload, snapshot
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+RULES_DIR = ROOT_DIR / "rules"
+
+# Names available to pass_criteria expressions besides signals and params.
+_CRITERIA_BUILTINS: Dict[str, Any] = {
+    "len": len,
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "any": any,
+    "all": all,
+    "True": True,
+    "False": False,
+    "None": None,
+}
+
+
+class RuleDefinition(BaseModel):
+    """
+    Compiled view of a rule YAML file under rules/.
+
+    Only the fields the engine needs at evaluation time are kept:
+    the engine_op to dispatch to, default params and the pass criteria.
+    """
+
+    rule_id: str
+    version: str = "0.0.0"
+    title: Optional[str] = None
+    engine_op: Optional[str] = None
+    params: Dict[str, Any] = Field(default_factory=dict)
+    pass_criteria: Optional[str] = None
+    signals: List[str] = Field(default_factory=list)
+
+    @classmethod
+    def from_yaml_dict(cls, data: Mapping[str, Any]) -> "RuleDefinition":
+        inputs = data.get("inputs") or {}
+        outputs = data.get("outputs") or {}
+        return cls(
+            rule_id=str(data["rule_id"]),
+            version=str(data.get("version", "0.0.0")),
+            title=data.get("title"),
+            engine_op=data.get("engine_op"),
+            params=dict(inputs.get("params") or {}),
+            pass_criteria=outputs.get("pass_criteria"),
+            signals=list(outputs.get("signals") or []),
+        )
+
+
+def _load_rule_definition(rules_dir: str, rule_id: str) -> Optional[RuleDefinition]:
+    # Keyed by mtime (one stat per lookup), so an edited rule file is
+    # re-parsed on its next use, in every process.
+    path = Path(rules_dir) / f"{rule_id}.yaml"
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    return parse_rule_file(str(path), mtime_ns)
+
+
+@lru_cache(maxsize=512)
+def parse_rule_file(path: str, mtime_ns: int) -> Optional[RuleDefinition]:
+    """
+    Parse a rule YAML file once per (path, mtime); None if it is not a
+    rule definition. An attached registry snapshot is used when it holds
+    this (path, mtime).
+    """
+    snap = snapshot.active()
+    if snap is not None:
+        definition = snap.rule(path, mtime_ns)
+        if definition is not None:
+            return definition
+    data = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if not isinstance(data, dict) or "rule_id" not in data:
+        return None
+    return RuleDefinition.from_yaml_dict(data)
+
+
+def load_rule_definition(rule_id: str) -> Optional[RuleDefinition]:
+    """
+    Return the RuleDefinition for rules/<rule_id>.yaml, or None when the
+    rule has no YAML definition (e.g. ad-hoc rule ids used in tests).
+
+    With hot reload on, definitions come from the live registry.
+    Otherwise they are parsed once per (path, mtime) and cached.
+    """
+    live = hot_reload.active()
+    if live is not None:
+        return live.rules.get(rule_id)
+    return _load_rule_definition(str(RULES_DIR), rule_id)
+
+
+def rule_digest(rule_id: str) -> Optional[str]:
+    """
+    sha256 of rules/<rule_id>.yaml, or None if it does not exist. Cached
+    by (path, mtime), or taken from the live registry with hot reload on.
+    """
+    live = hot_reload.active()
+    if live is not None:
+        return live.rule_digests.get(rule_id)
+    path = RULES_DIR / f"{rule_id}.yaml"
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    return _file_digest(str(path), mtime_ns)
+
+
+@lru_cache(maxsize=512)
+def _file_digest(path: str, mtime_ns: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class _AttrDict(dict):
+    """dict that also allows attribute access, e.g. thresholds.accuracy_min."""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return _wrap(self[name])
+        except KeyError as exc:
+            raise AttributeError(name) from exc
+
+
+def _wrap(value: Any) -> Any:
+    if isinstance(value, dict) and not isinstance(value, _AttrDict):
+        return _AttrDict(value)
+    return value
+
+
+@lru_cache(maxsize=512)
+def compile_pass_criteria(expression: str) -> CodeType:
+    """
+    Compile a pass_criteria expression once.
+
+    Rule files use Python-like expressions; the upper-case AND/OR/NOT
+    spelling that some rule files use is normalized first.
+    """
+    normalized = (
+        f" {expression} ".replace(" AND ", " and ")
+        .replace(" OR ", " or ")
+        .replace(" NOT ", " not ")
+        .strip()
+    )
+    return compile(normalized, f"<pass_criteria:{expression}>", "eval")
+
+
+def evaluate_pass_criteria(
+    expression: str,
+    signals: Mapping[str, Any],
+    params: Mapping[str, Any],
+) -> bool:
+    """
+    Evaluate a pass_criteria expression against computed signals.
+
+    Params are visible by name (so `MONTHLY_COST <= monthly_budget` works)
+    and signals take precedence over params on name clashes.
+    """
+    code = compile_pass_criteria(expression)
+    namespace: Dict[str, Any] = {k: _wrap(v) for k, v in params.items()}
+    namespace.update(signals)
+    return bool(eval(code, {"__builtins__": _CRITERIA_BUILTINS}, namespace))  # noqa: S307
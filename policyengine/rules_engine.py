@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
+from . import timing
+from .exceptions import UnknownControlError
 from .models import Finding
+from .ops import get_op, get_op_observer
+from .rules_catalog import RuleDefinition, evaluate_pass_criteria, load_rule_definition
 from .schema import PolicyProfile
 from .utils import normalize_severity, normalize_status
 
@@ -14,12 +21,19 @@ def evaluate_rule(
     evidence: Dict[str, Any],
 ) -> Finding | None:
     """
-    Placeholder for actual rule evaluation logic.
+    Evaluate a single rule.
 
-    For now, we implement a trivial demo behavior:
+    If rules/<rule_id>.yaml declares an engine_op that is registered in
+    policyengine.ops, the op computes signals from the evidence and the
+    rule's pass_criteria decides pass/fail.
+
+    Otherwise we fall back to the demo behavior:
     - If context["system_name"] contains "demo", return a 'pass'
     - Otherwise, return a 'warn' to show something happened.
     """
+    definition = load_rule_definition(rule_id)
+    if definition is not None and get_op(definition.engine_op) is not None:
+        return _evaluate_op_rule(definition, rule_id, params, context, evidence)
 
     system_name = context.get("system_name") or context.get("system_id") or "unknown-system"
     severity = params.get("severity", "medium")
@@ -41,13 +55,101 @@ def evaluate_rule(
     )
 
 
+def _evaluate_op_rule(
+    definition: RuleDefinition,
+    rule_id: str,
+    params: Dict[str, Any],
+    context: Dict[str, Any],
+    evidence: Dict[str, Any],
+) -> Finding:
+    op = get_op(definition.engine_op)
+    assert op is not None
+
+    system_name = context.get("system_name") or context.get("system_id") or "unknown-system"
+    merged_params = {**definition.params, **params}
+    severity = merged_params.get("severity", "medium")
+
+    observer = get_op_observer()
+    if observer is None:
+        signals = op(merged_params, context, evidence)
+    else:
+        start = time.perf_counter()
+        try:
+            signals = op(merged_params, context, evidence)
+        finally:
+            observer(definition.engine_op, time.perf_counter() - start)
+    if signals is None:
+        status = "warn"
+        message = f"Rule {rule_id}: no evidence supplied for system '{system_name}'."
+        signals = {}
+    elif not definition.pass_criteria:
+        status = "pass"
+        message = f"Rule {rule_id} passed for system '{system_name}'."
+    else:
+        try:
+            passed = evaluate_pass_criteria(definition.pass_criteria, signals, merged_params)
+        except Exception as exc:  # noqa: BLE001
+            status = "warn"
+            message = f"Rule {rule_id}: could not evaluate pass criteria ({exc})."
+        else:
+            status = "pass" if passed else "fail"
+            message = (
+                f"Rule {rule_id} passed for system '{system_name}'."
+                if passed
+                else f"Rule {rule_id} failed for system '{system_name}'."
+            )
+
+    return Finding(
+        id=rule_id,
+        title=params.get("title") or definition.title or f"Rule {rule_id}",
+        severity=normalize_severity(severity),
+        status=normalize_status(status),
+        message=message,
+        data={"system": system_name, "params": params, "signals": signals},
+    )
+
+
+def select_rules(profile: PolicyProfile, controls: Optional[Sequence[str]]) -> Optional[List[int]]:
+    """
+    Positions in ``profile.rules`` to run for ``controls`` (rule ids or
+    control ids), plus the rules they transitively ``depends_on``, in
+    profile order. None means every rule.
+
+    Raises:
+        UnknownControlError: If an entry matches nothing in the profile,
+            or ``controls`` is empty (which would otherwise evaluate no
+            rule and pass).
+    """
+    if controls is None:
+        return None
+    if not controls:
+        raise UnknownControlError([], profile.profile_id)
+    index = profile.rule_index()
+    unknown = [c for c in controls if c not in index]
+    if unknown:
+        raise UnknownControlError(unknown, profile.profile_id)
+
+    selected: Set[int] = set()
+    pending = [position for c in controls for position in index[c]]
+    while pending:
+        position = pending.pop()
+        if position in selected:
+            continue
+        selected.add(position)
+        for dependency in profile.rules[position].depends_on:
+            pending.extend(index.get(dependency, ()))
+    return sorted(selected)
+
+
 def run_rules(
     profile: PolicyProfile,
     context: Dict[str, Any],
     evidence: Dict[str, Any],
+    positions: Optional[Sequence[int]] = None,
 ) -> List[Finding]:
     """
-    Run all rules in a profile and return a list of findings.
+    Run the rules of a profile (all, or those at `positions`; see
+    select_rules) and return a list of findings.
 
     Real implementation would:
     - Map rule.id to a concrete rule function
@@ -55,19 +157,71 @@ def run_rules(
     - Use evidence to perform checks
     """
     findings: List[Finding] = []
+    timer = timing.current()
+    per_rule = timer.per_rule
+    rules = profile.rules if positions is None else [profile.rules[p] for p in positions]
 
-    for rule_ref in profile.rules:
-        params = dict(rule_ref.params)
-        params.setdefault("severity", "medium")
-        params.setdefault("title", f"Rule {rule_ref.id}")
+    for rule_ref in rules:
+        params = _rule_params(rule_ref)
 
+        if per_rule:
+            start = time.perf_counter()
         finding = evaluate_rule(
             rule_id=rule_ref.id,
             params=params,
             context=context,
             evidence=evidence,
         )
+        if per_rule:
+            timer.add_rule(rule_ref.id, time.perf_counter() - start)
         if finding is not None:
             findings.append(finding)
 
     return findings
+
+
+def iter_rules(
+    profile: PolicyProfile,
+    context: Dict[str, Any],
+    evidence: Dict[str, Any],
+    max_workers: int = 8,
+    positions: Optional[Sequence[int]] = None,
+) -> Iterator[Tuple[int, Finding]]:
+    """
+    Run the profile's rules concurrently and yield ``(position, finding)``
+    in completion order, so fast rules are reported first. ``position`` is
+    the rule's index in ``profile.rules``. Only rules at ``positions`` run
+    when given. Rules that produce no finding are skipped.
+    """
+    if positions is None:
+        positions = range(len(profile.rules))
+    if not positions:
+        return
+    workers = max(1, min(max_workers, len(positions)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rule") as pool:
+        futures = {
+            pool.submit(
+                contextvars.copy_context().run,
+                evaluate_rule,
+                profile.rules[position].id,
+                _rule_params(profile.rules[position]),
+                context,
+                evidence,
+            ): position
+            for position in positions
+        }
+        try:
+            for future in as_completed(futures):
+                finding = future.result()
+                if finding is not None:
+                    yield futures[future], finding
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _rule_params(rule_ref: Any) -> Dict[str, Any]:
+    params = dict(rule_ref.params)
+    params.setdefault("severity", "medium")
+    params.setdefault("title", f"Rule {rule_ref.id}")
+    return params
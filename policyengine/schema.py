@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class RuleRef(BaseModel):
@@ -9,6 +9,10 @@ class RuleRef(BaseModel):
     id: str
     weight: float = Field(default=1.0, ge=0.0, description="Relative weight for scoring")
     params: Dict[str, Any] = Field(default_factory=dict)
+    controls: List[str] = Field(default_factory=list, description="Control ids this rule evaluates")
+    depends_on: List[str] = Field(
+        default_factory=list, description="Rule ids that must also run whenever this rule runs"
+    )
 
 
 class ProfileMetadata(BaseModel):
@@ -36,3 +40,18 @@ class PolicyProfile(BaseModel):
     metadata: ProfileMetadata = Field(default_factory=ProfileMetadata)
     rules: List[RuleRef] = Field(default_factory=list)
     config: Dict[str, Any] = Field(default_factory=dict)
+
+    _rule_index: Optional[Dict[str, List[int]]] = PrivateAttr(default=None)
+
+    def rule_index(self) -> Dict[str, List[int]]:
+        """
+        Rule id and control id -> positions in `rules`, built on first use
+        and kept with the (cached) profile.
+        """
+        if self._rule_index is None:
+            index: Dict[str, List[int]] = {}
+            for position, rule in enumerate(self.rules):
+                for key in dict.fromkeys([rule.id, *rule.controls]):
+                    index.setdefault(key, []).append(position)
+            self._rule_index = index
+        return self._rule_index
@@ -0,0 +1,235 @@
+"""
+Memory-mapped snapshot of the compiled profile registry.
+
+Every service worker would otherwise parse the same profile and rule YAML
+files and keep its own copy of the intermediate data. A snapshot holds
+the validated profiles and rule definitions, already serialized, in one
+read-only file. Each process maps it with mmap and `attach()`es it. The
+page cache then backs every worker from a single shared copy, and an
+entry is decoded (pydantic JSON, no YAML) only when a worker first needs
+it.
+
+File layout:
+
+    b"PESNAP01" | index length (8 bytes, big endian) | index JSON | entries
+
+The index maps each source file path to its entry as
+[offset, length, mtime_ns]. It also records the mtime of every YAML file
+scanned, so `is_current()` can tell when the snapshot is stale. A lookup
+whose mtime no longer matches misses, and the caller falls back to
+parsing the YAML.
+
+Build a snapshot at image build time:
+
+    python -m policyengine.snapshot /app/registry.snap
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .schema import PolicyProfile
+
+MAGIC = b"PESNAP01"
+_HEADER = len(MAGIC) + 8
+
+_active: Optional["RegistrySnapshot"] = None
+_lock = threading.Lock()
+
+
+class RegistrySnapshot:
+    """Read-only view of a snapshot file."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"Not a registry snapshot: {self.path}")
+        index_len = int.from_bytes(self._map[len(MAGIC) : _HEADER], "big")
+        index = json.loads(self._map[_HEADER : _HEADER + index_len])
+        self._base = _HEADER + index_len
+        self.profiles_dir: str = index["profiles_dir"]
+        self.rules_dir: str = index["rules_dir"]
+        self.sources: Dict[str, int] = index["sources"]
+        self._profiles: Dict[str, list] = index["profiles"]
+        self._rules: Dict[str, list] = index["rules"]
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, table: Dict[str, list], path: str, mtime_ns: int) -> Optional[bytes]:
+        entry = table.get(path)
+        if entry is None or entry[2] != mtime_ns:
+            self.misses += 1
+            return None
+        self.hits += 1
+        offset, length, _ = entry
+        return self._map[self._base + offset : self._base + offset + length]
+
+    def profile(self, path: str, mtime_ns: int) -> Optional[PolicyProfile]:
+        """The profile stored for `path`, or None if absent or stale."""
+        raw = self._entry(self._profiles, path, mtime_ns)
+        return None if raw is None else PolicyProfile.model_validate_json(raw)
+
+    def rule(self, path: str, mtime_ns: int) -> Any:
+        """The RuleDefinition stored for `path`, or None if absent or stale."""
+        from .rules_catalog import RuleDefinition
+
+        raw = self._entry(self._rules, path, mtime_ns)
+        return None if raw is None else RuleDefinition.model_validate_json(raw)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "bytes": len(self._map),
+            "profiles": len(self._profiles),
+            "rules": len(self._rules),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def _scan(directory: Path) -> Dict[str, int]:
+    return {str(p): p.stat().st_mtime_ns for p in sorted(directory.glob("*.yaml"))}
+
+
+def _dirs(profiles_dir: Optional[Path], rules_dir: Optional[Path]) -> tuple[Path, Path]:
+    from . import profiles, rules_catalog
+
+    return Path(profiles_dir or profiles.PROFILES_DIR), Path(rules_dir or rules_catalog.RULES_DIR)
+
+
+def build_snapshot(
+    path: Path | str,
+    profiles_dir: Optional[Path] = None,
+    rules_dir: Optional[Path] = None,
+) -> Dict[str, int]:
+    """
+    Parse every profile and rule definition and write them to `path`.
+
+    Invalid files are left out (lookups for them fall back to YAML and
+    fail there as usual). The file is written to a temp file and renamed
+    into place, so concurrent builders and readers never see a partial
+    snapshot.
+    """
+    import yaml
+
+    from .rules_catalog import RuleDefinition
+
+    profiles_dir, rules_dir = _dirs(profiles_dir, rules_dir)
+    sources = {**_scan(profiles_dir), **_scan(rules_dir)}
+    blobs: list[bytes] = []
+    offset = 0
+    tables: Dict[str, Dict[str, list]] = {"profiles": {}, "rules": {}}
+
+    for source, mtime_ns in sources.items():
+        try:
+            data = yaml.safe_load(Path(source).read_text(encoding="utf-8"))
+            if Path(source).parent == rules_dir:
+                if not isinstance(data, dict) or "rule_id" not in data:
+                    continue
+                table, blob = "rules", RuleDefinition.from_yaml_dict(data).model_dump_json()
+            else:
+                table, blob = "profiles", PolicyProfile.model_validate(data).model_dump_json()
+        except Exception:  # noqa: BLE001
+            continue
+        raw = blob.encode("utf-8")
+        tables[table][source] = [offset, len(raw), mtime_ns]
+        blobs.append(raw)
+        offset += len(raw)
+
+    index = json.dumps(
+        {
+            "profiles_dir": str(profiles_dir),
+            "rules_dir": str(rules_dir),
+            "sources": sources,
+            **tables,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".snap-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC + len(index).to_bytes(8, "big") + index)
+            f.writelines(blobs)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return {
+        "profiles": len(tables["profiles"]),
+        "rules": len(tables["rules"]),
+        "bytes": _HEADER + len(index) + offset,
+    }
+
+
+def is_current(
+    snapshot: RegistrySnapshot,
+    profiles_dir: Optional[Path] = None,
+    rules_dir: Optional[Path] = None,
+) -> bool:
+    """True if the snapshot was built from the current YAML files."""
+    profiles_dir, rules_dir = _dirs(profiles_dir, rules_dir)
+    return (
+        snapshot.profiles_dir == str(profiles_dir)
+        and snapshot.rules_dir == str(rules_dir)
+        and snapshot.sources == {**_scan(profiles_dir), **_scan(rules_dir)}
+    )
+
+
+def attach(path: Path | str) -> RegistrySnapshot:
+    """Map `path` and serve profile/rule lookups from it in this process."""
+    return _activate(RegistrySnapshot(path))
+
+
+def _activate(snapshot: RegistrySnapshot) -> RegistrySnapshot:
+    global _active
+    with _lock:
+        # A replaced snapshot is unmapped once no lookup references it.
+        _active = snapshot
+    return snapshot
+
+
+def ensure_snapshot(path: Path | str) -> RegistrySnapshot:
+    """Attach `path`, (re)building it first if it is missing or stale."""
+    try:
+        snapshot = RegistrySnapshot(path)
+    except (OSError, ValueError):
+        snapshot = None
+    if snapshot is not None and is_current(snapshot):
+        return _activate(snapshot)
+    if snapshot is not None:
+        snapshot.close()
+    build_snapshot(path)
+    return attach(path)
+
+
+def detach() -> None:
+    global _active
+    with _lock:
+        _active = None
+
+
+def active() -> Optional[RegistrySnapshot]:
+    """The snapshot attached in this process, if any."""
+    return _active
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m policyengine.snapshot <output path>")
+    print(json.dumps(build_snapshot(sys.argv[1])))
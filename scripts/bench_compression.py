@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+CPU time vs bytes saved for each response encoding and level, per profile.
+Evaluates every loadable profile, then compresses the EvalResponse JSON with
+every available codec (gzip always; zstd/brotli when installed).
+Usage: python scripts/bench_compression.py [--repeat 20] [--chunked]
+"""
+
+import argparse
+import time
+
+from policyengine import evaluate
+from policyengine.models import EvalResponse
+from policyengine.profiles import PROFILES_DIR, load_profile_file
+from services.policyengine_svc.compression import CODECS
+from services.policyengine_svc.responses import dumps
+
+LEVELS = {"gzip": (1, 6, 9), "zstd": (1, 3, 9, 19), "br": (1, 4, 9, 11)}
+
+
+def profile_payloads():
+    for path in sorted(PROFILES_DIR.glob("*.yaml")):
+        try:
+            profile = load_profile_file(path)
+        except Exception:  # noqa: BLE001
+            continue
+        ref = f"{path.stem}@{profile.version}"
+        result = evaluate(ref, {"system_id": "bench", "system_name": "bench"}, {})
+        yield ref, dumps(EvalResponse.model_validate(result))
+
+
+def compress(encoding: str, level: int, body: bytes, chunked: bool) -> bytes:
+    codec = CODECS[encoding][0](level)
+    if not chunked:
+        return codec.chunk(body, final=True)
+    lines = body.splitlines(keepends=True) or [body]
+    return b"".join(codec.chunk(line, final=False) for line in lines) + codec.chunk(b"", final=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--chunked", action="store_true", help="Compress line by line (streaming)")
+    args = parser.parse_args()
+
+    print(f"[bench] codecs: {', '.join(CODECS)}")
+    for ref, body in profile_payloads():
+        print(f"[bench] {ref}: {len(body)} bytes")
+        for encoding in CODECS:
+            for level in LEVELS[encoding]:
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    out = compress(encoding, level, body, args.chunked)
+                ms = (time.perf_counter() - start) / args.repeat * 1000
+                print(
+                    f"[bench]   {encoding:<5} level={level:<3} {len(out):>9} bytes "
+                    f"ratio={len(body) / len(out):5.1f}x  {ms:7.3f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
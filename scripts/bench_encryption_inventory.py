@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Benchmark the bulk endpoint-inventory evaluator behind encryption_required.
+Usage: python scripts/bench_encryption_inventory.py [--endpoints 1000000] [--systems 5000]
+"""
+
+import argparse
+import random
+import time
+
+from policyengine.ops import encryption
+
+PARAMS = {"require_tls_min": "1.2", "require_kms": True, "disallow_http": True}
+
+
+def synthetic_endpoints(count: int, systems: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "id": f"ep-{i}",
+            "system_id": f"sys-{i % systems}",
+            "scheme": "http" if rng.random() < 0.001 else "https",
+            "tls_version": rng.choice(["1.2", "1.3", "1.3", "1.1"]),
+            "cipher": rng.choice(["TLS_AES_256_GCM_SHA384", "ECDHE-RSA-AES128-GCM-SHA256"]),
+            "kms_key_ref": f"kv/key-{i % 64}" if rng.random() > 0.0005 else None,
+        }
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"[bench] {label:<28} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoints", type=int, default=1_000_000)
+    parser.add_argument("--systems", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=encryption.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    keys = [{"id": f"kv/key-{i}"} for i in range(64)]
+    records = list(synthetic_endpoints(args.endpoints, args.systems))
+    print(
+        f"[bench] endpoints={args.endpoints} systems={args.systems} "
+        f"numpy={encryption.np is not None}"
+    )
+
+    cols = timed("normalize", lambda: encryption.normalize_endpoints(records, keys))
+    timed("signals (python)", lambda: encryption.compute_signals(cols, PARAMS, use_numpy=False))
+    if encryption.np is not None:
+        timed("signals (numpy)", lambda: encryption.compute_signals(cols, PARAMS, use_numpy=True))
+    timed(
+        f"fleet (batch={args.batch_size})",
+        lambda: encryption.evaluate_fleet(records, PARAMS, keys, batch_size=args.batch_size),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Measure peak RSS while streaming a large evidence file through an EvidenceHandle.
+Usage: python scripts/bench_evidence_streaming.py [--size-mb 5120] [--format ndjson|json] [--keep]
+"""
+
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from policyengine.evidence_handles import EvidenceHandle
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def write_file(path: Path, size_mb: int, fmt: str) -> int:
+    row = {
+        "id": "ep-0",
+        "system_id": "sys-0",
+        "scheme": "https",
+        "tls_version": "1.2",
+        "kms_key_ref": "kv/key-1",
+        "notes": "x" * 120,
+    }
+    target = size_mb * 1024 * 1024
+    written = count = 0
+    with path.open("w", encoding="utf-8") as f:
+        if fmt == "json":
+            f.write("[")
+        while written < target:
+            row["id"] = f"ep-{count}"
+            text = json.dumps(row)
+            if fmt == "json":
+                text = ("," if count else "") + text
+            else:
+                text += "\n"
+            f.write(text)
+            written += len(text)
+            count += 1
+        if fmt == "json":
+            f.write("]")
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--format", choices=["ndjson", "json"], default="ndjson")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated file")
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="4thgrc-bench-"))
+    path = tmp_dir / f"inventory.{args.format}"
+    expected = write_file(path, args.size_mb, args.format)
+    baseline = peak_rss_mb()
+    print(f"[bench] file={path} size={path.stat().st_size / 1e6:.0f} MB records={expected}")
+
+    start = time.perf_counter()
+    count = sum(1 for _ in EvidenceHandle(path).iter_fields("id", "tls_version"))
+    elapsed = time.perf_counter() - start
+
+    throughput = path.stat().st_size / 1e6 / elapsed
+    print(f"[bench] streamed {count} records in {elapsed:.1f}s ({throughput:.0f} MB/s)")
+    print(f"[bench] peak RSS {peak_rss_mb():.0f} MB (before streaming: {baseline:.0f} MB)")
+
+    if not args.keep:
+        path.unlink()
+        tmp_dir.rmdir()
+
+
+if __name__ == "__main__":
+    main()
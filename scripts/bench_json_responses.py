@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Compare EvalResponse serialization: FastAPI's default response_model path
+(validate + jsonable_encoder + json.dumps) vs FastJSONResponse.
+Usage: python scripts/bench_json_responses.py [--findings 30,300,3000] [--repeat 50]
+"""
+
+import argparse
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from policyengine.models import EvalResponse
+from services.policyengine_svc.responses import FastJSONResponse, orjson
+
+
+def make_response(findings: int) -> EvalResponse:
+    rows = [
+        {
+            "id": f"rule_{i}",
+            "title": f"Rule {i}",
+            "severity": "high",
+            "status": "fail" if i % 3 else "pass",
+            "message": f"Rule rule_{i} failed for system 'bench'.",
+            "data": {
+                "system": "bench",
+                "params": {"severity": "high", "title": f"Rule {i}", "require_tls_min": "1.2"},
+                "signals": {
+                    "HTTP_ENDPOINTS": [f"ep-{j}" for j in range(10)],
+                    "TLS_MIN_SEEN": "1.2",
+                },
+            },
+        }
+        for i in range(findings)
+    ]
+    return EvalResponse.model_validate(
+        {
+            "profile_ref": "bench@1.0.0",
+            "summary": {
+                "score": 0.5,
+                "verdict": "fail",
+                "finding_count": findings,
+                "profile_ref": "bench@1.0.0",
+            },
+            "findings": rows,
+        }
+    )
+
+
+def default_path(model: EvalResponse) -> bytes:
+    # What FastAPI does for a response_model route: re-validate, encode, dump.
+    validated = EvalResponse.model_validate(model.model_dump())
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--findings", default="30,300,3000")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"[bench] orjson available: {orjson is not None}")
+    print(f"[bench] {'findings':>8} {'bytes':>10} {'default ms':>11} {'fast ms':>9} {'speedup':>8}")
+    for count in (int(c) for c in args.findings.split(",")):
+        model = make_response(count)
+        body = FastJSONResponse(model).body
+        default_ms = timed(lambda: default_path(model), args.repeat)
+        fast_ms = timed(lambda: FastJSONResponse(model).body, args.repeat)
+        print(
+            f"[bench] {count:>8} {len(body):>10} {default_ms:>11.2f} {fast_ms:>9.2f} "
+            f"{default_ms / fast_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Measure service startup and the first /openapi.json request in fresh
+processes when the schema is generated eagerly at startup, generated
+lazily on first request, or served from the build-time artifact
+(OPENAPI_ARTIFACT_PATH).
+Usage: python scripts/bench_openapi_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Runs in each process: import the app and run its lifespan (startup), then
+# time the first /openapi.json request.
+WORKER = r"""
+import json, sys, time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from services.policyengine_svc.main import app
+with TestClient(app) as client:
+    if sys.argv[1] == "eager":
+        app.openapi()
+    startup = time.perf_counter() - start
+    generated_at_startup = app.openapi_schema is not None
+    start = time.perf_counter()
+    response = client.get("/openapi.json")
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    client.get("/openapi.json", headers={"If-None-Match": response.headers["ETag"]})
+    revalidate = time.perf_counter() - start
+print(json.dumps({"startup": startup, "first": first, "revalidate": revalidate,
+                  "generated_at_startup": generated_at_startup, "bytes": len(response.content)}))
+"""
+
+
+def run(mode: str, artifact: Path, runs: int) -> list:
+    env = {**os.environ, "OPENAPI_ARTIFACT_PATH": str(artifact) if mode == "artifact" else ""}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    reports = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", WORKER, mode],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        reports.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return reports
+
+
+def summarize(name: str, reports: list) -> None:
+    med = {
+        k: statistics.median(r[k] for r in reports) * 1000
+        for k in ("startup", "first", "revalidate")
+    }
+    print(
+        f"{name:9s} startup {med['startup']:7.1f} ms  first /openapi.json {med['first']:6.1f} ms  "
+        f"304 {med['revalidate']:5.1f} ms  "
+        f"(schema at startup: {reports[0]['generated_at_startup']}, {reports[0]['bytes']} bytes)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Fresh processes per mode (median reported)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="4thgrc-bench-") as tmp:
+        artifact = Path(tmp) / "openapi.json"
+        subprocess.run(
+            [
+                sys.executable,
+                "-W",
+                "ignore",
+                "scripts/publish_openapi.py",
+                "--output",
+                str(artifact),
+            ],
+            env={**os.environ, "PYTHONPATH": os.getcwd()},
+            capture_output=True,
+            check=True,
+        )
+        print(
+            f"[bench] {args.runs} runs per mode, artifact {artifact.stat().st_size / 1024:.0f} KiB"
+        )
+        for mode in ("eager", "lazy", "artifact"):
+            summarize(mode, run(mode, artifact, args.runs))
+
+
+if __name__ == "__main__":
+    main()
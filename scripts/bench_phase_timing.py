@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Measure the overhead of policyengine.timing phase timers on evaluate().
+Usage: python scripts/bench_phase_timing.py [--iterations 2000] [--rounds 5]
+"""
+
+import argparse
+import time
+
+from policyengine import evaluate, timing
+
+PROFILE_REF = "iso_42001-global@1.2.0"
+CONTEXT = {"system_id": "bench", "system_name": "bench"}
+EVIDENCE = {
+    "encryption": [
+        {"id": f"ep-{i}", "url": f"https://ep-{i}", "tls_version": "1.3", "kms_key_ref": "kv/k"}
+        for i in range(50)
+    ]
+}
+
+
+def run(iterations: int, mode: str) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if mode == "off":
+            evaluate(PROFILE_REF, CONTEXT, EVIDENCE)
+        else:
+            with timing.record(per_rule=mode == "per-rule"):
+                evaluate(PROFILE_REF, CONTEXT, EVIDENCE)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    run(50, "off")  # warm caches
+    # Interleave modes and keep the best round of each to dampen noise.
+    best = {"off": float("inf"), "phases": float("inf"), "per-rule": float("inf")}
+    for _ in range(args.rounds):
+        for mode in best:
+            best[mode] = min(best[mode], run(args.iterations, mode))
+
+    base = best["off"]
+    for mode, seconds in best.items():
+        per_call_us = seconds / args.iterations * 1e6
+        overhead = 100 * (seconds - base) / base
+        print(f"[bench] {mode:<9} {per_call_us:9.1f} us/eval  overhead {overhead:+6.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Compare evaluation throughput of the thread and process execution backends
+as worker count grows (CPU-bound rule ops scale only on the process pool).
+Usage: python scripts/bench_process_pool.py [--requests 64] [--endpoints 20000] [--max-workers N]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from policyengine.models import EvalRequest
+from services.policyengine_svc.evaluation import ProcessPoolBackend, ThreadBackend
+
+
+def make_request(endpoints: int) -> EvalRequest:
+    rows = [
+        {
+            "id": f"ep-{i}",
+            "scheme": "https",
+            "tls_version": "1.3" if i % 3 else "1.2",
+            "kms_key_ref": f"kv/key-{i % 64}",
+        }
+        for i in range(endpoints)
+    ]
+    return EvalRequest(
+        profile_ref="iso_42001-global@1.2.0",
+        context={"system_id": "bench"},
+        evidence={"encryption": rows},
+    )
+
+
+def throughput(backend, request: EvalRequest, count: int, clients: int) -> float:
+    backend.run(request)  # warm-up
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(lambda _: backend.run(request), range(count)))
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--endpoints", type=int, default=20_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    request = make_request(args.endpoints)
+    counts = sorted({1, *range(2, args.max_workers + 1, 2), args.max_workers})
+    print(f"[bench] {args.requests} requests x {args.endpoints} endpoints, cores={os.cpu_count()}")
+    print(f"[bench] {'workers':>7} {'thread req/s':>13} {'process req/s':>14} {'speedup':>8}")
+
+    for workers in counts:
+        threaded = throughput(ThreadBackend(), request, args.requests, workers)
+        backend = ProcessPoolBackend(workers)
+        try:
+            pooled = throughput(backend, request, args.requests, workers)
+        finally:
+            backend.shutdown()
+        print(f"[bench] {workers:>7} {threaded:>13.1f} {pooled:>14.1f} {pooled / threaded:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Compare startup time and per-worker memory of N concurrently running workers
+that load the profile registry from YAML, decode all of it from a shared mmap
+snapshot, or attach the snapshot and decode only the profile they serve.
+Usage: python scripts/bench_registry_snapshot.py [--workers 4] [--copies 200]
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from policyengine import profiles, rules_catalog, snapshot
+
+# Runs in each worker: load the registry, report timings and memory, then
+# stay alive until stdin closes so all workers are measured side by side.
+WORKER = r"""
+import json, sys, time
+start = time.perf_counter()
+from policyengine import profiles, registry, snapshot
+profiles.PROFILES_DIR = __import__("pathlib").Path(sys.argv[1])
+mode = sys.argv[3]
+if mode != "yaml":
+    snapshot.attach(sys.argv[2])
+if mode == "lazy":
+    count = len([profiles.load_profile_by_ref("bench-0@latest")])
+else:
+    count = len(registry.preload()["profiles"])
+elapsed = time.perf_counter() - start
+mem = {}
+for line in open("/proc/self/smaps_rollup"):
+    key, _, value = line.partition(":")
+    if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+        mem[key] = int(value.split()[0]) / 1024
+print(json.dumps({"seconds": elapsed, "profiles": count, **mem}), flush=True)
+sys.stdin.read()
+"""
+
+
+def make_profiles(target: Path, copies: int) -> None:
+    """Copy the valid demo profile `copies` times under distinct ids."""
+    base = yaml.safe_load(
+        (profiles.PROFILES_DIR / "iso_42001-global.yaml").read_text(encoding="utf-8")
+    )
+    for i in range(copies):
+        data = dict(base, profile_id=f"bench-{i}")
+        (target / f"bench-{i}.yaml").write_text(yaml.safe_dump(data), encoding="utf-8")
+
+
+def run_workers(count: int, profiles_dir: Path, snapshot_path: Path, mode: str) -> list:
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER, str(profiles_dir), str(snapshot_path), mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(count)
+    ]
+    reports = [json.loads(p.stdout.readline()) for p in procs]
+    for p in procs:
+        p.communicate("")
+    return reports
+
+
+def summarize(name: str, reports: list) -> None:
+    n = len(reports)
+    avg = {
+        k: sum(r[k] for r in reports) / n
+        for k in ("seconds", "Rss", "Pss", "Private_Clean", "Private_Dirty")
+    }
+    private = avg["Private_Clean"] + avg["Private_Dirty"]
+    print(
+        f"{name:9s} startup {avg['seconds'] * 1000:7.1f} ms  RSS {avg['Rss']:6.1f} MB  "
+        f"PSS {avg['Pss']:6.1f} MB  private {private:6.1f} MB  (profiles={reports[0]['profiles']})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--copies", type=int, default=200, help="Synthetic profiles to load")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="4thgrc-bench-"))
+    try:
+        profiles_dir = tmp / "profiles"
+        profiles_dir.mkdir()
+        make_profiles(profiles_dir, args.copies)
+        snap_path = tmp / "registry.snap"
+        info = snapshot.build_snapshot(
+            snap_path, profiles_dir=profiles_dir, rules_dir=rules_catalog.RULES_DIR
+        )
+        print(
+            f"[bench] {args.workers} workers, snapshot {info['bytes'] / 1024:.0f} KiB "
+            f"({info['profiles']} profiles, {info['rules']} rules)"
+        )
+
+        for mode in ("yaml", "snapshot", "lazy"):
+            summarize(mode, run_workers(args.workers, profiles_dir, snap_path, mode))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
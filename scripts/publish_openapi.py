@@ -1,23 +1,24 @@
 #!/usr/bin/env python
 """
-Export FastAPI OpenAPI schema and optionally push to APIM.
-Usage: python scripts/publish_openapi.py
+Export the customized OpenAPI schema and optionally push to APIM.
+Usage: python scripts/publish_openapi.py [--output /app/openapi.json]
+
+With --output, only the artifact the service serves is written (image build).
 """
 
-import json
+import argparse
 import os
 from pathlib import Path
 
 from services.policyengine_svc.main import app
+from services.policyengine_svc.openapi_overrides import write_openapi_artifact
 
 OUT_FILE = Path(__file__).resolve().parents[1] / "docs" / "api" / "openapi.json"
 
 
-def export_openapi() -> None:
-    schema = app.openapi()
-    OUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    OUT_FILE.write_text(json.dumps(schema, indent=2), encoding="utf-8")
-    print(f"[openapi] Wrote {OUT_FILE}")
+def export_openapi(out_file: Path = OUT_FILE) -> None:
+    etag = write_openapi_artifact(app, out_file)
+    print(f"[openapi] Wrote {out_file} (ETag {etag})")
 
 
 def publish_to_apim() -> None:
@@ -31,6 +32,12 @@ def publish_to_apim() -> None:
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", type=Path, help="write only this artifact; skip docs/ and APIM")
+    args = parser.parse_args()
+    if args.output:
+        export_openapi(args.output)
+        return
     export_openapi()
     publish_to_apim()
 
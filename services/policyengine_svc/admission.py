@@ -0,0 +1,249 @@
+"""Admission control and load shedding for evaluation routes.
+
+Without a limit, an overloaded replica accepts every request and they all
+slow down together until clients hit their 45 s / 60 s timeouts. The
+:class:`AdmissionController` caps concurrent evaluations and keeps a
+bounded FIFO queue in front of them:
+
+* a free slot            -> the request runs immediately
+* all slots busy         -> the request waits in the queue, at most
+                            ``admission_queue_timeout_seconds``
+* queue full             -> ``429 Too Many Requests``
+* queue wait deadline    -> ``503 Service Unavailable``
+
+Rejections carry a ``Retry-After`` estimated from recent run durations.
+Every evaluation takes one slot: a ``/v1/evaluate`` or ``:stream``
+request (via :class:`AdmissionMiddleware`), each item of a ``:batch``
+request, and each evaluation job. Jobs never get shed; a job worker that
+is rejected retries after ``Retry-After``.
+The concurrency limit is ``ADMISSION_MAX_CONCURRENT`` or, when unset,
+``engine.max_concurrent_runs`` from ``agents/configs/settings.yaml``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .config import get_settings
+
+# Smoothing factor for the run-duration moving average used by Retry-After.
+_EWMA_ALPHA = 0.2
+
+
+def engine_max_concurrent_runs() -> int:
+    """``engine.max_concurrent_runs`` from the agent settings, or 0 if unavailable."""
+    try:
+        from agents.configs.loader import load_settings
+    except ImportError:
+        return 0
+    try:
+        value = (load_settings().get("engine") or {}).get("max_concurrent_runs")
+        return int(value or 0)
+    except (OSError, TypeError, ValueError):
+        return 0
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, deadline-aware FIFO wait queue."""
+
+    def __init__(
+        self, max_concurrent: int, max_queue: int = 50, queue_timeout_seconds: float = 10.0
+    ) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._active = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._avg_run_seconds = 0.0
+        # Counters are read from other threads (stats endpoints), so guard them.
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+        self._max_queue_depth = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free for a new arrival."""
+        backlog = len(self._waiters) + 1
+        estimate = self._avg_run_seconds * backlog / self.max_concurrent
+        return max(1, math.ceil(estimate))
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the time spent queued in seconds."""
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self._record_admit(0.0)
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            with self._lock:
+                self._rejected_queue_full += 1
+            raise AdmissionRejected(429, "Admission queue is full", self.retry_after())
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        with self._lock:
+            self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the deadline passed; give it back.
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            with self._lock:
+                self._rejected_timeout += 1
+            raise AdmissionRejected(
+                503, "Timed out waiting for an evaluation slot", self.retry_after()
+            )
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            raise
+        waited = time.perf_counter() - start
+        self._record_admit(waited)
+        return waited
+
+    def release(self, run_seconds: Optional[float] = None) -> None:
+        """Free a slot, handing it directly to the oldest waiter if any."""
+        if run_seconds is not None:
+            self._avg_run_seconds += _EWMA_ALPHA * (run_seconds - self._avg_run_seconds)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # the slot transfers; _active is unchanged
+                return
+        self._active -= 1
+
+    def acquire_from_thread(self, loop: asyncio.AbstractEventLoop) -> float:
+        """Block a worker thread until ``loop`` grants it a slot.
+
+        For evaluations run outside the event loop (jobs). Instead of being
+        shed, the caller retries after ``Retry-After`` until admitted.
+        """
+        while True:
+            try:
+                return asyncio.run_coroutine_threadsafe(self.acquire(), loop).result()
+            except AdmissionRejected as exc:
+                time.sleep(exc.retry_after)
+
+    def release_from_thread(
+        self, loop: asyncio.AbstractEventLoop, run_seconds: Optional[float] = None
+    ) -> None:
+        """Release a slot taken with :meth:`acquire_from_thread`."""
+        loop.call_soon_threadsafe(self.release, run_seconds)
+
+    def _record_admit(self, waited: float) -> None:
+        with self._lock:
+            self._admitted += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout_seconds": self.queue_timeout_seconds,
+                "active": self._active,
+                "queue_depth": len(self._waiters),
+                "max_queue_depth": self._max_queue_depth,
+                "admitted": self._admitted,
+                "rejected_queue_full": self._rejected_queue_full,
+                "rejected_timeout": self._rejected_timeout,
+                "wait_seconds_total": self._wait_seconds_total,
+                "wait_seconds_max": self._wait_seconds_max,
+                "avg_run_seconds": self._avg_run_seconds,
+            }
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """Return the service admission controller, or None when no limit is configured."""
+    global _controller
+    if _controller is None:
+        settings = get_settings()
+        limit = settings.admission_max_concurrent or engine_max_concurrent_runs()
+        if limit <= 0:
+            return None
+        with _controller_lock:
+            if _controller is None:
+                _controller = AdmissionController(
+                    limit, settings.admission_max_queue, settings.admission_queue_timeout_seconds
+                )
+    return _controller
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the admission controller to the given paths (exact match)."""
+
+    def __init__(
+        self, app: Any, paths: Tuple[str, ...] = ("/v1/evaluate", "/v1/evaluate:stream")
+    ) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        controller = get_admission_controller()
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await controller.acquire()
+        except AdmissionRejected as exc:
+            await _send_rejection(send, exc)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - start)
+
+
+async def _send_rejection(send: Any, exc: AdmissionRejected) -> None:
+    body = json.dumps({"detail": exc.reason}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": exc.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(exc.retry_after).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,230 @@
+"""Batch evaluation endpoint: ``POST /v1/evaluate:batch``.
+
+Monitoring sweeps evaluate thousands of systems; sending each as its own
+``/v1/evaluate`` call pays TLS, APIM and JSON overhead per request. This
+endpoint accepts many ``EvalRequest`` objects in one call, either as a
+JSON array (``application/json``) or as an NDJSON stream
+(``application/x-ndjson``), evaluates them with bounded concurrency and
+streams one NDJSON line back per item as soon as it completes::
+
+    {"index": 0, "status": 200, "result": {...EvalResponse...}}
+    {"index": 2, "status": 404, "error": "Profile not found: ..."}
+
+Lines arrive in completion order; ``index`` refers to the item's position
+in the request. A failing item produces an error line and never fails the
+rest of the batch. At most ``batch_max_concurrency`` items are evaluated
+at once, and each item takes its own admission slot (an item that is shed
+gets a ``429``/``503`` line). The request body is read before the response starts streaming:
+Starlette listens for client disconnects on the same ``receive`` channel
+once a streaming response begins, so the body cannot be consumed from
+inside the response generator.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from policyengine.models import EvalRequest
+
+from .admission import AdmissionRejected, get_admission_controller
+from .config import get_settings
+from .evaluation import run_evaluation
+from .rate_limit import enforce_rate_limit
+from .responses import dumps
+
+router = APIRouter()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_DONE = object()
+
+
+class _InvalidItem:
+    """Placeholder for an NDJSON line that is not valid JSON."""
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+def _is_ndjson(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "").lower()
+    return "ndjson" in content_type or "jsonlines" in content_type
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return _InvalidItem(f"Invalid JSON line: {exc}")
+
+
+async def _read_ndjson(request: Request, max_items: int) -> List[Any]:
+    items: List[Any] = []
+    buf = b""
+    async for chunk in request.stream():
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        items.extend(_parse_line(line) for line in lines if line.strip())
+        if len(items) > max_items:
+            raise HTTPException(
+                status_code=413, detail=f"Batch limit of {max_items} items exceeded"
+            )
+    if buf.strip():
+        items.append(_parse_line(buf))
+    if len(items) > max_items:
+        raise HTTPException(status_code=413, detail=f"Batch limit of {max_items} items exceeded")
+    return items
+
+
+async def _iter_list(items: List[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+async def evaluate_item(index: int, raw: Any) -> Dict[str, Any]:
+    """Evaluate one batch item and return its NDJSON entry."""
+    if isinstance(raw, _InvalidItem):
+        return {"index": index, "status": 400, "error": raw.message}
+    try:
+        request = EvalRequest.model_validate(raw)
+    except ValidationError as exc:
+        return {"index": index, "status": 422, "error": exc.errors(include_url=False)}
+
+    controller = get_admission_controller()
+    if controller is not None:
+        try:
+            await controller.acquire()
+        except AdmissionRejected as exc:
+            return {"index": index, "status": exc.status_code, "error": exc.reason}
+    start = time.perf_counter()
+    try:
+        response = await run_in_threadpool(run_evaluation, request)
+    except HTTPException as exc:
+        return {"index": index, "status": exc.status_code, "error": exc.detail}
+    except Exception:  # noqa: BLE001
+        return {"index": index, "status": 500, "error": "Internal evaluation error"}
+    finally:
+        if controller is not None:
+            controller.release(time.perf_counter() - start)
+    return {"index": index, "status": 200, "result": response}
+
+
+async def stream_batch(
+    items: AsyncIterator[Any],
+    *,
+    concurrency: int,
+    max_items: int,
+) -> AsyncIterator[bytes]:
+    """Evaluate ``items`` with bounded concurrency, yielding NDJSON lines."""
+    queue: "asyncio.Queue[Any]" = asyncio.Queue()
+    slots = asyncio.Semaphore(concurrency)
+    workers: List["asyncio.Task[None]"] = []
+
+    async def work(index: int, raw: Any) -> None:
+        try:
+            entry = await evaluate_item(index, raw)
+        finally:
+            slots.release()
+        await queue.put(entry)
+
+    async def feed() -> None:
+        index = 0
+        try:
+            async for raw in items:
+                if index >= max_items:
+                    await queue.put(
+                        {
+                            "index": index,
+                            "status": 413,
+                            "error": f"Batch limit of {max_items} items exceeded",
+                        }
+                    )
+                    break
+                await slots.acquire()
+                workers.append(asyncio.create_task(work(index, raw)))
+                index += 1
+        except Exception as exc:  # noqa: BLE001
+            await queue.put(
+                {"index": index, "status": 400, "error": f"Could not read batch: {exc}"}
+            )
+        finally:
+            await asyncio.gather(*workers, return_exceptions=True)
+            await queue.put(_DONE)
+
+    feeder = asyncio.create_task(feed())
+    try:
+        while True:
+            entry = await queue.get()
+            if entry is _DONE:
+                break
+            yield dumps(entry) + b"\n"
+    finally:
+        feeder.cancel()
+        for worker in workers:
+            worker.cancel()
+
+
+_BATCH_BODY_SCHEMA = {
+    "type": "array",
+    "items": {"$ref": "#/components/schemas/EvalRequest"},
+}
+
+
+@router.post(
+    "/v1/evaluate:batch",
+    tags=["evaluation"],
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "One NDJSON line per item"}
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": _BATCH_BODY_SCHEMA},
+                NDJSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/EvalRequest"}},
+            },
+        }
+    },
+)
+async def evaluate_batch_endpoint(request: Request) -> StreamingResponse:
+    """
+    Evaluate many EvalRequests in one call and stream the results as NDJSON.
+    """
+    settings = get_settings()
+
+    if _is_ndjson(request):
+        payload = await _read_ndjson(request, settings.batch_max_items)
+    else:
+        try:
+            payload = json.loads(await request.body())
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {exc}") from exc
+        if not isinstance(payload, list):
+            raise HTTPException(
+                status_code=400, detail="Batch body must be a JSON array of EvalRequest objects"
+            )
+        if len(payload) > settings.batch_max_items:
+            raise HTTPException(
+                status_code=413, detail=f"Batch limit of {settings.batch_max_items} items exceeded"
+            )
+
+    enforce_rate_limit(
+        request, [item.get("profile_ref", "") for item in payload if isinstance(item, dict)]
+    )
+    return StreamingResponse(
+        stream_batch(
+            _iter_list(payload),
+            concurrency=settings.batch_max_concurrency,
+            max_items=settings.batch_max_items,
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
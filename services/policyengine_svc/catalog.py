@@ -0,0 +1,111 @@
+"""Profile catalog API: ``GET /v1/profiles`` and ``GET /v1/profiles/{id}``.
+
+Served from a :class:`policyengine.catalog.ProfileCatalog` built once at
+startup, so catalog requests never touch the filesystem. Lists can be
+filtered by ``standard`` and ``tag`` (repeatable; all must match) and are
+paginated with an opaque ``cursor``. Responses carry an ``ETag``: the
+catalog digest combined with the query for lists, and the profile file
+digest for single profiles. ``If-None-Match`` yields ``304``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+
+from policyengine.catalog import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ProfileCatalog
+from policyengine.profiles import split_profile_ref
+
+from .result_cache import etag_for, etag_matches
+
+router = APIRouter()
+
+_catalog: Optional[ProfileCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> ProfileCatalog:
+    """Return the in-memory catalog, building it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ProfileCatalog.build()
+    return _catalog
+
+
+def set_catalog(catalog: ProfileCatalog) -> None:
+    global _catalog
+    _catalog = catalog
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+@router.get("/v1/profiles", tags=["profiles"], responses={304: {"description": "Not Modified"}})
+def list_profiles(
+    response: Response,
+    standard: List[str] = Query(default=[]),
+    tag: List[str] = Query(default=[]),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Any:
+    """List profiles, optionally filtered by metadata standards and tags."""
+    catalog = get_catalog()
+    query = "|".join(
+        [
+            catalog.digest,
+            ",".join(sorted(s.lower() for s in standard)),
+            ",".join(sorted(t.lower() for t in tag)),
+            cursor or "",
+            str(limit),
+        ]
+    )
+    etag = etag_for(hashlib.sha256(query.encode("utf-8")).hexdigest())
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    try:
+        items, next_cursor = catalog.query(standard, tag, cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    response.headers["ETag"] = etag
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+
+@router.get(
+    "/v1/profiles/{profile_id}", tags=["profiles"], responses={304: {"description": "Not Modified"}}
+)
+def get_profile(
+    profile_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """
+    Catalog entry for one profile. ``profile_id`` may be a full profile_ref;
+    its ``@version`` must match the profile's version (``latest`` matches any).
+    """
+    bare_id, version = split_profile_ref(profile_id)
+    entry = get_catalog().get(bare_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    if version != "latest" and entry["version"] != version:
+        raise HTTPException(
+            status_code=404,
+            detail=(
+                f"Requested version {version}, but profile {bare_id} "
+                f"has version {entry['version']}"
+            ),
+        )
+
+    etag = etag_for(entry["digest"])
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)  # type: ignore[return-value]
+    response.headers["ETag"] = etag
+    return entry
@@ -0,0 +1,310 @@
+"""Negotiated response compression (gzip, zstd, brotli).
+
+Every ``Finding.data`` echoes the rule params, so responses for large
+profiles get big and cost APIM egress. :class:`CompressionMiddleware`
+picks an encoding from the client's ``Accept-Encoding`` (q-values
+honoured, ties broken by ``COMPRESSION_ENCODINGS`` order) and compresses
+responses of at least ``COMPRESSION_MIN_BYTES``:
+
+* ``gzip`` always (zlib, stdlib)
+* ``zstd`` when ``zstandard`` is installed
+* ``br``   when ``brotli`` is installed
+
+Streaming responses (NDJSON batches) are compressed incrementally with a
+flush after every chunk, so lines still reach the client as they are
+produced. Large chunks are compressed in a worker thread so the event
+loop is not blocked. Responses that are already encoded, partial (206) or
+of an already-compressed content type are passed through untouched.
+
+An encoded body is a different representation from the identity one, so
+its ``ETag`` gets the encoding appended (``"abc"`` -> ``"abc-gzip"``).
+When such a tag comes back in ``If-None-Match`` the suffix is removed
+before the request reaches the route, and a ``304`` gets it back.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None  # type: ignore[assignment]
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None  # type: ignore[assignment]
+
+# Chunks at least this large are compressed off the event loop.
+THREAD_MIN_BYTES = 128 * 1024
+
+# Media types that are already compressed or must not be buffered.
+EXCLUDED_CONTENT_TYPES = frozenset(
+    {
+        "application/gzip",
+        "application/x-gzip",
+        "application/zip",
+        "application/grpc",
+        "audio/*",
+        "font/woff",
+        "font/woff2",
+        "image/avif",
+        "image/gif",
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+        "text/event-stream",
+        "video/*",
+    }
+)
+
+
+class _Codec:
+    """Incremental compressor: ``chunk(data, final)`` returns the encoded bytes."""
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        raise NotImplementedError
+
+
+class _GzipCodec(_Codec):
+    def __init__(self, level: int) -> None:
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        return self._c.compress(data) + self._c.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _ZstdCodec(_Codec):
+    def __init__(self, level: int) -> None:
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        out = self._c.compress(data)
+        if final:
+            return out + self._c.flush()
+        return out + self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+class _BrotliCodec(_Codec):
+    def __init__(self, level: int) -> None:
+        self._c = brotli.Compressor(quality=level)
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        out = self._c.process(data)
+        return out + (self._c.finish() if final else self._c.flush())
+
+
+# encoding -> (codec factory, default level)
+CODECS: Dict[str, Tuple[Callable[[int], _Codec], int]] = {"gzip": (_GzipCodec, 6)}
+if zstandard is not None:
+    CODECS["zstd"] = (_ZstdCodec, 3)
+if brotli is not None:
+    CODECS["br"] = (_BrotliCodec, 4)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    return tuple(CODECS)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """``"gzip;q=0.8, br"`` -> ``{"gzip": 0.8, "br": 1.0}``."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate_encoding(header: Optional[str], preference: Sequence[str]) -> Optional[str]:
+    """Best available encoding for an Accept-Encoding header, or None for identity."""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best: Optional[str] = None
+    best_q = 0.0
+    for encoding in preference:
+        if encoding not in CODECS:
+            continue
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def tag_etag(etag: str, encoding: str) -> str:
+    """ETag of the ``encoding`` representation: ``W/"abc"`` -> ``W/"abc-br"``."""
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return f"{etag}-{encoding}"
+
+
+def untag_if_none_match(header: str, encoding: str) -> Tuple[str, bool]:
+    """Strip ``encoding`` tags from an If-None-Match value; returns (value, changed)."""
+    suffix = f'-{encoding}"'
+    tags = []
+    changed = False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.endswith(suffix):
+            tag = tag[: -len(suffix)] + '"'
+            changed = True
+        tags.append(tag)
+    return ", ".join(tags), changed
+
+
+def _is_excluded(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type.startswith("application/grpc+"):
+        media_type = "application/grpc"
+    return media_type in EXCLUDED_CONTENT_TYPES or (
+        media_type.partition("/")[0] + "/*" in EXCLUDED_CONTENT_TYPES
+    )
+
+
+class _CodecResponder:
+    """Compresses one response with ``encoding`` as its body messages pass."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        encoding: str,
+        level: Optional[int],
+        revalidating: bool = False,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        factory, default_level = CODECS[encoding]
+        self._factory = factory
+        self._level = default_level if level is None else level
+        self._codec: Optional[_Codec] = None
+        # The request carried an If-None-Match tag of this encoding.
+        self._revalidating = revalidating
+        self._send: Optional[Send] = None
+        self._start: Optional[Message] = None
+        self._passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._send = send
+        await self.app(scope, receive, self._send_with_compression)
+
+    async def _send_with_compression(self, message: Message) -> None:
+        assert self._send is not None
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            if message["status"] == 304 and self._revalidating and "etag" in headers:
+                headers["ETag"] = tag_etag(headers["etag"], self.encoding)
+            self._passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or _is_excluded(headers.get("content-type", ""))
+            )
+            if self._passthrough:
+                await self._send(message)
+            else:
+                # Held back until the first body chunk decides the headers.
+                self._start = message
+            return
+
+        if kind != "http.response.body" or self._passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is None:
+            message["body"] = await self._compress(body, more_body)
+            await self._send(message)
+            return
+
+        start, self._start = self._start, None
+        if len(body) < self.minimum_size and not more_body:
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+        message["body"] = await self._compress(body, more_body)
+        headers = MutableHeaders(raw=start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        headers["Content-Encoding"] = self.encoding
+        if more_body or start.get("trailers", False):
+            if "content-length" in headers:
+                del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(message["body"]))
+        if "etag" in headers:
+            headers["ETag"] = tag_etag(headers["etag"], self.encoding)
+        await self._send(start)
+        await self._send(message)
+
+    async def _flush_start(self) -> None:
+        if self._start is not None:
+            assert self._send is not None
+            start, self._start = self._start, None
+            self._passthrough = True
+            await self._send(start)
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if self._codec is None:
+            self._codec = self._factory(self._level)
+        if len(body) >= THREAD_MIN_BYTES:
+            return await anyio.to_thread.run_sync(self._codec.chunk, body, not more_body)
+        return self._codec.chunk(body, not more_body)
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding the client accepts."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Sequence[str] = ("br", "zstd", "gzip"),
+        levels: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = tuple(e.strip().lower() for e in encodings)
+        self.levels = levels or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = None
+        if scope["type"] == "http" and self.minimum_size >= 0:
+            accept_encoding = Headers(scope=scope).get("accept-encoding")
+            encoding = negotiate_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        revalidating = False
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match:
+            if_none_match, revalidating = untag_if_none_match(if_none_match, encoding)
+        if revalidating:
+            headers = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+            headers.append((b"if-none-match", if_none_match.encode("latin-1")))
+            scope = {**scope, "headers": headers}
+        responder = _CodecResponder(
+            self.app, self.minimum_size, encoding, self.levels.get(encoding), revalidating
+        )
+        await responder(scope, receive, send)
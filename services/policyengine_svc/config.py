@@ -4,5 +4,88 @@ class Settings(BaseSettings):
     policyengine_url: str = "http://127.0.0.1:8080"
     cors_origins: list[str] = ["*"]
 
+    # POST /v1/evaluate:batch
+    batch_max_concurrency: int = 8
+    batch_max_items: int = 1000
+
+    # POST /v1/evaluate:stream
+    stream_max_rule_workers: int = 8
+
+    # Evaluation execution backend: "thread" or "process"
+    execution_backend: str = "thread"
+    process_workers: int = 0  # 0 = os.cpu_count()
+    process_start_method: str = ""  # "" = forkserver (spawn on Windows); "fork" is thread-unsafe
+
+    # Memory-mapped registry snapshot shared by all workers ("" disables)
+    registry_snapshot_path: str = ""
+
+    # Prebuilt OpenAPI document served from /openapi.json ("" = generate lazily)
+    openapi_artifact_path: str = ""
+
+    # Poll profiles/ and rules/ and hot-swap the compiled registry on change
+    hot_reload_enabled: bool = False
+    hot_reload_interval_seconds: float = 2.0
+
+    # Evaluation result cache (0 disables)
+    result_cache_ttl_seconds: float = 300.0
+    result_cache_max_entries: int = 1024
+
+    # Coalesce identical in-flight evaluations
+    single_flight_enabled: bool = True
+
+    # Admission control for evaluation routes
+    # (0 = engine.max_concurrent_runs from agents/configs/settings.yaml)
+    admission_max_concurrent: int = 0
+    admission_max_queue: int = 50
+    admission_queue_timeout_seconds: float = 10.0
+
+    # Per-caller token-bucket rate limiting (0 disables); cost in tokens per
+    # evaluation by profile cost class
+    rate_limit_rate: float = 0.0  # tokens per second
+    rate_limit_burst: float = 20.0
+    rate_limit_class_costs: dict[str, float] = {"default": 1.0}
+    rate_limit_profile_classes: dict[str, str] = {}  # profile id -> cost class
+    rate_limit_max_callers: int = 10_000
+    # Proxies that append to X-Forwarded-For (the client IP is the hop the
+    # outermost one appended); 0 = use the peer address
+    rate_limit_trusted_proxies: int = 1
+    # Identify callers by bearer JWT sub only if a gateway validated it
+    rate_limit_trust_bearer_subject: bool = False
+
+    # Longest a coalesced or duplicate request waits for the evaluation it
+    # attached to (0 = no limit)
+    evaluation_timeout_seconds: float = 60.0
+
+    # Idempotent /v1/evaluate retries (Idempotency-Key / request_id);
+    # 0 disables
+    idempotency_ttl_seconds: float = 86_400.0
+    idempotency_max_entries: int = 10_000
+
+    # Serialize responses with FastJSONResponse instead of FastAPI's encoder
+    fast_json_responses: bool = True
+
+    # Server-Timing phase breakdown for /v1/evaluate
+    server_timing_enabled: bool = True
+    timing_in_metadata: bool = False  # also return timings in EvalResponse.metadata
+    debug_rule_timing: bool = False  # include per-rule timings (implies timing_in_metadata)
+
+    # Response compression negotiated via Accept-Encoding (-1 disables)
+    compression_min_bytes: int = 1024
+    compression_encodings: list[str] = ["br", "zstd", "gzip"]
+    compression_levels: dict[str, int] = {}
+
+    # Async evaluation jobs (POST /v1/evaluations)
+    jobs_db_path: str = ""  # "" = <tempdir>/4thgrc-jobs.sqlite3 (lost with the container)
+    jobs_db_journal_mode: str = "WAL"  # DELETE on network shares (SMB/NFS have no shared memory)
+    job_workers: int = 2
+    jobs_retention_seconds: float = 7 * 24 * 3600
+    jobs_heartbeat_seconds: float = 10.0  # running jobs silent for 3 intervals are requeued
+
+    # Enables admin-only /debug routes (X-Admin-Token); empty = disabled
+    admin_token: str = ""
+
+    # Profile refs to prewarm at startup (empty = every profile)
+    prewarm_profiles: list[str] = []
+
 def get_settings() -> Settings:
     return Settings()
@@ -0,0 +1,183 @@
+"""Admin-only on-demand profiling: ``POST /debug/profile-evaluate``.
+
+Runs the supplied ``EvalRequest`` in-process (no result cache, no process
+pool) under a profiler and returns:
+
+* ``collapsed``: collapsed stacks, one ``frame;frame;frame value`` line per
+  distinct stack, ready for ``flamegraph.pl`` / speedscope
+* ``top``: the top-N functions by self time, with inclusive time
+
+Two modes:
+
+* ``sample`` (default) -- a sampler thread snapshots the evaluating
+  thread's stack every ``interval_ms``; values are sample counts. Low
+  overhead, suitable for production.
+* ``deterministic`` -- ``sys.setprofile`` traces every Python and C call;
+  values are microseconds of self time. Exact, but slows the evaluation.
+
+The route is disabled (404) unless ``ADMIN_TOKEN`` is set, and requires a
+matching ``X-Admin-Token`` header.
+"""
+
+from __future__ import annotations
+
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, Query
+
+from policyengine.models import EvalRequest
+
+from .config import get_settings
+from .evaluation import evaluate_request
+
+router = APIRouter()
+
+Stack = Tuple[str, ...]
+
+
+def require_admin(token: Optional[str]) -> None:
+    """404 when admin routes are disabled, 403 on a missing/wrong token."""
+    expected = get_settings().admin_token
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+def _code_name(code: Any, module: Optional[str]) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module or '?'}:{name}"
+
+
+def _frame_name(frame: Any) -> str:
+    return _code_name(frame.f_code, frame.f_globals.get("__name__"))
+
+
+def _c_name(fn: Any) -> str:
+    module = getattr(fn, "__module__", None) or type(getattr(fn, "__self__", None)).__name__
+    return f"{module}:{getattr(fn, '__qualname__', repr(fn))}"
+
+
+class _Tracer:
+    """sys.setprofile hook accumulating self time per full call stack."""
+
+    def __init__(self) -> None:
+        self.stack: List[List[Any]] = []  # [name, start, child_time]
+        self.totals: Counter = Counter()
+
+    def __call__(self, frame: Any, event: str, arg: Any) -> None:
+        now = time.perf_counter()
+        if event == "call":
+            self.stack.append([_frame_name(frame), now, 0.0])
+        elif event == "c_call":
+            self.stack.append([_c_name(arg), now, 0.0])
+        elif self.stack and event in ("return", "c_return", "c_exception"):
+            name, start, child = self.stack.pop()
+            elapsed = now - start
+            path = tuple(entry[0] for entry in self.stack) + (name,)
+            self.totals[path] += (elapsed - child) * 1e6
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+
+def profile_deterministic(fn: Any) -> Tuple[Any, Counter]:
+    tracer = _Tracer()
+    sys.setprofile(tracer)
+    try:
+        result = fn()
+    finally:
+        sys.setprofile(None)
+    return result, tracer.totals
+
+
+def profile_sampling(fn: Any, interval: float, root_code: Any) -> Tuple[Any, Counter]:
+    """Sample the calling thread's stack every ``interval`` seconds while ``fn`` runs."""
+    target = threading.get_ident()
+    samples: Counter = Counter()
+    done = threading.Event()
+
+    def sampler() -> None:
+        while not done.wait(interval):
+            frame = sys._current_frames().get(target)
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                if frame.f_code is root_code:
+                    break
+                frame = frame.f_back
+            else:
+                continue  # not inside the evaluation yet / any more
+            samples[tuple(reversed(stack))] += 1
+
+    thread = threading.Thread(target=sampler, name="profile-sampler", daemon=True)
+    thread.start()
+    try:
+        result = fn()
+    finally:
+        done.set()
+        thread.join()
+    return result, samples
+
+
+def collapse(stacks: Counter) -> str:
+    """Collapsed-stack text (Brendan Gregg's format), heaviest stacks first."""
+    lines = [
+        f"{';'.join(stack)} {round(value)}"
+        for stack, value in stacks.most_common()
+        if round(value) > 0
+    ]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def top_functions(stacks: Counter, n: int) -> List[Dict[str, Any]]:
+    """Top ``n`` functions by self value, with their inclusive value."""
+    self_values: Counter = Counter()
+    total_values: Counter = Counter()
+    for stack, value in stacks.items():
+        self_values[stack[-1]] += value
+        for name in set(stack):
+            total_values[name] += value
+    return [
+        {"function": name, "self": round(value, 3), "total": round(total_values[name], 3)}
+        for name, value in self_values.most_common(n)
+    ]
+
+
+@router.post("/debug/profile-evaluate", include_in_schema=False)
+def profile_evaluate(
+    request: EvalRequest,
+    mode: str = Query(default="sample", pattern="^(sample|deterministic)$"),
+    interval_ms: float = Query(default=1.0, gt=0, le=100),
+    top: int = Query(default=20, ge=1, le=200),
+    x_admin_token: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """Profile one evaluation and return collapsed stacks plus top functions."""
+    require_admin(x_admin_token)
+
+    def run() -> Any:
+        return evaluate_request(
+            request.profile_ref, request.context, request.evidence, request.controls
+        )
+
+    start = time.perf_counter()
+    if mode == "deterministic":
+        response, stacks = profile_deterministic(run)
+        unit = "us"
+    else:
+        response, stacks = profile_sampling(run, interval_ms / 1000, evaluate_request.__code__)
+        unit = "samples"
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "mode": mode,
+        "unit": unit,
+        "duration_ms": round(elapsed_ms, 3),
+        "summary": response.summary.model_dump(),
+        "top": top_functions(stacks, top),
+        "collapsed": collapse(stacks),
+    }
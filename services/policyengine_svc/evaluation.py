@@ -0,0 +1,274 @@
+"""Shared evaluation path for the PolicyEngine service routes.
+
+Every route that evaluates a profile (single, batch, ...) goes through
+:func:`run_evaluation`, so error mapping stays identical across them:
+
+* ``ProfileNotFoundError``   -> ``404``
+* ``ProfileValidationError`` -> ``400``
+* ``UnknownControlError``    -> ``400``
+* ``EvidenceResolutionError`` -> ``400``
+* anything else              -> ``500``
+
+Evaluations run on the configured execution backend
+(``EXECUTION_BACKEND``):
+
+* ``thread``  (default) evaluates in the calling thread, i.e. Starlette's
+  threadpool. Cheap, but CPU-bound rule ops contend for the GIL.
+* ``process`` dispatches to a pre-started process pool whose workers have
+  the compiled profile registry preloaded. Workers are started with
+  ``forkserver`` (``spawn`` where unavailable), never forked from the
+  service process itself: it already runs threads (hot reload, job
+  heartbeats, the threadpool) and a fork would copy their held locks. Only the request fields go in
+  and only the serialized EvalResponse JSON (or a status/detail pair)
+  comes back, so no pydantic models or exceptions cross the process
+  boundary.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException
+
+from policyengine import evaluate, timing
+from policyengine.exceptions import (
+    EvidenceResolutionError,
+    ProfileNotFoundError,
+    ProfileValidationError,
+    UnknownControlError,
+)
+from policyengine.models import EvalRequest, EvalResponse
+
+from .config import Settings, get_settings
+from .metrics import EVALUATION_DURATION
+from .result_cache import get_result_cache, request_key
+from .single_flight import get_single_flight
+
+# (status_code, EvalResponse JSON bytes, (phases, rules)) on success,
+# (status_code, detail, None) on error.
+WorkerResult = Tuple[
+    int, Union[bytes, Any], Optional[Tuple[Dict[str, float], List[Tuple[str, float]]]]
+]
+
+DEFAULT_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def evaluate_request(
+    profile_ref: str,
+    context: Dict[str, Any],
+    evidence: Dict[str, Any],
+    controls: Optional[List[str]] = None,
+) -> EvalResponse:
+    """Evaluate in the current process and return a validated :class:`EvalResponse`.
+
+    Raises:
+        HTTPException: With the status code mapped from the engine error.
+    """
+    try:
+        result = evaluate(
+            profile_ref=profile_ref,
+            context=context,
+            evidence=evidence,
+            controls=controls,
+        )
+    except ProfileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except (ProfileValidationError, UnknownControlError, EvidenceResolutionError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # noqa: BLE001
+        # You can log the exception here with your logging helper
+        raise HTTPException(status_code=500, detail="Internal evaluation error") from exc
+
+    # If `evaluate` already returns an EvalResponse-compatible dict/model,
+    # we can just return it directly.
+    if isinstance(result, EvalResponse):
+        return result
+
+    # Otherwise assume it's a dict compatible with EvalResponse
+    return EvalResponse.model_validate(result)
+
+
+def _init_worker(snapshot_path: Optional[str] = None) -> None:
+    """Process pool initializer: attach the shared registry snapshot or,
+    without one, warm the compiled profile registry from YAML."""
+    from policyengine import registry, snapshot
+
+    if snapshot_path:
+        if snapshot.active() is None:
+            snapshot.attach(snapshot_path)
+        # Profiles are decoded from the shared map on first use.
+        return
+    try:
+        registry.preload()
+    except Exception:  # noqa: BLE001
+        # Warming is an optimization; a failing initializer would break the pool.
+        pass
+
+
+def _evaluate_in_worker(
+    profile_ref: str,
+    context: Dict[str, Any],
+    evidence: Dict[str, Any],
+    controls: Optional[List[str]] = None,
+    per_rule: bool = False,
+) -> WorkerResult:
+    with timing.record(per_rule=per_rule) as timer:
+        try:
+            response = evaluate_request(profile_ref, context, evidence, controls)
+        except HTTPException as exc:
+            return exc.status_code, exc.detail, None
+    return 200, response.model_dump_json().encode("utf-8"), (timer.phases, timer.rules)
+
+
+class ThreadBackend:
+    """Evaluate in the calling thread."""
+
+    name = "thread"
+
+    def run(self, request: EvalRequest) -> EvalResponse:
+        return evaluate_request(
+            request.profile_ref, request.context, request.evidence, request.controls
+        )
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ProcessPoolBackend:
+    """Evaluate on a pre-started pool of worker processes.
+
+    ``start_method`` defaults to :data:`DEFAULT_START_METHOD`; pass ``fork``
+    only from a process that has not started any threads yet.
+    """
+
+    name = "process"
+
+    def __init__(
+        self,
+        workers: int = 0,
+        start_method: Optional[str] = None,
+        snapshot_path: Optional[str] = None,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.start_method = start_method or DEFAULT_START_METHOD
+        ctx = multiprocessing.get_context(self.start_method)
+        self._pool: Executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(snapshot_path,),
+        )
+        # Start every worker now so the first requests don't pay process startup.
+        for future in [self._pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def run(self, request: EvalRequest) -> EvalResponse:
+        timer = timing.current()
+        status, body, timings = self._pool.submit(
+            _evaluate_in_worker,
+            request.profile_ref,
+            request.context,
+            request.evidence,
+            request.controls,
+            timer.per_rule,
+        ).result()
+        if status != 200:
+            raise HTTPException(status_code=status, detail=body)
+        if timings is not None:
+            timer.merge(*timings)
+        return EvalResponse.model_validate_json(body)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+ExecutionBackend = Union[ThreadBackend, ProcessPoolBackend]
+
+_backend: Optional[ExecutionBackend] = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(settings: Settings) -> ExecutionBackend:
+    kind = settings.execution_backend.lower()
+    if kind == "thread":
+        return ThreadBackend()
+    if kind == "process":
+        return ProcessPoolBackend(
+            settings.process_workers,
+            settings.process_start_method or None,
+            settings.registry_snapshot_path or None,
+        )
+    raise ValueError(f"Unknown execution backend: {settings.execution_backend!r}")
+
+
+def get_backend() -> ExecutionBackend:
+    """Return the service execution backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(get_settings())
+    return _backend
+
+
+def shutdown_backend() -> None:
+    global _backend
+    with _backend_lock:
+        backend, _backend = _backend, None
+    if backend is not None:
+        backend.shutdown()
+
+
+def run_evaluation(request: EvalRequest, key: Optional[str] = None) -> EvalResponse:
+    """Evaluate ``request`` on the configured execution backend.
+
+    Successful results are served from / stored in the result cache when
+    it is enabled, and identical concurrent requests are coalesced onto a
+    single evaluation when single-flight is enabled (a coalesced request
+    waits at most ``EVALUATION_TIMEOUT_SECONDS``, then gets ``504``).
+    ``key`` is the precomputed :func:`request_key`, if any.
+
+    Raises:
+        HTTPException: With the status code mapped from the engine error.
+    """
+    start = time.perf_counter()
+    response = _run_evaluation(request, key)
+    EVALUATION_DURATION.observe(time.perf_counter() - start, request.profile_ref)
+    return response
+
+
+def _run_evaluation(request: EvalRequest, key: Optional[str]) -> EvalResponse:
+    cache = get_result_cache()
+    coalesce = get_settings().single_flight_enabled
+    if cache is None and not coalesce:
+        return get_backend().run(request)
+
+    key = key or request_key(request)
+    if cache is not None:
+        with timing.current().phase("cache"):
+            cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    def compute() -> EvalResponse:
+        response = get_backend().run(request)
+        if cache is not None:
+            cache.put(key, response)
+        return response
+
+    if not coalesce:
+        return compute()
+    try:
+        timeout = get_settings().evaluation_timeout_seconds or None
+        return get_single_flight().do(key, compute, timeout=timeout)
+    except TimeoutError as exc:
+        raise HTTPException(
+            status_code=504, detail="Timed out waiting for an identical in-flight evaluation"
+        ) from exc
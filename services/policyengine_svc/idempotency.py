@@ -0,0 +1,258 @@
+"""Idempotent ``/v1/evaluate`` retries via ``Idempotency-Key`` / ``request_id``.
+
+``PolicyEnginePlugin`` retries timeouts with backoff and both agent
+clients send a ``request_id``; without idempotency every retry recomputes
+the evaluation. The service now keys each evaluation by the
+``Idempotency-Key`` header, or else the body's ``request_id``, scoped to
+the caller (see :func:`rate_limit.caller_id`):
+
+* a duplicate of a finished evaluation gets the stored result back
+  (``Idempotent-Replayed: true``);
+* a duplicate of one still running waits for it and shares its result
+  (or its error);
+* a failed evaluation is not stored, so a retry recomputes it.
+
+A duplicate is only one when the request content (profile, context,
+evidence, controls) is the same; evidence specs count by what they
+resolve to, as in the result cache key
+(:func:`result_cache.evidence_digests`). Reusing an ``Idempotency-Key``
+for different content is a client bug and gets ``422``. A ``request_id``
+is often reused per system (``sk-<system_id>``), so different content
+under the same ``request_id`` simply replaces the stored entry.
+
+A stored result is also only replayed while the profile file and the rule
+files it references are unchanged; after an edit the duplicate is
+evaluated again. The store is cleared when hot reload swaps the registry.
+A duplicate waits at most ``EVALUATION_TIMEOUT_SECONDS`` for the original
+and then gets ``504``.
+
+Results are kept for ``IDEMPOTENCY_TTL_SECONDS`` (``0`` disables), at most
+``IDEMPOTENCY_MAX_ENTRIES`` of them (least recently stored go first).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from policyengine.models import EvalRequest, EvalResponse
+from policyengine.profiles import profile_digest, profile_rule_digests
+
+from .config import get_settings
+from .rate_limit import caller_id
+from .result_cache import canonical_digest, evidence_digests
+
+HEADER = "Idempotency-Key"
+
+
+class IdempotencyConflict(Exception):
+    """An Idempotency-Key was reused for a different request."""
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "version", "expires_at", "done", "response", "error")
+
+    def __init__(self, fingerprint: str, version: Optional[str]) -> None:
+        self.fingerprint = fingerprint
+        self.version = version
+        self.expires_at = float("inf")  # pending entries never expire
+        self.done = threading.Event()
+        self.response: Optional[EvalResponse] = None
+        self.error: Optional[BaseException] = None
+
+
+def request_fingerprint(request: EvalRequest) -> str:
+    """Digest of the request content an idempotency key must match."""
+    return canonical_digest(
+        {
+            "profile_ref": request.profile_ref,
+            "context": request.context,
+            "evidence": evidence_digests(request.evidence),
+            "controls": sorted(set(request.controls)) if request.controls is not None else None,
+        }
+    )
+
+
+def registry_version(request: EvalRequest) -> str:
+    """Digest of the profile and rule files a stored result was computed from."""
+    return canonical_digest(
+        {
+            "profile": profile_digest(request.profile_ref),
+            "rules": profile_rule_digests(request.profile_ref),
+        }
+    )
+
+
+class IdempotencyStore:
+    """Bounded TTL store of evaluation outcomes keyed by idempotency key."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 86_400.0,
+        clock: Callable[[], float] = time.monotonic,
+        wait_timeout: Optional[float] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.wait_timeout = wait_timeout
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._replayed = 0
+        self._attached = 0
+        self._conflicts = 0
+        self._timeouts = 0
+
+    def run(
+        self,
+        key: str,
+        fingerprint: str,
+        fn: Callable[[], EvalResponse],
+        strict: bool = True,
+        version: Optional[str] = None,
+    ) -> Tuple[EvalResponse, bool]:
+        """Return ``(response, replayed)``, running ``fn`` only for a new key.
+
+        An entry computed under a different ``version`` (registry digest)
+        is stale and is recomputed.
+
+        Raises:
+            IdempotencyConflict: ``strict`` and ``key`` was used for a
+                different fingerprint.
+            TimeoutError: The original evaluation did not finish within
+                ``wait_timeout``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is not None and entry.fingerprint != fingerprint:
+                if strict:
+                    self._conflicts += 1
+                    raise IdempotencyConflict(key)
+                entry = None
+            if entry is not None and entry.version != version:
+                entry = None
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = _Entry(fingerprint, version)
+                self._entries.move_to_end(key)
+                self._executed += 1
+            elif entry.done.is_set():
+                self._replayed += 1
+            else:
+                self._attached += 1
+
+        if not owner:
+            if not entry.done.wait(self.wait_timeout):
+                with self._lock:
+                    self._timeouts += 1
+                raise TimeoutError(key)
+            if entry.response is None:
+                assert entry.error is not None
+                raise entry.error
+            return entry.response, True
+
+        try:
+            response = fn()
+        except BaseException as exc:
+            entry.error = exc
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            entry.done.set()
+            raise
+        entry.response = response
+        with self._lock:
+            entry.expires_at = self._clock() + self.ttl_seconds
+            self._evict()
+        entry.done.set()
+        return response, False
+
+    def _evict(self) -> None:
+        # Oldest completed entries go first; in-flight ones are never evicted.
+        excess = len(self._entries) - self.max_entries
+        for key, entry in list(self._entries.items()):
+            if excess <= 0:
+                break
+            if entry.response is not None:
+                del self._entries[key]
+                excess -= 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "executed": self._executed,
+                "replayed": self._replayed,
+                "attached": self._attached,
+                "conflicts": self._conflicts,
+                "timeouts": self._timeouts,
+            }
+
+
+_store: Optional[IdempotencyStore] = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store() -> Optional[IdempotencyStore]:
+    """Return the idempotency store, or None when disabled (TTL or size of 0)."""
+    global _store
+    if _store is None:
+        settings = get_settings()
+        if settings.idempotency_ttl_seconds <= 0 or settings.idempotency_max_entries <= 0:
+            return None
+        with _store_lock:
+            if _store is None:
+                _store = IdempotencyStore(
+                    settings.idempotency_max_entries,
+                    settings.idempotency_ttl_seconds,
+                    wait_timeout=settings.evaluation_timeout_seconds or None,
+                )
+    return _store
+
+
+def run_idempotent(
+    http_request: Request,
+    request: EvalRequest,
+    fn: Callable[[], EvalResponse],
+    headers: Dict[str, str],
+) -> EvalResponse:
+    """Run ``fn`` under the request's idempotency key, if it has one."""
+    store = get_idempotency_store()
+    header_key = http_request.headers.get(HEADER)
+    key = header_key or request.request_id
+    if store is None or not key:
+        return fn()
+    try:
+        response, replayed = store.run(
+            f"{caller_id(http_request)}|{key}",
+            request_fingerprint(request),
+            fn,
+            strict=bool(header_key),
+            version=registry_version(request),
+        )
+    except IdempotencyConflict as exc:
+        raise HTTPException(
+            status_code=422, detail=f"{HEADER} was already used for a different request"
+        ) from exc
+    except TimeoutError as exc:
+        raise HTTPException(
+            status_code=504, detail="Timed out waiting for the original request to finish"
+        ) from exc
+    if replayed:
+        headers["Idempotent-Replayed"] = "true"
+    return response
@@ -0,0 +1,411 @@
+"""Asynchronous evaluation jobs: ``POST /v1/evaluations`` and friends.
+
+Evaluations with large evidence sets outlive the callers' HTTP timeouts
+(45 s in ``PolicyEngineTool.run``, 30 s in ``policy_eval_webhook``). A job
+is accepted immediately (``202`` + job id), persisted in a local SQLite
+database and run by a background worker pool through the same
+:func:`run_evaluation` path as ``/v1/evaluate``.
+
+Job states: ``queued`` -> ``running`` -> ``succeeded`` | ``failed`` |
+``cancelled``. Several processes may share the database. A running job
+records its owner (host, pid and a per-process id), and the owner's
+runner refreshes the job's heartbeat every ``JOBS_HEARTBEAT_SECONDS``. A
+running job whose heartbeat is three intervals old lost its owner and is
+queued again -- on startup and periodically by every live runner -- so
+jobs of live processes are never requeued. Jobs only survive a container
+restart when ``JOBS_DB_PATH`` is on a persistent volume; the default
+file under the temp directory is lost with the container.
+
+SQLite locking is only reliable on a local filesystem, so the processes
+sharing a database must run on one host (a single replica). On a network
+share (Azure Files / SMB, NFS) set ``JOBS_DB_JOURNAL_MODE=DELETE``: WAL
+needs shared memory that such shares do not provide, and it is the
+default only for local disks. Cancelling a queued
+job takes effect immediately; a running job is marked and its result is
+discarded when the evaluation returns (evaluations are not interruptible).
+Each running job takes an admission slot like any other evaluation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from policyengine.models import EvalRequest, EvalResponse
+
+from .admission import get_admission_controller
+from .config import get_settings
+from .evaluation import run_evaluation
+from .rate_limit import enforce_rate_limit
+
+router = APIRouter()
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    status_code INTEGER,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+# Columns added after the first release; added to older databases on open.
+_MIGRATIONS = {"owner": "TEXT", "heartbeat_at": "REAL"}
+
+# WAL for local disks; DELETE (rollback journal) for network shares.
+JOURNAL_MODES = ("WAL", "DELETE", "TRUNCATE", "PERSIST")
+
+# A running job is orphaned once its heartbeat is this many intervals old.
+_STALE_HEARTBEATS = 3
+
+
+def process_owner_id() -> str:
+    """Identify this process: host, pid and a random per-start id (pids are reused)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def default_db_path() -> Path:
+    return Path(tempfile.gettempdir()) / "4thgrc-jobs.sqlite3"
+
+
+class JobStore:
+    """SQLite-backed job table. Safe to use from several threads."""
+
+    def __init__(
+        self, path: Path | str, owner: Optional[str] = None, journal_mode: str = "WAL"
+    ) -> None:
+        if journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"Unsupported SQLite journal mode: {journal_mode!r}")
+        self.path = Path(path)
+        self.owner = owner or process_owner_id()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(f"PRAGMA journal_mode={journal_mode.upper()}")
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for name, kind in _MIGRATIONS.items():
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(sql, params).rowcount
+
+    def create(self, request: EvalRequest) -> str:
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, status, request, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, QUEUED, request.model_dump_json(), time.time()),
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def claim(self, job_id: str) -> Optional[EvalRequest]:
+        """Move a queued job to running; None if it is no longer queued."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, owner = ?, heartbeat_at = ? "
+                "WHERE id = ? AND status = ? AND cancel_requested = 0",
+                (RUNNING, now, self.owner, now, job_id, QUEUED),
+            ).rowcount
+            if not updated:
+                return None
+            row = conn.execute("SELECT request FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return EvalRequest.model_validate_json(row["request"])
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        *,
+        result: Optional[str] = None,
+        error: Any = None,
+        status_code: Optional[int] = None,
+    ) -> None:
+        # A cancel requested while running wins over the evaluation outcome.
+        # Only the owner finishes a job; one that was requeued as orphaned
+        # belongs to whoever claimed it since.
+        self._execute(
+            "UPDATE jobs SET status = CASE WHEN cancel_requested = 1 THEN ? ELSE ? END, "
+            "result = CASE WHEN cancel_requested = 1 THEN NULL ELSE ? END, "
+            "error = ?, status_code = ?, finished_at = ? WHERE id = ? AND status = ? AND owner = ?",
+            (
+                CANCELLED,
+                status,
+                result,
+                json.dumps(error) if error is not None else None,
+                status_code,
+                time.time(),
+                job_id,
+                RUNNING,
+                self.owner,
+            ),
+        )
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancel a job; returns its resulting status, or None if unknown."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, now, job_id, QUEUED),
+            )
+            conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?",
+                (job_id, RUNNING),
+            )
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row["status"] if row is not None else None
+
+    def heartbeat(self) -> int:
+        """Mark this process's running jobs as still owned; returns how many."""
+        return self._execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?",
+            (time.time(), self.owner, RUNNING),
+        )
+
+    def requeue_orphaned(self, stale_after_seconds: float) -> List[str]:
+        """Queue again running jobs whose owner stopped heartbeating.
+
+        Returns the ids of the requeued jobs. Orphaned jobs with a pending
+        cancel are cancelled instead.
+        """
+        now = time.time()
+        stale = "status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)"
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                f"SELECT id FROM jobs WHERE {stale} AND cancel_requested = 0 ORDER BY created_at",
+                (RUNNING, now - stale_after_seconds),
+            ).fetchall()
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL "
+                f"WHERE {stale} AND cancel_requested = 0",
+                (QUEUED, RUNNING, now - stale_after_seconds),
+            )
+            conn.execute(
+                f"UPDATE jobs SET status = ?, finished_at = ? "
+                f"WHERE {stale} AND cancel_requested = 1",
+                (CANCELLED, now, RUNNING, now - stale_after_seconds),
+            )
+            conn.execute("COMMIT")
+        return [row["id"] for row in rows]
+
+    def requeue_unfinished(self, stale_after_seconds: float) -> Iterator[str]:
+        """Requeue orphaned jobs (see :meth:`requeue_orphaned`); yields every pending job id."""
+        self.requeue_orphaned(stale_after_seconds)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return iter([row["id"] for row in rows])
+
+    def purge_finished(self, older_than_seconds: float) -> int:
+        return self._execute(
+            "DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+            (*FINISHED, time.time() - older_than_seconds),
+        )
+
+
+class JobRunner:
+    """Runs queued jobs from a :class:`JobStore` on a thread pool."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 2,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        heartbeat_seconds: float = 10.0,
+    ) -> None:
+        self.store = store
+        # The service event loop, which owns the admission controller.
+        self._loop = loop
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="eval-job")
+        self.heartbeat_seconds = heartbeat_seconds
+        self._stopped = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    @property
+    def stale_after_seconds(self) -> float:
+        return self.heartbeat_seconds * _STALE_HEARTBEATS
+
+    def submit(self, job_id: str) -> None:
+        self._pool.submit(self._run, job_id)
+
+    def resume(self) -> int:
+        count = 0
+        for job_id in self.store.requeue_unfinished(self.stale_after_seconds):
+            self.submit(job_id)
+            count += 1
+        return count
+
+    def start_heartbeat(self) -> None:
+        """Keep this process's running jobs owned and adopt jobs orphaned by others."""
+        self._heartbeat = threading.Thread(
+            target=self._beat, name="eval-job-heartbeat", daemon=True
+        )
+        self._heartbeat.start()
+
+    def _beat(self) -> None:
+        while not self._stopped.wait(self.heartbeat_seconds):
+            try:
+                self.store.heartbeat()
+                for job_id in self.store.requeue_orphaned(self.stale_after_seconds):
+                    self.submit(job_id)
+            except (sqlite3.Error, RuntimeError):
+                continue  # database busy, or the pool is shutting down
+
+    def _run(self, job_id: str) -> None:
+        request = self.store.claim(job_id)
+        if request is None:
+            return
+        try:
+            response = self._evaluate(request)
+        except HTTPException as exc:
+            self.store.finish(job_id, FAILED, error=exc.detail, status_code=exc.status_code)
+        except Exception:  # noqa: BLE001
+            self.store.finish(job_id, FAILED, error="Internal evaluation error", status_code=500)
+        else:
+            self.store.finish(job_id, SUCCEEDED, result=response.model_dump_json(), status_code=200)
+
+    def _evaluate(self, request: EvalRequest) -> EvalResponse:
+        controller = get_admission_controller() if self._loop is not None else None
+        if controller is None:
+            return run_evaluation(request)
+        controller.acquire_from_thread(self._loop)
+        start = time.perf_counter()
+        try:
+            return run_evaluation(request)
+        finally:
+            controller.release_from_thread(self._loop, time.perf_counter() - start)
+
+    def shutdown(self) -> None:
+        # Queued jobs stay "queued" in the store and are resumed on next start.
+        self._stopped.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Return the job runner, opening the store and resuming pending jobs on first use.
+
+    The first call must run on the service event loop (the lifespan makes
+    it) for jobs to take admission slots.
+    """
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                settings = get_settings()
+                store = JobStore(
+                    settings.jobs_db_path or default_db_path(),
+                    journal_mode=settings.jobs_db_journal_mode,
+                )
+                store.purge_finished(settings.jobs_retention_seconds)
+                try:
+                    loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+                except RuntimeError:
+                    loop = None  # no event loop (scripts, tests): jobs bypass admission
+                runner = JobRunner(
+                    store, settings.job_workers, loop, settings.jobs_heartbeat_seconds
+                )
+                runner.resume()
+                runner.start_heartbeat()
+                _runner = runner
+    return _runner
+
+
+def shutdown_job_runner() -> None:
+    global _runner
+    with _runner_lock:
+        runner, _runner = _runner, None
+    if runner is not None:
+        runner.shutdown()
+
+
+def _job_document(job: Dict[str, Any]) -> Dict[str, Any]:
+    doc: Dict[str, Any] = {
+        "id": job["id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }
+    if job["status"] == SUCCEEDED and job["result"]:
+        doc["result"] = json.loads(job["result"])
+    if job["error"]:
+        doc["error"] = {"status": job["status_code"], "detail": json.loads(job["error"])}
+    return doc
+
+
+@router.post("/v1/evaluations", tags=["evaluation"], status_code=202)
+def create_evaluation_job(
+    request: EvalRequest, http_request: Request, response: Response
+) -> Dict[str, Any]:
+    """Queue an evaluation and return its job id immediately."""
+    enforce_rate_limit(http_request, [request.profile_ref])
+    runner = get_job_runner()
+    job_id = runner.store.create(request)
+    runner.submit(job_id)
+    response.headers["Location"] = f"/v1/evaluations/{job_id}"
+    return {"id": job_id, "status": QUEUED}
+
+
+@router.get("/v1/evaluations/{job_id}", tags=["evaluation"])
+def get_evaluation_job(job_id: str) -> Dict[str, Any]:
+    """Job status, plus the EvalResponse once it has succeeded."""
+    job = get_job_runner().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Evaluation job not found: {job_id}")
+    return _job_document(job)
+
+
+@router.delete("/v1/evaluations/{job_id}", tags=["evaluation"])
+def cancel_evaluation_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a queued or running job."""
+    status = get_job_runner().store.cancel(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Evaluation job not found: {job_id}")
+    return {"id": job_id, "status": status}
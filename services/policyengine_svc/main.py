@@ -2,22 +2,72 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from policyengine import evaluate
+from policyengine import snapshot, timing
 from policyengine.models import EvalRequest, EvalResponse
-from policyengine.exceptions import ProfileNotFoundError, ProfileValidationError
+from policyengine.ops import set_op_observer
+
+from .admission import AdmissionMiddleware, get_admission_controller
+from .batch import router as batch_router
+from .catalog import get_catalog
+from .catalog import router as catalog_router
+from .compression import CompressionMiddleware
+from .config import get_settings
+from .debug import router as debug_router
+from .evaluation import get_backend, run_evaluation, shutdown_backend
+from .idempotency import get_idempotency_store, run_idempotent
+from .jobs import get_job_runner
+from .jobs import router as jobs_router
+from .jobs import shutdown_job_runner
+from .metrics import MetricsMiddleware, observe_rule
+from .metrics import router as metrics_router
+from .openapi_overrides import apply_openapi_overrides, serve_openapi
+from .rate_limit import enforce_rate_limit
+from .rate_limit import router as rate_limit_router
+from .readiness import router as readiness_router
+from .readiness import start_prewarm
+from .reload import router as reload_router
+from .reload import start_watcher, stop_watcher
+from .responses import FastJSONResponse
+from .result_cache import etag_for, etag_matches, get_result_cache, request_key
+from .single_flight import get_single_flight
+from .streaming import router as streaming_router
 
 SERVICE_NAME = "4th.GRC PolicyEngine Service"
 SERVICE_VERSION = "0.1.0"
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Attach the registry snapshot, start the registry watcher (hot reload),
+    start the execution backend (pre-forks the process pool), build the
+    profile catalog, prewarm the profile registry in the background, and
+    resume pending evaluation jobs; stop them again on shutdown."""
+    snapshot_path = get_settings().registry_snapshot_path
+    if snapshot_path:
+        snapshot.ensure_snapshot(snapshot_path)
+    start_watcher()
+    get_backend()
+    get_catalog()
+    start_prewarm()
+    get_job_runner()
+    yield
+    shutdown_job_runner()
+    shutdown_backend()
+    stop_watcher()
+
+
 app = FastAPI(
     title=SERVICE_NAME,
     version=SERVICE_VERSION,
     description="FastAPI microservice exposing the PolicyEngine evaluation API.",
+    lifespan=lifespan,
 )
 
 # CORS – you can tighten this later
@@ -28,6 +78,18 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Batch items and jobs take their admission slots individually (batch.py, jobs.py).
+app.add_middleware(AdmissionMiddleware, paths=("/v1/evaluate", "/v1/evaluate:stream"))
+_settings = get_settings()
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=_settings.compression_min_bytes,
+    encodings=_settings.compression_encodings,
+    levels=_settings.compression_levels,
+)
+# Added last so it is outermost and also times requests shed by admission control.
+app.add_middleware(MetricsMiddleware)
+set_op_observer(observe_rule)
 
 
 @app.get("/")
@@ -47,32 +109,107 @@ def healthz() -> Dict[str, str]:
     return {"status": "ok"}
 
 
-@app.post("/v1/evaluate", response_model=EvalResponse)
-def evaluate_endpoint(request: EvalRequest) -> EvalResponse:
+@app.post(
+    "/v1/evaluate", response_model=EvalResponse, responses={304: {"description": "Not Modified"}}
+)
+def evaluate_endpoint(
+    request: EvalRequest,
+    http_request: Request,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+) -> Any:
     """
     Main evaluation endpoint.
 
-    It delegates to policyengine.evaluate(profile_ref, context, evidence)
-    and returns the standardized EvalResponse model.
+    It delegates to policyengine.evaluate(profile_ref, context, evidence,
+    controls) and returns the standardized EvalResponse model.
+
+    Results are cached by canonical request hash; the hash is returned as
+    the ETag, and a matching If-None-Match on a cached result returns 304.
+    With fast_json_responses the model is serialized straight to bytes
+    (same wire schema) instead of through FastAPI's response_model encoder.
+    Phase timings are returned in a Server-Timing header and, optionally,
+    in metadata["timings"]. Callers over their rate limit get 429.
+    A retry with the same Idempotency-Key (or request_id) returns the
+    stored result, or waits for the original if it is still running.
     """
-    try:
-        result = evaluate(
-            profile_ref=request.profile_ref,
-            context=request.context,
-            evidence=request.evidence,
-        )
-    except ProfileNotFoundError as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
-    except ProfileValidationError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
-    except Exception as exc:  # noqa: BLE001
-        # You can log the exception here with your logging helper
-        raise HTTPException(status_code=500, detail="Internal evaluation error") from exc
-
-    # If `evaluate` already returns an EvalResponse-compatible dict/model,
-    # we can just return it directly.
-    if isinstance(result, EvalResponse):
-        return result
-
-    # Otherwise assume it's a dict compatible with EvalResponse
-    return EvalResponse.model_validate(result)
+    enforce_rate_limit(http_request, [request.profile_ref])
+    settings = get_settings()
+    headers: Dict[str, str] = {}
+    with timing.record(per_rule=settings.debug_rule_timing) as timer:
+        start = time.perf_counter()
+        result = _evaluate_with_etag(request, http_request, if_none_match, headers)
+        if isinstance(result, EvalResponse) and (
+            settings.timing_in_metadata or settings.debug_rule_timing
+        ):
+            result = result.model_copy(
+                update={"metadata": {**result.metadata, "timings": timer.as_dict()}}
+            )
+
+        if isinstance(result, Response):
+            out: Any = result
+        elif settings.fast_json_responses:
+            with timer.phase("serialize"):
+                out = FastJSONResponse(result, headers=headers)
+        else:
+            response.headers.update(headers)
+            out = result
+        timer.add("total", time.perf_counter() - start)
+
+    if settings.server_timing_enabled:
+        target = out if isinstance(out, Response) else response
+        target.headers["Server-Timing"] = timer.server_timing()
+    return out
+
+
+def _evaluate_with_etag(
+    request: EvalRequest,
+    http_request: Request,
+    if_none_match: Optional[str],
+    headers: Dict[str, str],
+) -> EvalResponse | Response:
+    cache = get_result_cache()
+    if cache is None:
+        return run_idempotent(http_request, request, lambda: run_evaluation(request), headers)
+
+    key = request_key(request)
+    etag = etag_for(key)
+    if etag_matches(if_none_match, etag) and cache.contains(key):
+        cache.record_not_modified()
+        return Response(status_code=304, headers={"ETag": etag})
+    headers["ETag"] = etag
+    return run_idempotent(http_request, request, lambda: run_evaluation(request, key), headers)
+
+
+@app.get("/v1/cache/stats")
+def cache_stats() -> Dict[str, Any]:
+    """Result cache, request coalescing and idempotency store statistics."""
+    cache = get_result_cache()
+    store = get_idempotency_store()
+    return {
+        "result_cache": cache.stats() if cache is not None else None,
+        "single_flight": get_single_flight().stats(),
+        "idempotency": store.stats() if store is not None else None,
+    }
+
+
+@app.get("/v1/admission/stats")
+def admission_stats() -> Dict[str, Any]:
+    """Admission control statistics (active runs, queue depth, wait times, rejections)."""
+    controller = get_admission_controller()
+    return {"admission": controller.stats() if controller is not None else None}
+
+
+app.include_router(batch_router)
+app.include_router(catalog_router)
+app.include_router(debug_router)
+app.include_router(jobs_router)
+app.include_router(streaming_router)
+app.include_router(metrics_router)
+app.include_router(rate_limit_router)
+app.include_router(readiness_router)
+app.include_router(reload_router)
+
+# Custom schema, served from the build-time artifact (generated lazily without one)
+apply_openapi_overrides(app)
+serve_openapi(app, _settings.openapi_artifact_path or None)
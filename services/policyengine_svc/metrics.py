@@ -0,0 +1,441 @@
+"""In-process metrics registry exposed at ``/metrics`` (Prometheus text format).
+
+No client library is required: counters, gauges and histograms are plain
+Python objects guarded by a lock, so recording an observation costs a
+dict lookup and a few additions. Everything else -- cache hit ratios,
+admission and coalescing counters, evidence bytes read -- is collected
+from the owning components only when ``/metrics`` is scraped, so the
+service pays nothing for them when nobody is scraping.
+
+Series:
+
+* ``policyengine_http_request_duration_seconds{method,route,status}``
+* ``policyengine_http_requests_in_flight``
+* ``policyengine_evaluation_duration_seconds{profile}``
+* ``policyengine_rule_duration_seconds{engine_op}`` (thread backend only;
+  ops running in process-pool workers are not observed)
+* ``policyengine_result_cache_*``, ``policyengine_profile_cache_*``,
+  ``policyengine_single_flight_*``, ``policyengine_admission_*``
+* ``policyengine_evidence_bytes_read_total{backend}``
+* ``policyengine_rate_limit_rejections_total{cost_class}``
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.routing import Match
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+LabelValues = Tuple[str, ...]
+# (suffix, labels, value) rows produced by a metric or collector.
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [("", self._labels(k), v) for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [("", self._labels(k), v) for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (non-cumulative) + overflow, sum, count]
+        self._series: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._series.items()]
+        rows: List[Sample] = []
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                rows.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            rows.append(("_sum", labels, total))
+            rows.append(("_count", labels, count))
+        return rows
+
+
+# A collector returns (name, kind, help, samples) families at scrape time.
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+Collector = Callable[[], Iterable[Family]]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), **kwargs: Any
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, **kwargs))
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(
+                    f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+                )
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_DURATION = REGISTRY.histogram(
+    "policyengine_http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ("method", "route", "status"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "policyengine_http_requests_in_flight", "HTTP requests currently being served."
+)
+EVALUATION_DURATION = REGISTRY.histogram(
+    "policyengine_evaluation_duration_seconds",
+    "Successful evaluation latency by profile (including cache hits).",
+    ("profile",),
+)
+RATE_LIMIT_REJECTIONS = REGISTRY.counter(
+    "policyengine_rate_limit_rejections_total",
+    "Requests rejected by the per-caller rate limiter.",
+    ("cost_class",),
+)
+RULE_DURATION = REGISTRY.histogram(
+    "policyengine_rule_duration_seconds", "Engine op execution time.", ("engine_op",)
+)
+
+
+def observe_rule(engine_op: str, seconds: float) -> None:
+    """policyengine.ops observer recording RULE_DURATION."""
+    RULE_DURATION.observe(seconds, engine_op)
+
+
+def _ratio(hits: float, misses: float) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+def _service_collector() -> Iterable[Family]:
+    # Imported lazily: these modules import settings/engine state we only
+    # want to touch when someone scrapes.
+    from policyengine import profiles
+    from policyengine.evidence import evidence_bytes_read
+
+    from .admission import get_admission_controller
+    from .result_cache import get_result_cache
+    from .single_flight import get_single_flight
+
+    families: List[Family] = []
+
+    cache = get_result_cache()
+    if cache is not None:
+        stats = cache.stats()
+        families += [
+            (
+                "policyengine_result_cache_hits_total",
+                "counter",
+                "Result cache hits.",
+                [({}, stats["hits"])],
+            ),
+            (
+                "policyengine_result_cache_misses_total",
+                "counter",
+                "Result cache misses.",
+                [({}, stats["misses"])],
+            ),
+            (
+                "policyengine_result_cache_hit_ratio",
+                "gauge",
+                "Result cache hit ratio.",
+                [({}, stats["hit_rate"])],
+            ),
+            (
+                "policyengine_result_cache_entries",
+                "gauge",
+                "Cached results.",
+                [({}, stats["entries"])],
+            ),
+            (
+                "policyengine_result_cache_not_modified_total",
+                "counter",
+                "304 responses.",
+                [({}, stats["not_modified"])],
+            ),
+        ]
+
+    info = profiles.profile_cache_info()
+    families += [
+        (
+            "policyengine_profile_cache_hits_total",
+            "counter",
+            "Parsed profile cache hits.",
+            [({}, info.hits)],
+        ),
+        (
+            "policyengine_profile_cache_misses_total",
+            "counter",
+            "Parsed profile cache misses.",
+            [({}, info.misses)],
+        ),
+        (
+            "policyengine_profile_cache_hit_ratio",
+            "gauge",
+            "Parsed profile cache hit ratio.",
+            [({}, _ratio(info.hits, info.misses))],
+        ),
+    ]
+
+    flight = get_single_flight().stats()
+    families += [
+        (
+            "policyengine_single_flight_coalesced_total",
+            "counter",
+            "Evaluations coalesced onto an in-flight one.",
+            [({}, flight["coalesced"])],
+        ),
+        (
+            "policyengine_single_flight_dedup_ratio",
+            "gauge",
+            "Coalesced / total evaluation calls.",
+            [({}, flight["dedup_ratio"])],
+        ),
+        (
+            "policyengine_single_flight_in_flight",
+            "gauge",
+            "Distinct evaluations in flight.",
+            [({}, flight["in_flight"])],
+        ),
+    ]
+
+    controller = get_admission_controller()
+    if controller is not None:
+        adm = controller.stats()
+        families += [
+            (
+                "policyengine_admission_active",
+                "gauge",
+                "Admitted evaluations running.",
+                [({}, adm["active"])],
+            ),
+            (
+                "policyengine_admission_queue_depth",
+                "gauge",
+                "Requests waiting for a slot.",
+                [({}, adm["queue_depth"])],
+            ),
+            (
+                "policyengine_admission_wait_seconds_total",
+                "counter",
+                "Total time spent queued.",
+                [({}, adm["wait_seconds_total"])],
+            ),
+            (
+                "policyengine_admission_rejected_total",
+                "counter",
+                "Requests shed by admission control.",
+                [
+                    ({"reason": "queue_full"}, adm["rejected_queue_full"]),
+                    ({"reason": "timeout"}, adm["rejected_timeout"]),
+                ],
+            ),
+        ]
+
+    families.append(
+        (
+            "policyengine_evidence_bytes_read_total",
+            "counter",
+            "Evidence bytes fetched by backend.",
+            [({"backend": name}, n) for name, n in sorted(evidence_bytes_read().items())],
+        )
+    )
+    return families
+
+
+REGISTRY.add_collector(_service_collector)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and in-flight requests."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_DURATION.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                _route_label(scope),
+                str(status["code"]),
+            )
+
+
+def _route_label(scope: Dict[str, Any]) -> str:
+    """Route template for ``scope`` (never the raw path, to bound label cardinality)."""
+    route = scope.get("route")
+    if route is None:
+        # Requests answered before routing (e.g. shed by admission control).
+        app = scope.get("app")
+        for candidate in getattr(app, "routes", ()):
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", "unmatched")
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics_endpoint() -> PlainTextResponse:
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -12,13 +12,34 @@ gateway layers—we often need to:
 This module centralizes those concerns so the main FastAPI application
 (`main.py`) can remain focused on routing and behavior while all schema
 customization lives in one place.
+
+Generating the schema walks every route and pydantic model, so it is done
+at build time instead of in the service. The image build writes the
+customized document to a static artifact:
+
+    python scripts/publish_openapi.py --output /app/openapi.json
+
+and the service (``OPENAPI_ARTIFACT_PATH``) serves those bytes as-is from
+``/openapi.json``, with an ETag so clients can revalidate with a cheap
+``304``. Without an artifact the schema is still generated lazily, on the
+first request for it, never at startup.
 """
 
-from typing import Any, Dict
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.openapi.utils import get_openapi
 
+from .result_cache import etag_matches
+
+logger = logging.getLogger(__name__)
+
 
 def generate_custom_openapi(app: FastAPI) -> Dict[str, Any]:
     """Generate a customized OpenAPI schema for the given FastAPI app.
@@ -128,3 +149,80 @@ def apply_openapi_overrides(app: FastAPI) -> None:
         return app.openapi_schema  # type: ignore[return-value]
 
     app.openapi = custom_openapi  # type: ignore[assignment]
+
+
+def render_openapi(app: FastAPI) -> bytes:
+    """Serialize the customized OpenAPI schema of ``app`` to JSON bytes."""
+    return json.dumps(generate_custom_openapi(app), indent=2).encode("utf-8")
+
+
+def write_openapi_artifact(app: FastAPI, path: Path | str) -> str:
+    """Write the customized schema of ``app`` to ``path`` and return its ETag.
+
+    The file is written to a temp file and renamed into place, so a reader
+    never sees a partial document.
+    """
+    body = render_openapi(app)
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".openapi-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return _etag(body)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()}"'
+
+
+def serve_openapi(app: FastAPI, artifact_path: Optional[str] = None) -> None:
+    """Serve ``app.openapi_url`` from a prebuilt artifact, with an ETag.
+
+    Replaces FastAPI's default route, which re-serializes the schema on
+    every request. The document (the artifact at ``artifact_path``, or the
+    schema generated from ``app`` when there is none) is loaded on the
+    first request and kept in memory. ``Cache-Control: no-cache`` makes
+    clients revalidate, so a redeployed schema is picked up immediately
+    while unchanged ones cost a ``304``.
+
+    Args:
+        app: The application whose ``/openapi.json`` route is replaced.
+            Routes must already be registered if the schema may be
+            generated from it.
+        artifact_path: Path of the document written by
+            :func:`write_openapi_artifact`, or None to generate it lazily.
+    """
+    url = app.openapi_url
+    if not url:
+        return
+    document: Dict[str, Tuple[bytes, str]] = {}
+
+    def load() -> Tuple[bytes, str]:
+        if "body" not in document:
+            body: Optional[bytes] = None
+            if artifact_path:
+                try:
+                    body = Path(artifact_path).read_bytes()
+                except OSError:
+                    logger.warning(
+                        "OpenAPI artifact %s not found; generating the schema", artifact_path
+                    )
+            if body is None:
+                body = json.dumps(app.openapi(), indent=2).encode("utf-8")
+            document["body"] = (body, _etag(body))
+        return document["body"]
+
+    async def openapi(request: Request) -> Response:
+        body, etag = load()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    app.router.routes[:] = [r for r in app.router.routes if getattr(r, "path", None) != url]
+    app.add_route(url, openapi, include_in_schema=False)
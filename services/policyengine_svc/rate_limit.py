@@ -0,0 +1,228 @@
+"""Per-caller token-bucket rate limiting for evaluation routes.
+
+APIM throttles per subscription, but a runaway agent loop behind a single
+subscription can still saturate one replica. Each caller gets a token
+bucket refilled at ``RATE_LIMIT_RATE`` tokens/second, up to
+``RATE_LIMIT_BURST``. Each evaluation costs the tokens of its profile's
+cost class: ``RATE_LIMIT_PROFILE_CLASSES`` maps a profile id to a class,
+``RATE_LIMIT_CLASS_COSTS`` maps a class to tokens, and unlisted profiles
+are ``default``. A batch is charged for all its items up front. When the
+bucket runs dry the request gets ``429`` and a ``Retry-After`` with the
+time until enough tokens are back.
+
+Callers are identified, in order of preference, by:
+
+* ``Ocp-Apim-Subscription-Key`` (hashed; the key is never stored)
+* only with ``RATE_LIMIT_TRUST_BEARER_SUBJECT`` (APIM validates the JWT
+  before it reaches the service): the ``sub`` claim of a bearer JWT, or a
+  hash of an opaque bearer token. The service does not verify tokens
+  itself, so an unvalidated ``sub`` could be forged per request.
+* the client IP: the ``X-Forwarded-For`` hop appended by the outermost of
+  ``RATE_LIMIT_TRUSTED_PROXIES`` trusted proxies (counted from the right;
+  earlier hops are client-supplied and can be rotated at will), else the
+  peer address.
+
+Buckets are spread over striped locks, so concurrent callers rarely
+contend. Idle, full buckets are dropped once ``RATE_LIMIT_MAX_CALLERS`` is
+exceeded. Rejections are counted per cost class in
+``policyengine_rate_limit_rejections_total``; per-caller counts (which
+include client IPs) are only in ``GET /v1/rate-limit/stats``.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+
+from policyengine.profiles import split_profile_ref
+
+from .config import get_settings
+from .metrics import RATE_LIMIT_REJECTIONS
+
+router = APIRouter()
+
+DEFAULT_CLASS = "default"
+_STRIPES = 64
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def _jwt_subject(token: str) -> Optional[str]:
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+    except ValueError:
+        return None
+    subject = payload.get("sub") if isinstance(payload, dict) else None
+    return str(subject) if subject else None
+
+
+def caller_id(
+    request: Request,
+    trusted_proxies: Optional[int] = None,
+    trust_bearer: Optional[bool] = None,
+) -> str:
+    """Stable caller identity: subscription key, bearer subject, or client IP.
+
+    ``trusted_proxies`` and ``trust_bearer`` default to
+    ``RATE_LIMIT_TRUSTED_PROXIES`` and ``RATE_LIMIT_TRUST_BEARER_SUBJECT``.
+    """
+    if trusted_proxies is None or trust_bearer is None:
+        settings = get_settings()
+        if trusted_proxies is None:
+            trusted_proxies = settings.rate_limit_trusted_proxies
+        if trust_bearer is None:
+            trust_bearer = settings.rate_limit_trust_bearer_subject
+    headers = request.headers
+    subscription = headers.get("ocp-apim-subscription-key")
+    if subscription:
+        return f"sub:{_digest(subscription)}"
+    authorization = headers.get("authorization", "")
+    if trust_bearer and authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+        subject = _jwt_subject(token)
+        return f"bearer:{subject}" if subject else f"bearer:{_digest(token)}"
+    hops = [hop.strip() for hop in headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if trusted_proxies > 0 and len(hops) >= trusted_proxies:
+        return f"ip:{hops[-trusted_proxies]}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class RateLimiter:
+    """Token buckets per caller; ``acquire`` returns 0 or the seconds to wait."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_callers: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_callers = max_callers
+        self._clock = clock
+        # caller -> [tokens, last refill time, allowed, rejected]
+        self._buckets: Dict[str, List[float]] = {}
+        self._locks = [threading.Lock() for _ in range(_STRIPES)]
+        self._sweep_lock = threading.Lock()
+
+    def acquire(self, caller: str, cost: float = 1.0) -> float:
+        now = self._clock()
+        bucket = self._buckets.get(caller)
+        if bucket is None:
+            bucket = self._buckets.setdefault(caller, [self.burst, now, 0, 0])
+            if len(self._buckets) > self.max_callers:
+                self._sweep(now, keep=caller)
+        with self._locks[hash(caller) % _STRIPES]:
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                bucket[2] += 1
+                return 0.0
+            bucket[0] = tokens
+            bucket[3] += 1
+        if cost > self.burst:
+            return math.inf
+        return (cost - tokens) / self.rate
+
+    def _sweep(self, now: float, keep: str) -> None:
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            full = [
+                caller
+                for caller, (tokens, last, _, _) in list(self._buckets.items())
+                if caller != keep and tokens + (now - last) * self.rate >= self.burst
+            ]
+            for caller in full:
+                self._buckets.pop(caller, None)
+        finally:
+            self._sweep_lock.release()
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        buckets = list(self._buckets.items())
+        rejected = sorted(((b[3], caller) for caller, b in buckets if b[3]), reverse=True)[:top]
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "callers": len(buckets),
+            "allowed": sum(int(b[2]) for _, b in buckets),
+            "rejected": sum(int(b[3]) for _, b in buckets),
+            "top_rejected": [
+                {"caller": caller, "rejected": int(count)} for count, caller in rejected
+            ],
+        }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Return the service rate limiter, or None when ``RATE_LIMIT_RATE`` is 0."""
+    global _limiter
+    if _limiter is None:
+        settings = get_settings()
+        if settings.rate_limit_rate <= 0:
+            return None
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter(
+                    settings.rate_limit_rate,
+                    settings.rate_limit_burst,
+                    settings.rate_limit_max_callers,
+                )
+    return _limiter
+
+
+def cost_class(profile_ref: str, profile_classes: Mapping[str, str]) -> str:
+    return profile_classes.get(split_profile_ref(profile_ref)[0], DEFAULT_CLASS)
+
+
+def enforce_rate_limit(request: Request, profile_refs: Iterable[str]) -> None:
+    """Charge the caller for evaluating ``profile_refs``.
+
+    Raises:
+        HTTPException: ``429`` with ``Retry-After`` when the caller's
+            bucket cannot cover the cost.
+    """
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return
+    settings = get_settings()
+    costs = settings.rate_limit_class_costs
+    classes = [cost_class(ref, settings.rate_limit_profile_classes) for ref in profile_refs]
+    cost = sum(costs.get(c, costs.get(DEFAULT_CLASS, 1.0)) for c in classes)
+    caller = caller_id(request)
+    wait = limiter.acquire(caller, cost)
+    if wait:
+        label = classes[0] if len(set(classes)) == 1 else "mixed"
+        RATE_LIMIT_REJECTIONS.inc(label)
+        if math.isinf(wait):
+            detail = f"Request cost {cost:g} exceeds the rate limit burst of {limiter.burst:g}"
+            raise HTTPException(status_code=429, detail=detail)
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+
+@router.get("/v1/rate-limit/stats")
+def rate_limit_stats() -> Dict[str, Any]:
+    """Rate limiter statistics, including the callers rejected most often."""
+    limiter = get_rate_limiter()
+    return {"rate_limit": limiter.stats() if limiter is not None else None}
@@ -0,0 +1,129 @@
+"""Startup prewarming and the ``/readyz`` readiness endpoint.
+
+A fresh replica pays for YAML parsing, rule loading and pass_criteria
+compilation on its first requests. At startup the service prewarms the
+profile/rule registry in a background thread -- every profile, or only
+the hot ones listed in ``PREWARM_PROFILES`` -- and ``/readyz`` answers
+``503`` until that finishes, so Container Apps only routes traffic to
+warm replicas. ``/healthz`` stays a pure liveness check.
+
+With a registry snapshot attached, profiles and rules are decoded from
+the shared map on first use, so parsing every YAML file up front would
+only repeat work the snapshot build already did: only ``PREWARM_PROFILES``
+are warmed, and without them the replica is ready at once.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from policyengine import registry, snapshot
+from policyengine.profiles import load_profile_by_ref
+
+from .config import get_settings
+
+
+class WarmState:
+    """Progress and outcome of startup prewarming."""
+
+    def __init__(self) -> None:
+        self.started_at: Optional[float] = None
+        self.duration_seconds: Optional[float] = None
+        self.ready = False
+        self.profiles: List[str] = []
+        self.skipped: List[str] = []
+        self.compiled_rules = 0
+        self.error: Optional[str] = None
+        self.snapshot = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        if self.ready:
+            status = "ready"
+        elif self.started_at is None:
+            status = "not_started"
+        else:
+            status = "warming"
+        return {
+            "status": status,
+            "warmup_seconds": self.duration_seconds,
+            "profiles": list(self.profiles),
+            "skipped": list(self.skipped),
+            "compiled_rules": self.compiled_rules,
+            "error": self.error,
+            "snapshot": self.snapshot,
+        }
+
+
+_state = WarmState()
+
+
+def get_warm_state() -> WarmState:
+    return _state
+
+
+def prewarm(hot_profiles: Sequence[str] = (), state: Optional[WarmState] = None) -> WarmState:
+    """
+    Parse profiles and compile their rules, recording the result in ``state``.
+
+    With ``hot_profiles`` only those profile refs are warmed; otherwise every
+    profile under PROFILES_DIR is, unless a registry snapshot is attached.
+    Profiles that fail to load or compile are reported as skipped, and any
+    other failure as ``error``; neither keeps the replica from becoming
+    ready.
+    """
+    state = state or _state
+    state.started_at = time.perf_counter()
+    state.snapshot = snapshot.active() is not None
+    try:
+        if hot_profiles:
+            for ref in hot_profiles:
+                try:
+                    profile = load_profile_by_ref(ref)
+                    compiled = registry.compile_profile(profile)
+                except Exception:  # noqa: BLE001
+                    state.skipped.append(ref)
+                    continue
+                state.compiled_rules += compiled
+                state.profiles.append(ref)
+        elif state.snapshot:
+            pass  # lookups decode from the snapshot; there is nothing to parse
+        else:
+            result = registry.preload()
+            state.profiles = result["profiles"]
+            state.skipped = result["skipped"]
+            state.compiled_rules = result["compiled_rules"]
+    except Exception as exc:  # noqa: BLE001
+        state.error = f"{type(exc).__name__}: {exc}"
+    finally:
+        # A failed warm-up must not keep the replica unready forever; it
+        # serves cold instead.
+        state.duration_seconds = time.perf_counter() - state.started_at
+        state.ready = True
+    return state
+
+
+def start_prewarm() -> threading.Thread:
+    """Prewarm in a daemon thread so liveness probes are answered meanwhile."""
+    global _state
+    _state = WarmState()
+    hot_profiles = get_settings().prewarm_profiles
+    thread = threading.Thread(
+        target=prewarm, args=(hot_profiles, _state), name="prewarm", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+router = APIRouter()
+
+
+@router.get("/readyz")
+def readyz() -> JSONResponse:
+    """Readiness probe: 200 once prewarming has finished, 503 before."""
+    state = get_warm_state()
+    return JSONResponse(state.as_dict(), status_code=200 if state.ready else 503)
@@ -0,0 +1,81 @@
+"""Hot reload of profiles and rules (``HOT_RELOAD_ENABLED``).
+
+Starts a :class:`policyengine.hot_reload.RegistryWatcher` that polls
+``profiles/`` and ``rules/`` every ``HOT_RELOAD_INTERVAL_SECONDS`` and
+atomically swaps in a recompiled registry when a file changes. Evaluation
+lookups then never stat files per request. After a swap the profile
+catalog is rebuilt and the result cache and idempotency store are
+cleared: their keys already cover the profile and rule files, so entries
+from before the swap can no longer be hit and would only hold memory.
+
+Only evaluations in the API process use the live registry. Process-pool
+workers have no watcher: they look profiles and rule definitions up by
+(path, mtime), one stat per lookup, so they pick up an edit on their next
+evaluation rather than atomically with the swap.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter
+
+from policyengine import hot_reload, snapshot
+from policyengine.catalog import ProfileCatalog
+
+from .catalog import set_catalog
+from .config import get_settings
+from .idempotency import get_idempotency_store
+from .result_cache import get_result_cache
+
+router = APIRouter()
+
+_watcher: Optional[hot_reload.RegistryWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def _on_swap(_: hot_reload.LiveRegistry) -> None:
+    set_catalog(ProfileCatalog.build())
+    cache = get_result_cache()
+    if cache is not None:
+        cache.clear()
+    store = get_idempotency_store()
+    if store is not None:
+        store.clear()
+
+
+def start_watcher() -> Optional[hot_reload.RegistryWatcher]:
+    """Install the live registry and start polling, if hot reload is enabled."""
+    global _watcher
+    settings = get_settings()
+    if not settings.hot_reload_enabled:
+        return None
+    with _watcher_lock:
+        if _watcher is None:
+            watcher = hot_reload.RegistryWatcher(
+                settings.hot_reload_interval_seconds, on_swap=[_on_swap]
+            )
+            watcher.start()
+            _watcher = watcher
+    return _watcher
+
+
+def stop_watcher() -> None:
+    global _watcher
+    with _watcher_lock:
+        watcher, _watcher = _watcher, None
+    if watcher is not None:
+        watcher.stop()
+        hot_reload.install(None)
+
+
+@router.get("/v1/registry/stats", tags=["profiles"])
+def registry_stats() -> Dict[str, Any]:
+    """Live registry generation and size, and registry snapshot usage."""
+    live = hot_reload.current()
+    snap = snapshot.active()
+    return {
+        "hot_reload": live.stats() if live is not None else None,
+        "snapshot": snap.stats() if snap is not None else None,
+    }
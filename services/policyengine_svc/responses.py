@@ -0,0 +1,51 @@
+"""Fast JSON serialization for service responses.
+
+FastAPI's default path for ``response_model`` routes re-validates the
+returned model, runs ``jsonable_encoder`` over it and then ``json.dumps``
+the result -- for a large profile with many findings that dominates the
+request. :class:`FastJSONResponse` serializes straight to bytes instead:
+
+* pydantic models through ``model_dump_json`` (pydantic-core, in Rust),
+  using the model's own schema, so the wire format is unchanged;
+* anything else through ``orjson`` when it is installed, falling back to
+  the stdlib encoder with Starlette's settings otherwise.
+
+Enabled with ``FAST_JSON_RESPONSES`` (default ``true``).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:  # optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` to compact UTF-8 JSON bytes."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that renders with :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,200 @@
+"""In-memory evaluation result cache for the PolicyEngine service.
+
+Agents, webhooks and the monitoring timer often send identical requests
+within minutes of each other. Results are cached under a canonical
+request key:
+
+    sha256({"profile": sha256(profile file),
+            "rules": {rule id: sha256(rule file)}, "context": ...,
+            "evidence": evidence_digests(evidence)})
+
+so an edited profile or rule, or any change in context/evidence, yields
+a new key. Evidence given as specs (URIs, paths, patterns) is keyed on
+what they currently resolve to, not on the spec itself, so a blob or file
+that changes under the same spec yields a new key too.
+Entries expire after ``result_cache_ttl_seconds`` and the cache holds at
+most ``result_cache_max_entries`` results (least recently used evicted
+first). The key doubles as the response ``ETag``; a matching
+``If-None-Match`` on a live entry is answered with ``304`` and no
+evaluation. Only successful evaluations are cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from policyengine.evidence import is_spec, resolve_evidence
+from policyengine.evidence_handles import EvidenceHandle
+from policyengine.exceptions import EvidenceResolutionError
+from policyengine.models import EvalRequest, EvalResponse
+from policyengine.profiles import profile_digest, profile_rule_digests
+
+from .config import get_settings
+
+
+def canonical_digest(value: Any) -> str:
+    """sha256 of the canonical (sorted, compact) JSON encoding of ``value``."""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _content_digest(value: Any) -> str:
+    if isinstance(value, EvidenceHandle):
+        return f"handle:{value.fingerprint()}"
+    if isinstance(value, (list, tuple)):
+        return canonical_digest([_content_digest(v) for v in value])
+    return canonical_digest(value)
+
+
+def evidence_digests(evidence: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Per-entry digests of ``evidence``, by content rather than by spec.
+
+    Spec entries are resolved (blob reads revalidate against the evidence
+    cache by ETag; local files are digested by path, size and mtime without
+    being read), so the digest changes whenever the evidence behind a spec
+    does. Specs that fail to resolve are digested as given: their
+    evaluation fails and is never cached.
+    """
+    specs = {
+        name: value
+        for name, value in evidence.items()
+        if is_spec(value) or (isinstance(value, list) and value and all(map(is_spec, value)))
+    }
+    resolved: Dict[str, Any] = {}
+    if specs:
+        try:
+            resolved = resolve_evidence(specs)
+        except EvidenceResolutionError:
+            resolved = {}
+    return {
+        name: _content_digest(resolved[name]) if name in resolved else canonical_digest(value)
+        for name, value in evidence.items()
+    }
+
+
+def request_key(request: EvalRequest) -> str:
+    """Canonical cache key for an evaluation request."""
+    return canonical_digest(
+        {
+            "profile_ref": request.profile_ref,
+            "profile": profile_digest(request.profile_ref),
+            "rules": profile_rule_digests(request.profile_ref),
+            "context": request.context,
+            "evidence": evidence_digests(request.evidence),
+            "controls": sorted(set(request.controls)) if request.controls is not None else None,
+        }
+    )
+
+
+def etag_for(key: str) -> str:
+    return f'"{key}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header value matches ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+class ResultCache:
+    """Thread-safe TTL + LRU cache of EvalResponses keyed by :func:`request_key`."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, EvalResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._not_modified = 0
+
+    def get(self, key: str) -> Optional[EvalResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def contains(self, key: str) -> bool:
+        """True if ``key`` has a live entry (does not count as a hit or miss)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+    def put(self, key: str, response: EvalResponse) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self._not_modified += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "not_modified": self._not_modified,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Return the service result cache, or None when disabled (TTL or size of 0)."""
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        if settings.result_cache_ttl_seconds <= 0 or settings.result_cache_max_entries <= 0:
+            return None
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache(
+                    settings.result_cache_max_entries, settings.result_cache_ttl_seconds
+                )
+    return _cache
@@ -0,0 +1,100 @@
+"""Single-flight coalescing of identical in-flight evaluations.
+
+Agent retries (``PolicyEnginePlugin._post_json`` retries up to 3 times)
+and bursts from several agents frequently submit the same request while
+the first copy is still evaluating. :class:`SingleFlight` lets the first
+caller for a key (the leader) run the computation while every concurrent
+caller with the same key waits for, and receives, the leader's result or
+exception. Once the leader finishes, the key is released: later calls are
+served by the result cache or evaluate again.
+
+Callers run on worker threads (Starlette's threadpool), so waiting uses a
+:class:`threading.Event`, not asyncio primitives. Waiters give up after
+``timeout`` seconds, so a hung leader cannot pin every coalesced caller's
+thread.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key onto one computation."""
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._executions = 0
+        self._coalesced = 0
+        self._timeouts = 0
+
+    def do(self, key: str, fn: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """Run ``fn`` once for all concurrent callers of ``key``.
+
+        Raises:
+            TimeoutError: A waiter's leader did not finish within ``timeout``.
+        """
+        with self._lock:
+            self._calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                with self._lock:
+                    self._timeouts += 1
+                raise TimeoutError(key)
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._flights),
+                "timeouts": self._timeouts,
+                "dedup_ratio": self._coalesced / self._calls if self._calls else 0.0,
+            }
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    return _single_flight
@@ -0,0 +1,122 @@
+"""Server-sent events variant of ``/v1/evaluate``: ``POST /v1/evaluate:stream``.
+
+Interactive agent sessions want findings as soon as they exist instead of
+after the slowest rule. The profile's rules run concurrently (at most
+``STREAM_MAX_RULE_WORKERS`` at a time) and each ``Finding`` is sent as an
+SSE event the moment its rule completes, followed by the full
+EvalResponse::
+
+    event: finding
+    data: {"id": "bias_fairness", "status": "pass", ...}
+
+    event: summary
+    data: {"profile_ref": "...", "summary": {...}, "findings": [...]}
+
+Profile errors are reported as normal HTTP errors before the stream
+starts; a failure after that ends the stream with an ``error`` event.
+Evaluation always runs in the API process (not on the process-pool
+backend). A cached result is replayed at once, and a completed stream
+fills the result cache for ``/v1/evaluate``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from policyengine import evaluate_stream
+from policyengine.exceptions import (
+    EvidenceResolutionError,
+    ProfileNotFoundError,
+    ProfileValidationError,
+    UnknownControlError,
+)
+from policyengine.models import EvalRequest, EvalResponse
+
+from .config import get_settings
+from .rate_limit import enforce_rate_limit
+from .responses import dumps
+from .result_cache import get_result_cache, request_key
+
+router = APIRouter()
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one SSE event; ``data`` is serialized as single-line JSON."""
+    return b"event: " + event.encode("ascii") + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def _replay(response: EvalResponse) -> Iterator[bytes]:
+    for finding in response.findings:
+        yield sse_event("finding", finding)
+    yield sse_event("summary", response)
+
+
+def _stream(events: Iterator[tuple], key: str) -> Iterator[bytes]:
+    try:
+        for event, payload in events:
+            if event == "summary":
+                payload = EvalResponse.model_validate(payload)
+                cache = get_result_cache()
+                if cache is not None:
+                    cache.put(key, payload)
+            yield sse_event(event, payload)
+    except Exception:  # noqa: BLE001
+        yield sse_event("error", {"status": 500, "detail": "Internal evaluation error"})
+
+
+def _start(request: EvalRequest) -> Iterator[tuple]:
+    try:
+        return evaluate_stream(
+            profile_ref=request.profile_ref,
+            context=request.context,
+            evidence=request.evidence,
+            max_workers=get_settings().stream_max_rule_workers,
+            controls=request.controls,
+        )
+    except ProfileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except (ProfileValidationError, UnknownControlError, EvidenceResolutionError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail="Internal evaluation error") from exc
+
+
+@router.post(
+    "/v1/evaluate:stream",
+    tags=["evaluation"],
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {SSE_MEDIA_TYPE: {}},
+            "description": "finding events, then a summary event",
+        }
+    },
+)
+async def evaluate_stream_endpoint(
+    request: EvalRequest, http_request: Request
+) -> StreamingResponse:
+    """
+    Evaluate a profile and stream each Finding as an SSE event as its rule completes.
+    """
+    enforce_rate_limit(http_request, [request.profile_ref])
+    # The cache key and the profile load read files (and resolve evidence
+    # specs), so the whole setup runs in the threadpool, not on the loop.
+    return await run_in_threadpool(_open_stream, request)
+
+
+def _open_stream(request: EvalRequest) -> StreamingResponse:
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    key = request_key(request)
+    cache = get_result_cache()
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        return StreamingResponse(_replay(cached), media_type=SSE_MEDIA_TYPE, headers=headers)
+
+    events = _start(request)
+    return StreamingResponse(_stream(events, key), media_type=SSE_MEDIA_TYPE, headers=headers)
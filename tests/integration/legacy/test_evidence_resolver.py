@@ -10,8 +10,6 @@ evidence specification types to ensure that:
 The goal is not to fully unit-test the resolver internals here (that
 belongs in unit tests), but to verify that the "happy path" works when
 called the way agents and profiles actually use it.
-
-This legacy test is skipped by default under the new PolicyEngine core.
 """
 
 from __future__ import annotations
@@ -22,11 +20,6 @@ import pytest
 
 from policyengine.evidence import resolve
 
-# Mark this whole file as legacy / skipped
-pytestmark = pytest.mark.skip(
-    reason="Legacy test; evidence.resolve not implemented in the new engine yet."
-)
-
 
 @pytest.mark.integration
 def test_resolve_mixed_evidence_types() -> None:
@@ -0,0 +1,45 @@
+import json
+
+from services.policyengine_svc import admission
+
+
+def test_saturated_service_sheds_with_retry_after(
+    api_client, sample_eval_request_dict, monkeypatch
+):
+    controller = admission.AdmissionController(max_concurrent=1, max_queue=0)
+    monkeypatch.setattr(admission, "_controller", controller)
+    controller._active = 1  # simulate a long-running evaluation holding the only slot
+
+    rejected = api_client.post("/v1/evaluate", json=sample_eval_request_dict)
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert api_client.get("/healthz").status_code == 200
+
+    controller._active = 0
+    assert api_client.post("/v1/evaluate", json=sample_eval_request_dict).status_code == 200
+
+    stats = api_client.get("/v1/admission/stats").json()["admission"]
+    assert stats["rejected_queue_full"] == 1
+    assert stats["admitted"] == 1
+    assert stats["active"] == 0
+
+
+def test_batch_items_take_their_own_slots(api_client, sample_eval_request_dict, monkeypatch):
+    controller = admission.AdmissionController(max_concurrent=1, max_queue=0)
+    monkeypatch.setattr(admission, "_controller", controller)
+    controller._active = 1
+
+    resp = api_client.post("/v1/evaluate:batch", json=[sample_eval_request_dict] * 2)
+    assert resp.status_code == 200
+    statuses = [json.loads(line)["status"] for line in resp.text.splitlines()]
+    assert statuses == [429, 429]
+    # Job status lookups are not evaluations and are never shed.
+    assert api_client.get("/v1/evaluations/unknown").status_code == 404
+
+    controller._active = 0
+    controller.max_queue = 5  # the second item waits for the first one's slot
+    resp = api_client.post("/v1/evaluate:batch", json=[sample_eval_request_dict] * 2)
+    assert [json.loads(line)["status"] for line in resp.text.splitlines()] == [200, 200]
+    stats = controller.stats()
+    assert stats["admitted"] == 2
+    assert stats["active"] == 0
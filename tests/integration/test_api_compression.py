@@ -0,0 +1,64 @@
+import gzip
+import json
+
+
+def test_large_response_is_gzipped_when_accepted(api_client, sample_eval_request_dict):
+    resp = api_client.post(
+        "/v1/evaluate", json=sample_eval_request_dict, headers={"Accept-Encoding": "gzip"}
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in resp.headers["vary"].lower()
+    assert resp.json()["summary"]["profile_ref"] == sample_eval_request_dict["profile_ref"]
+
+
+def test_identity_when_not_accepted(api_client, sample_eval_request_dict):
+    resp = api_client.post(
+        "/v1/evaluate", json=sample_eval_request_dict, headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in resp.headers
+
+
+def test_small_responses_are_not_compressed(api_client):
+    resp = api_client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+
+
+def test_streaming_batch_is_compressed(api_client, sample_eval_request_dict):
+    with api_client.stream(
+        "POST",
+        "/v1/evaluate:batch",
+        json=[sample_eval_request_dict] * 3,
+        headers={"Accept-Encoding": "gzip"},
+    ) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        raw = b"".join(resp.iter_raw())
+
+    lines = gzip.decompress(raw).decode("utf-8").splitlines()
+    assert sorted(json.loads(line)["index"] for line in lines) == [0, 1, 2]
+
+
+def test_each_encoding_gets_its_own_etag(api_client, sample_eval_request_dict):
+    identity = api_client.post(
+        "/v1/evaluate", json=sample_eval_request_dict, headers={"Accept-Encoding": "identity"}
+    )
+    gzipped = api_client.post(
+        "/v1/evaluate", json=sample_eval_request_dict, headers={"Accept-Encoding": "gzip"}
+    )
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+
+    revalidated = api_client.post(
+        "/v1/evaluate",
+        json=sample_eval_request_dict,
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == gzipped.headers["etag"]
+
+    # A gzip tag does not validate the identity representation.
+    identity_retry = api_client.post(
+        "/v1/evaluate",
+        json=sample_eval_request_dict,
+        headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert identity_retry.status_code == 200
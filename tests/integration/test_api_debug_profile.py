@@ -0,0 +1,66 @@
+from collections import Counter
+
+from services.policyengine_svc.debug import collapse, top_functions
+
+URL = "/debug/profile-evaluate"
+
+
+def test_profile_endpoint_is_guarded(api_client, sample_eval_request_dict, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert api_client.post(URL, json=sample_eval_request_dict).status_code == 404
+
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    assert api_client.post(URL, json=sample_eval_request_dict).status_code == 403
+    assert (
+        api_client.post(
+            URL, json=sample_eval_request_dict, headers={"X-Admin-Token": "nope"}
+        ).status_code
+        == 403
+    )
+
+
+def test_deterministic_profile_returns_collapsed_stacks(
+    api_client, sample_eval_request_dict, monkeypatch
+):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+
+    resp = api_client.post(
+        URL,
+        params={"mode": "deterministic", "top": 5},
+        json=sample_eval_request_dict,
+        headers={"X-Admin-Token": "s3cret"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["unit"] == "us"
+    assert data["summary"]["profile_ref"] == sample_eval_request_dict["profile_ref"]
+    assert len(data["top"]) == 5
+    line = data["collapsed"].splitlines()[0]
+    stack, value = line.rsplit(" ", 1)
+    assert "policyengine.core:evaluate" in stack.split(";")
+    assert int(value) > 0
+
+
+def test_sampling_mode_is_accepted(api_client, sample_eval_request_dict, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+
+    resp = api_client.post(
+        URL,
+        params={"mode": "sample", "interval_ms": 0.5},
+        json=sample_eval_request_dict,
+        headers={"X-Admin-Token": "s3cret"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["unit"] == "samples"
+
+
+def test_collapse_and_top_functions():
+    stacks = Counter({("a", "b"): 3, ("a", "b", "c"): 2, ("a",): 1})
+
+    assert collapse(stacks) == "a;b 3\na;b;c 2\na 1\n"
+    assert top_functions(stacks, 2) == [
+        {"function": "b", "self": 3, "total": 5},
+        {"function": "c", "self": 2, "total": 2},
+    ]
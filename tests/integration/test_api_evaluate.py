@@ -1,3 +1,6 @@
+import json
+
+
 def test_api_evaluate_happy_path(api_client, sample_eval_request_dict):
     resp = api_client.post("/v1/evaluate", json=sample_eval_request_dict)
     assert resp.status_code == 200
@@ -17,3 +20,71 @@ def test_api_evaluate_missing_profile_ref_returns_422(api_client):
         json={"context": {}, "evidence": {}},
     )
     assert resp.status_code == 422
+
+
+def test_api_evaluate_controls_subset(api_client, sample_eval_request_dict):
+    full = api_client.post("/v1/evaluate", json=sample_eval_request_dict)
+    subset = api_client.post(
+        "/v1/evaluate", json=dict(sample_eval_request_dict, controls=["ISO42001-6.3.2"])
+    )
+
+    assert subset.status_code == 200
+    assert [f["id"] for f in subset.json()["findings"]] == ["bias_fairness"]
+    assert subset.headers["ETag"] != full.headers["ETag"]
+
+
+def test_api_evaluate_unknown_control_returns_400(api_client, sample_eval_request_dict):
+    resp = api_client.post("/v1/evaluate", json=dict(sample_eval_request_dict, controls=["NOPE-1"]))
+
+    assert resp.status_code == 400
+    assert "NOPE-1" in resp.json()["detail"]
+    assert (
+        api_client.post(
+            "/v1/evaluate", json=dict(sample_eval_request_dict, controls=[])
+        ).status_code
+        == 400
+    )
+
+
+def test_api_evaluate_resolves_pattern_specs(api_client, tmp_path, monkeypatch):
+    monkeypatch.setenv("EVIDENCE_ROOT", str(tmp_path))
+    lifecycle = tmp_path / "mlops" / "lifecycle"
+    lifecycle.mkdir(parents=True)
+    for kind in ("dpia", "model_card", "raichecklist"):
+        (lifecycle / f"{kind}.json").write_text(
+            json.dumps({"artifact_type": kind, "timestamp": "2025-01-01T00:00:00Z"}),
+            encoding="utf-8",
+        )
+    (lifecycle / "gate.json").write_text(
+        json.dumps([{"artifact_type": "gate_approval", "status": "approved"}]), encoding="utf-8"
+    )
+    services = tmp_path / "inventory" / "services"
+    services.mkdir(parents=True)
+    (services / "api.json").write_text(
+        json.dumps(
+            {"id": "api", "url": "https://api", "tls_version": "1.3", "kms_key_ref": "kv/k"}
+        ),
+        encoding="utf-8",
+    )
+    (services / "legacy.json").write_text(
+        json.dumps({"id": "legacy", "url": "http://legacy", "kms_key_ref": "kv/k"}),
+        encoding="utf-8",
+    )
+
+    resp = api_client.post(
+        "/v1/evaluate",
+        json={
+            "profile_ref": "iso_42001-global@1.2.0",
+            "context": {"system_name": "Demo LLM System"},
+            "evidence": {
+                "lifecycle": {"type": "blob_uri", "pattern": "mlops/lifecycle/*.json"},
+                "encryption": {"type": "blob_uri", "pattern": "inventory/services/*.json"},
+            },
+            "controls": ["lifecycle", "encryption"],
+        },
+    )
+
+    assert resp.status_code == 200
+    findings = {f["id"]: f for f in resp.json()["findings"]}
+    assert findings["lifecycle"]["status"] == "pass"
+    assert findings["encryption"]["status"] == "fail"
@@ -0,0 +1,41 @@
+import json
+
+
+def _lines(resp):
+    return [json.loads(line) for line in resp.text.splitlines() if line.strip()]
+
+
+def test_batch_json_array_streams_one_line_per_item(api_client, sample_eval_request_dict):
+    missing = dict(sample_eval_request_dict, profile_ref="does_not_exist@0.0.1")
+    payload = [sample_eval_request_dict, missing, sample_eval_request_dict]
+
+    resp = api_client.post("/v1/evaluate:batch", json=payload)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    entries = sorted(_lines(resp), key=lambda e: e["index"])
+    assert [e["index"] for e in entries] == [0, 1, 2]
+    assert [e["status"] for e in entries] == [200, 404, 200]
+    assert entries[0]["result"]["summary"]["profile_ref"] == sample_eval_request_dict["profile_ref"]
+    assert "error" in entries[1]
+
+
+def test_batch_ndjson_reports_invalid_items(api_client, sample_eval_request_dict):
+    body = "\n".join(
+        [json.dumps(sample_eval_request_dict), "{not json", json.dumps({"context": {}})]
+    )
+
+    resp = api_client.post(
+        "/v1/evaluate:batch",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+
+    statuses = {e["index"]: e["status"] for e in _lines(resp)}
+    assert statuses == {0: 200, 1: 400, 2: 422}
+
+
+def test_batch_rejects_non_array_body(api_client, sample_eval_request_dict):
+    resp = api_client.post("/v1/evaluate:batch", json=sample_eval_request_dict)
+    assert resp.status_code == 400
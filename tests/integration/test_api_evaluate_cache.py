@@ -0,0 +1,54 @@
+import json
+import os
+from unittest import mock
+
+from services.policyengine_svc import evaluation
+
+
+def test_etag_and_conditional_get(api_client, sample_eval_request_dict):
+    request = dict(sample_eval_request_dict, context={"system_name": "Demo cache"})
+    first = api_client.post("/v1/evaluate", json=request)
+    etag = first.headers["ETag"]
+
+    with mock.patch.object(evaluation, "get_backend") as backend:
+        again = api_client.post("/v1/evaluate", json=request)
+        not_modified = api_client.post(
+            "/v1/evaluate", json=request, headers={"If-None-Match": etag}
+        )
+    backend.assert_not_called()
+
+    assert again.status_code == 200
+    assert again.json() == first.json()
+    assert again.headers["ETag"] == etag
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    changed = api_client.post("/v1/evaluate", json=dict(request, evidence={"extra": 1}))
+    assert changed.headers["ETag"] != etag
+
+    stats = api_client.get("/v1/cache/stats").json()["result_cache"]
+    assert stats["hits"] >= 1
+    assert stats["not_modified"] >= 1
+
+
+def test_cached_result_follows_evidence_behind_a_spec(api_client, tmp_path, monkeypatch):
+    monkeypatch.setenv("EVIDENCE_ROOT", str(tmp_path))
+    inventory = tmp_path / "inventory.json"
+    request = {
+        "profile_ref": "iso_42001-global@1.2.0",
+        "context": {"system_name": "Demo cache spec"},
+        "evidence": {"encryption": {"type": "blob_uri", "uri": "inventory.json"}},
+        "controls": ["encryption"],
+    }
+
+    def evaluate(url):
+        inventory.write_text(json.dumps([{"id": "api", "url": url}]), encoding="utf-8")
+        mtime = inventory.stat().st_mtime_ns + len(url) * 10**9
+        os.utime(inventory, ns=(mtime, mtime))
+        return api_client.post("/v1/evaluate", json=request)
+
+    plain = evaluate("http://api")
+    tls = evaluate("https://api.example")
+
+    assert plain.headers["ETag"] != tls.headers["ETag"]
+    assert plain.json()["findings"] != tls.json()["findings"]
@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+from services.policyengine_svc import streaming
+from services.policyengine_svc.result_cache import request_key
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_emits_findings_then_summary(api_client, sample_eval_request_dict):
+    response = api_client.post("/v1/evaluate:stream", json=sample_eval_request_dict)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    *findings, (last, summary) = events
+    assert last == "summary"
+    assert {event for event, _ in findings} == {"finding"}
+    assert sorted(f["id"] for _, f in findings) == sorted(f["id"] for f in summary["findings"])
+
+    expected = api_client.post("/v1/evaluate", json=sample_eval_request_dict).json()
+    assert summary["summary"] == expected["summary"]
+    assert summary["findings"] == expected["findings"]
+
+
+def test_stream_unknown_profile_is_404(api_client, sample_eval_request_dict):
+    body = dict(sample_eval_request_dict, profile_ref="does-not-exist@0.0.1")
+
+    assert api_client.post("/v1/evaluate:stream", json=body).status_code == 404
+
+
+def test_stream_setup_runs_off_the_event_loop(api_client, sample_eval_request_dict, monkeypatch):
+    on_loop = []
+
+    def spy(request):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return request_key(request)
+
+    monkeypatch.setattr(streaming, "request_key", spy)
+    body = dict(sample_eval_request_dict, context={"system_name": "Stream off loop"})
+
+    assert api_client.post("/v1/evaluate:stream", json=body).status_code == 200
+    assert on_loop == [False]
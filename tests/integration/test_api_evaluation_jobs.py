@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from services.policyengine_svc import jobs
+
+
+@pytest.fixture
+def job_runner(tmp_path, monkeypatch):
+    runner = jobs.JobRunner(jobs.JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+    monkeypatch.setattr(jobs, "_runner", runner)
+    yield runner
+    runner._pool.shutdown(wait=True)
+
+
+def _wait_for(api_client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = api_client.get(f"/v1/evaluations/{job_id}").json()
+        if job["status"] in jobs.FINISHED or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def test_async_evaluation_returns_job_and_result(api_client, sample_eval_request_dict, job_runner):
+    accepted = api_client.post("/v1/evaluations", json=sample_eval_request_dict)
+    assert accepted.status_code == 202
+    job_id = accepted.json()["id"]
+    assert accepted.headers["Location"] == f"/v1/evaluations/{job_id}"
+
+    job = _wait_for(api_client, job_id)
+    expected = api_client.post("/v1/evaluate", json=sample_eval_request_dict).json()
+
+    assert job["status"] == "succeeded"
+    assert job["result"]["summary"] == expected["summary"]
+
+
+def test_async_evaluation_reports_errors(api_client, sample_eval_request_dict, job_runner):
+    body = dict(sample_eval_request_dict, profile_ref="does-not-exist@0.0.1")
+    job_id = api_client.post("/v1/evaluations", json=body).json()["id"]
+
+    job = _wait_for(api_client, job_id)
+
+    assert job["status"] == "failed"
+    assert job["error"]["status"] == 404
+
+
+def test_cancel_and_unknown_job(api_client, sample_eval_request_dict, job_runner):
+    job_id = job_runner.store.create(jobs.EvalRequest.model_validate(sample_eval_request_dict))
+
+    cancelled = api_client.delete(f"/v1/evaluations/{job_id}")
+    assert cancelled.json() == {"id": job_id, "status": "cancelled"}
+    job_runner.submit(job_id)  # a cancelled job is never picked up
+    assert _wait_for(api_client, job_id)["status"] == "cancelled"
+
+    assert api_client.get("/v1/evaluations/nope").status_code == 404
+    assert api_client.delete("/v1/evaluations/nope").status_code == 404
@@ -0,0 +1,54 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from policyengine.models import EvalResponse
+from services.policyengine_svc.responses import FastJSONResponse
+
+
+def _large_response():
+    findings = [
+        {
+            "id": f"rule_{i}",
+            "title": "Überprüfung – ünïcödé ✓",
+            "severity": "high",
+            "status": "fail" if i % 2 else "pass",
+            "message": "m" * 50,
+            "data": {
+                "params": {"min": 0.1 * i, "nested": [1, None, True]},
+                "signals": {"X": 1e-7, "Y": 10**20},
+            },
+        }
+        for i in range(50)
+    ]
+    return EvalResponse.model_validate(
+        {
+            "profile_ref": "p@1",
+            "summary": {"score": 0.5, "verdict": "fail", "finding_count": 50, "profile_ref": "p@1"},
+            "findings": findings,
+        }
+    )
+
+
+def test_fast_response_matches_default_encoder():
+    model = _large_response()
+
+    fast = FastJSONResponse(model).body
+    default = JSONResponse(jsonable_encoder(model)).body
+
+    assert json.loads(fast) == json.loads(default)
+
+
+def test_evaluate_wire_format_is_unchanged(api_client, sample_eval_request_dict, monkeypatch):
+    request = dict(sample_eval_request_dict, context={"system_name": "Démo fast-json"})
+
+    monkeypatch.setenv("FAST_JSON_RESPONSES", "false")
+    default = api_client.post("/v1/evaluate", json=request)
+    monkeypatch.setenv("FAST_JSON_RESPONSES", "true")
+    fast = api_client.post("/v1/evaluate", json=request)
+
+    assert fast.status_code == default.status_code == 200
+    assert fast.headers["content-type"] == default.headers["content-type"]
+    assert fast.headers["ETag"] == default.headers["ETag"]
+    assert json.loads(fast.content) == json.loads(default.content)
@@ -0,0 +1,65 @@
+import pytest
+
+from services.policyengine_svc import evaluation, idempotency, result_cache
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = idempotency.IdempotencyStore()
+    monkeypatch.setattr(idempotency, "_store", store)
+    monkeypatch.setattr(result_cache, "_cache", None)
+    monkeypatch.setenv("RESULT_CACHE_TTL_SECONDS", "0")
+    return store
+
+
+def test_retry_with_idempotency_key_is_replayed(
+    api_client, sample_eval_request_dict, store, monkeypatch
+):
+    calls = []
+    run = evaluation.run_evaluation
+
+    def counting(request, key=None):
+        calls.append(request.profile_ref)
+        return run(request, key)
+
+    monkeypatch.setattr("services.policyengine_svc.main.run_evaluation", counting)
+    headers = {"Idempotency-Key": "retry-1"}
+
+    first = api_client.post("/v1/evaluate", json=sample_eval_request_dict, headers=headers)
+    retry = api_client.post("/v1/evaluate", json=sample_eval_request_dict, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert len(calls) == 1
+
+    changed = {**sample_eval_request_dict, "context": {"system_name": "Other"}}
+    assert api_client.post("/v1/evaluate", json=changed, headers=headers).status_code == 422
+    other_caller = {**headers, "X-Forwarded-For": "10.1.1.1"}
+    assert api_client.post("/v1/evaluate", json=changed, headers=other_caller).status_code == 200
+
+    stats = api_client.get("/v1/cache/stats").json()["idempotency"]
+    assert stats["replayed"] == 1 and stats["conflicts"] == 1
+
+
+def test_request_id_is_used_without_header(api_client, sample_eval_request_dict, store):
+    body = {**sample_eval_request_dict, "request_id": "sk-demo"}
+
+    assert "Idempotent-Replayed" not in api_client.post("/v1/evaluate", json=body).headers
+    assert api_client.post("/v1/evaluate", json=body).headers["Idempotent-Replayed"] == "true"
+    # A reused request_id with new content is a new evaluation, not a conflict.
+    changed = {**body, "context": {"system_name": "Other"}}
+    response = api_client.post("/v1/evaluate", json=changed)
+    assert response.status_code == 200 and "Idempotent-Replayed" not in response.headers
+
+
+def test_profile_edit_invalidates_stored_result(
+    api_client, sample_eval_request_dict, store, monkeypatch
+):
+    body = {**sample_eval_request_dict, "request_id": "sk-sys1"}
+    assert "Idempotent-Replayed" not in api_client.post("/v1/evaluate", json=body).headers
+
+    monkeypatch.setattr(idempotency, "profile_digest", lambda ref: "edited")
+    response = api_client.post("/v1/evaluate", json=body)
+    assert response.status_code == 200 and "Idempotent-Replayed" not in response.headers
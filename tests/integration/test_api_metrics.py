@@ -0,0 +1,27 @@
+def test_metrics_exposes_route_profile_and_rule_series(api_client, sample_eval_request_dict):
+    request = dict(
+        sample_eval_request_dict,
+        evidence={
+            "encryption": [
+                {"id": "ep-1", "url": "https://x", "tls_version": "1.3", "kms_key_ref": "kv/k"}
+            ]
+        },
+    )
+    assert api_client.post("/v1/evaluate", json=request).status_code == 200
+
+    resp = api_client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+
+    text = resp.text
+    assert (
+        "policyengine_http_request_duration_seconds_count"
+        '{method="POST",route="/v1/evaluate",status="200"}' in text
+    )
+    assert (
+        'policyengine_evaluation_duration_seconds_count{profile="iso_42001-global@1.2.0"}' in text
+    )
+    assert 'policyengine_rule_duration_seconds_count{engine_op="encryption_required"}' in text
+    assert "policyengine_result_cache_hit_ratio" in text
+    assert "policyengine_profile_cache_hit_ratio" in text
+    assert "policyengine_http_requests_in_flight" in text
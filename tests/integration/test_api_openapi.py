@@ -0,0 +1,12 @@
+def test_openapi_is_customized_and_revalidates(api_client):
+    response = api_client.get("/openapi.json")
+
+    assert response.status_code == 200
+    schema = response.json()
+    assert schema["info"]["x-logo"]["altText"] == "Fourth Industrial Systems"
+    assert "/v1/evaluate" in schema["paths"]
+    not_modified = api_client.get(
+        "/openapi.json", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert not_modified.status_code == 304
+    assert api_client.get("/docs").status_code == 200
@@ -0,0 +1,34 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from services.policyengine_svc import evaluation
+from services.policyengine_svc.main import app
+
+
+@pytest.fixture
+def process_client(monkeypatch):
+    monkeypatch.setenv("EXECUTION_BACKEND", "process")
+    monkeypatch.setenv("PROCESS_WORKERS", "2")
+    evaluation.shutdown_backend()
+    with TestClient(app) as client:
+        backend = evaluation.get_backend()
+        assert isinstance(backend, evaluation.ProcessPoolBackend)
+        assert backend.start_method == evaluation.DEFAULT_START_METHOD != "fork"
+        yield client
+    assert evaluation._backend is None
+
+
+def test_process_backend_matches_thread_backend(
+    process_client, api_client, sample_eval_request_dict
+):
+    in_process = process_client.post("/v1/evaluate", json=sample_eval_request_dict)
+    missing = process_client.post(
+        "/v1/evaluate", json=dict(sample_eval_request_dict, profile_ref="does_not_exist@0.0.1")
+    )
+    evaluation.shutdown_backend()
+    in_thread = api_client.post("/v1/evaluate", json=sample_eval_request_dict)
+
+    assert in_process.status_code == 200
+    assert in_process.json() == in_thread.json()
+    assert missing.status_code == 404
+    assert "does_not_exist" in missing.json()["detail"]
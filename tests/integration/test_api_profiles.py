@@ -0,0 +1,52 @@
+def test_list_profiles_filters_and_paginates(api_client):
+    resp = api_client.get("/v1/profiles", params={"standard": "ISO/IEC 42001"})
+    assert resp.status_code == 200
+    ids = [e["id"] for e in resp.json()["items"]]
+    assert "iso_42001-global" in ids
+
+    first = api_client.get("/v1/profiles", params={"limit": 2}).json()
+    assert len(first["items"]) == 2
+    second = api_client.get(
+        "/v1/profiles", params={"limit": 2, "cursor": first["next_cursor"]}
+    ).json()
+    assert second["items"][0]["id"] > first["items"][-1]["id"]
+
+    assert api_client.get("/v1/profiles", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_profile_lookup_with_etag(api_client):
+    resp = api_client.get("/v1/profiles/iso_42001-global@1.2.0")
+    assert resp.status_code == 200
+    assert resp.json()["evaluable"] is True
+    etag = resp.headers["ETag"]
+
+    cached = api_client.get("/v1/profiles/iso_42001-global", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    assert api_client.get("/v1/profiles/does_not_exist").status_code == 404
+
+
+def test_profile_lookup_checks_the_version(api_client):
+    assert api_client.get("/v1/profiles/iso_42001-global@latest").status_code == 200
+
+    resp = api_client.get("/v1/profiles/iso_42001-global@9.9.9")
+    assert resp.status_code == 404
+    assert "9.9.9" in resp.json()["detail"]
+
+
+def test_list_etag_conditional(api_client):
+    resp = api_client.get("/v1/profiles", params={"tag": "risk"})
+    etag = resp.headers["ETag"]
+
+    assert (
+        api_client.get(
+            "/v1/profiles", params={"tag": "risk"}, headers={"If-None-Match": etag}
+        ).status_code
+        == 304
+    )
+    assert (
+        api_client.get(
+            "/v1/profiles", params={"tag": "baseline"}, headers={"If-None-Match": etag}
+        ).status_code
+        == 200
+    )
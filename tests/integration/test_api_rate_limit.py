@@ -0,0 +1,32 @@
+from services.policyengine_svc import rate_limit
+
+
+def test_rate_limited_caller_gets_429(api_client, sample_eval_request_dict, monkeypatch):
+    monkeypatch.setattr(rate_limit, "_limiter", rate_limit.RateLimiter(rate=0.01, burst=2))
+    runaway = {"Ocp-Apim-Subscription-Key": "runaway-agent"}
+
+    statuses = [
+        api_client.post("/v1/evaluate", json=sample_eval_request_dict, headers=runaway)
+        for _ in range(3)
+    ]
+
+    assert [r.status_code for r in statuses] == [200, 200, 429]
+    assert int(statuses[-1].headers["Retry-After"]) >= 1
+    other = {"Ocp-Apim-Subscription-Key": "another-agent"}
+    assert (
+        api_client.post("/v1/evaluate", json=sample_eval_request_dict, headers=other).status_code
+        == 200
+    )
+
+    batch = api_client.post(
+        "/v1/evaluate:batch",
+        json=[sample_eval_request_dict] * 3,
+        headers={"X-Forwarded-For": "9.9.9.9"},
+    )
+    assert batch.status_code == 429  # charged for every item up front
+
+    stats = api_client.get("/v1/rate-limit/stats").json()["rate_limit"]
+    assert stats["rejected"] == 2
+    metrics = api_client.get("/metrics").text
+    assert 'policyengine_rate_limit_rejections_total{cost_class="default"}' in metrics
+    assert "9.9.9.9" not in metrics
@@ -0,0 +1,68 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from services.policyengine_svc import readiness
+from services.policyengine_svc.main import app
+
+
+def test_readyz_reports_ready_after_prewarm(monkeypatch):
+    monkeypatch.setenv("PREWARM_PROFILES", '["iso_42001-global@1.2.0", "does_not_exist@0.0.1"]')
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 10
+        resp = client.get("/readyz")
+        while resp.status_code == 503 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            resp = client.get("/readyz")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "ready"
+    assert data["profiles"] == ["iso_42001-global@1.2.0"]
+    assert data["skipped"] == ["does_not_exist@0.0.1"]
+    assert data["compiled_rules"] > 0
+    assert data["warmup_seconds"] >= 0
+
+
+def test_readyz_is_unavailable_before_prewarm(api_client, monkeypatch):
+    monkeypatch.setattr(readiness, "_state", readiness.WarmState())
+
+    resp = api_client.get("/readyz")
+
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "not_started"
+
+
+def test_prewarm_failures_do_not_block_readiness(monkeypatch):
+    def broken(profile):
+        raise SyntaxError("bad pass_criteria")
+
+    monkeypatch.setattr(readiness.registry, "compile_profile", broken)
+    state = readiness.prewarm(["iso_42001-global@1.2.0"], readiness.WarmState())
+    assert state.ready
+    assert state.skipped == ["iso_42001-global@1.2.0"]
+
+    def failing_preload():
+        raise OSError("profiles dir unreadable")
+
+    monkeypatch.setattr(readiness.registry, "preload", failing_preload)
+    state = readiness.prewarm((), readiness.WarmState())
+    assert state.ready
+    assert state.as_dict()["error"] == "OSError: profiles dir unreadable"
+
+
+def test_prewarm_skips_full_preload_with_a_snapshot(monkeypatch):
+    def unexpected_preload():
+        raise AssertionError("full preload with a snapshot attached")
+
+    monkeypatch.setattr(readiness.snapshot, "active", lambda: object())
+    monkeypatch.setattr(readiness.registry, "preload", unexpected_preload)
+
+    state = readiness.prewarm((), readiness.WarmState())
+    assert state.as_dict()["status"] == "ready"
+    assert state.as_dict()["snapshot"] is True
+    assert state.error is None
+
+    hot = readiness.prewarm(["iso_42001-global@1.2.0"], readiness.WarmState())
+    assert hot.profiles == ["iso_42001-global@1.2.0"]
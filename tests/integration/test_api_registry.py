@@ -0,0 +1,23 @@
+from services.policyengine_svc import reload
+
+
+def test_hot_reload_serves_evaluations_from_live_registry(
+    api_client, sample_eval_request_dict, monkeypatch
+):
+    assert api_client.get("/v1/registry/stats").json()["hot_reload"] is None
+
+    monkeypatch.setenv("HOT_RELOAD_ENABLED", "true")
+    monkeypatch.setenv("HOT_RELOAD_INTERVAL_SECONDS", "3600")
+    watcher = reload.start_watcher()
+    try:
+        stats = api_client.get("/v1/registry/stats").json()["hot_reload"]
+        assert stats["generation"] == 1
+        assert stats["profiles"] >= 1
+
+        response = api_client.post("/v1/evaluate", json=sample_eval_request_dict)
+        assert response.status_code == 200
+        assert watcher.check() is False
+    finally:
+        reload.stop_watcher()
+
+    assert api_client.get("/v1/registry/stats").json()["hot_reload"] is None
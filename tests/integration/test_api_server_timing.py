@@ -0,0 +1,15 @@
+def test_server_timing_header_and_debug_metadata(api_client, sample_eval_request_dict, monkeypatch):
+    request = dict(sample_eval_request_dict, context={"system_name": "Demo timing"})
+
+    resp = api_client.post("/v1/evaluate", json=request)
+    phases = [part.split(";")[0] for part in resp.headers["Server-Timing"].split(", ")]
+    assert {"profile", "rules", "scoring", "serialize", "total"} <= set(phases)
+    assert "timings" not in resp.json()["metadata"]
+
+    monkeypatch.setenv("DEBUG_RULE_TIMING", "true")
+    debug = api_client.post(
+        "/v1/evaluate", json=dict(request, context={"system_name": "Demo timing 2"})
+    )
+    timings = debug.json()["metadata"]["timings"]
+    assert "rules" in timings["phases_ms"]
+    assert {r["rule_id"] for r in timings["rules_ms"]} >= {"encryption", "lifecycle"}
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+
+from services.policyengine_svc import admission
+from services.policyengine_svc.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+)
+
+
+def test_queue_full_and_deadline_rejections():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_seconds=0.05)
+        await controller.acquire()
+
+        queued = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as full:
+            await controller.acquire()
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await queued
+        return controller, full.value, timed_out.value
+
+    controller, full, timed_out = asyncio.run(scenario())
+
+    assert full.status_code == 429
+    assert timed_out.status_code == 503
+    assert full.retry_after >= 1
+    stats = controller.stats()
+    assert stats["rejected_queue_full"] == 1
+    assert stats["rejected_timeout"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["active"] == 1
+
+
+def test_release_hands_slot_to_oldest_waiter():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout_seconds=5)
+        order = []
+        await controller.acquire()
+
+        async def waiter(name):
+            await controller.acquire()
+            order.append(name)
+            controller.release(0.01)
+
+        tasks = [asyncio.ensure_future(waiter(n)) for n in ("a", "b", "c")]
+        await asyncio.sleep(0)
+        assert controller.stats()["queue_depth"] == 3
+        controller.release(0.01)
+        await asyncio.gather(*tasks)
+        return controller, order
+
+    controller, order = asyncio.run(scenario())
+
+    assert order == ["a", "b", "c"]
+    assert controller.stats()["active"] == 0
+    assert controller.stats()["admitted"] == 4
+
+
+def test_thread_acquire_retries_until_admitted(monkeypatch):
+    monkeypatch.setattr(admission.time, "sleep", lambda seconds: None)
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(controller.acquire(), loop).result()
+        loop.call_later(0.05, controller.release, 0.01)
+
+        controller.acquire_from_thread(loop)  # rejected (queue of 0) until the slot is released
+        assert controller.stats()["active"] == 1
+        assert controller.stats()["rejected_queue_full"] >= 1
+
+        controller.release_from_thread(loop, 0.01)
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result()
+        assert controller.stats()["active"] == 0
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def test_middleware_matches_exact_paths():
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        await controller.acquire()  # saturated: an admitted path would be shed
+        admission._controller = controller
+        middleware = AdmissionMiddleware(app)
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        for path in ("/v1/evaluations/abc", "/v1/evaluate:batch", "/v1/evaluate"):
+            await middleware({"type": "http", "path": path}, None, send)
+        return sent
+
+    try:
+        sent = asyncio.run(scenario())
+    finally:
+        admission._controller = None
+
+    assert calls == ["/v1/evaluations/abc", "/v1/evaluate:batch"]
+    assert sent[0]["status"] == 429
@@ -0,0 +1,53 @@
+import pytest
+
+from policyengine.catalog import ProfileCatalog
+
+
+def _write(dir_, name, standards, tags, version="1.0.0"):
+    (dir_ / f"{name}.yaml").write_text(
+        f"profile_id: {name}\nversion: {version}\n"
+        f"metadata:\n  standards: {standards}\n  tags: {tags}\n"
+        "rules:\n  - id: encryption\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    _write(tmp_path, "a", ["ISO/IEC 42001"], ["ai", "risk"])
+    _write(tmp_path, "b", ["ISO/IEC 27001"], ["security"])
+    _write(tmp_path, "c", ["ISO/IEC 42001", "ISO/IEC 27001"], ["AI"])
+    (tmp_path / "legacy.yaml").write_text("profile: LEGACY\nincludes: []\n", encoding="utf-8")
+    (tmp_path / "junk.yaml").write_text("just a string\n", encoding="utf-8")
+    return ProfileCatalog.build(tmp_path)
+
+
+def test_build_lists_mappings_and_flags_evaluable(catalog):
+    assert len(catalog) == 4
+    assert catalog.get("a")["profile_ref"] == "a@1.0.0"
+    assert catalog.get("a")["rules"] == ["encryption"]
+    assert catalog.get("a")["evaluable"] is True
+    assert catalog.get("legacy")["evaluable"] is False
+    assert catalog.get("junk") is None
+
+
+def test_inverted_index_filters_are_case_insensitive_and_combined(catalog):
+    ids = lambda items: [e["id"] for e in items]  # noqa: E731
+
+    assert ids(catalog.query(standards=["iso/iec 42001"])[0]) == ["a", "c"]
+    assert ids(catalog.query(tags=["ai"])[0]) == ["a", "c"]
+    assert ids(catalog.query(standards=["ISO/IEC 27001"], tags=["ai"])[0]) == ["c"]
+    assert catalog.query(tags=["missing"])[0] == []
+
+
+def test_cursor_pagination_walks_every_entry_once(catalog):
+    seen, cursor = [], None
+    while True:
+        items, cursor = catalog.query(cursor=cursor, limit=3)
+        seen += [e["id"] for e in items]
+        if cursor is None:
+            break
+    assert seen == ["a", "b", "c", "legacy"]
+
+    with pytest.raises(ValueError):
+        catalog.query(cursor="%%%")
@@ -0,0 +1,47 @@
+import zlib
+
+from services.policyengine_svc.compression import (
+    CODECS,
+    negotiate_encoding,
+    parse_accept_encoding,
+    tag_etag,
+    untag_if_none_match,
+)
+
+PREFERENCE = ("br", "zstd", "gzip")
+
+
+def test_parse_accept_encoding_q_values():
+    assert parse_accept_encoding("gzip;q=0.5, br, identity;q=0") == {
+        "gzip": 0.5,
+        "br": 1.0,
+        "identity": 0.0,
+    }
+
+
+def test_negotiation_honours_q_values_and_availability():
+    assert negotiate_encoding(None, PREFERENCE) is None
+    assert negotiate_encoding("gzip", PREFERENCE) == "gzip"
+    assert negotiate_encoding("gzip;q=0", PREFERENCE) is None
+    assert negotiate_encoding("deflate", PREFERENCE) is None
+    assert negotiate_encoding("*", ("gzip",)) == "gzip"
+    # An unavailable codec is never chosen, whatever its q-value.
+    assert negotiate_encoding("snappy;q=1, gzip;q=0.1", ("snappy", "gzip")) == "gzip"
+
+
+def test_streaming_gzip_codec_round_trips():
+    codec = CODECS["gzip"][0](6)
+    chunks = [b'{"index": %d}\n' % i for i in range(100)]
+    encoded = b"".join(codec.chunk(c, final=False) for c in chunks) + codec.chunk(b"", final=True)
+
+    assert zlib.decompress(encoded, 16 + zlib.MAX_WBITS) == b"".join(chunks)
+
+
+def test_etags_are_tagged_per_encoding():
+    assert tag_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert tag_etag('W/"abc"', "br") == 'W/"abc-br"'
+    assert untag_if_none_match('"abc-gzip", W/"def-gzip"', "gzip") == (
+        '"abc", W/"def"',
+        True,
+    )
+    assert untag_if_none_match('"abc-br"', "gzip") == ('"abc-br"', False)
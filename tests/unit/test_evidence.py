@@ -0,0 +1,256 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from policyengine import evaluate, timing
+from policyengine.evidence import (
+    BlobBackend,
+    EvidenceBackend,
+    EvidenceResolver,
+    LocalFileBackend,
+    resolve,
+    resolve_evidence,
+)
+from policyengine.evidence_handles import (
+    EvidenceHandle,
+    EvidenceSet,
+    iter_projected,
+    iter_records,
+)
+from policyengine.exceptions import EvidenceResolutionError
+
+
+def _write(root, rel, payload):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _azurite_transport(blobs):
+    """Minimal Blob REST stand-in: container listing + blob GET."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/", 2)
+        if request.url.params.get("comp") == "list":
+            prefix = request.url.params.get("prefix", "")
+            names = "".join(
+                f"<Blob><Name>{n}</Name></Blob>" for n in sorted(blobs) if n.startswith(prefix)
+            )
+            body = f"<EnumerationResults><Blobs>{names}</Blobs><NextMarker/></EnumerationResults>"
+            return httpx.Response(200, content=body.encode())
+        name = parts[2] if len(parts) == 3 else ""
+        if name in blobs:
+            return httpx.Response(200, content=json.dumps(blobs[name]).encode())
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def test_resolve_mixed_specs_one_item_per_spec(tmp_path):
+    _write(tmp_path, "evidence/sys1/logs/a.json", {"n": 1})
+    _write(tmp_path, "evidence/sys1/logs/b.json", {"n": 2})
+    _write(tmp_path, "cards/model_card.json", {"name": "m"})
+
+    resolver = EvidenceResolver({"blob_uri": LocalFileBackend(tmp_path)})
+    specs = [
+        {"type": "inline", "payload": {"a": 1}},
+        {"type": "json", "payload": {"b": 2}},
+        {"type": "blob_uri", "uri": "cards/model_card.json"},
+        {"type": "blob_uri", "pattern": "evidence/sys1/logs/*.json"},
+        {"type": "purview", "uri": "purview://asset/id"},
+    ]
+
+    out = resolve(specs, resolver=resolver)
+
+    assert len(out) == len(specs)
+    assert all(isinstance(item, dict) and item for item in out)
+    assert out[0]["data"] == {"a": 1}
+    assert out[2]["data"] == {"name": "m"}
+    assert [i["data"]["n"] for i in out[3]["items"]] == [1, 2]
+    assert out[4]["status"] == "unsupported"
+
+
+def test_resolve_reports_errors_per_spec(tmp_path):
+    resolver = EvidenceResolver({"blob_uri": LocalFileBackend(tmp_path)})
+
+    out = resolve([{"type": "blob_uri", "uri": "missing.json"}], resolver=resolver)
+
+    assert "error" in out[0]
+    assert out[0]["uri"] == "missing.json"
+
+
+def test_local_backend_rejects_locations_outside_its_root(tmp_path):
+    root = tmp_path / "evidence"
+    _write(root, "ok.json", {"ok": True})
+    _write(tmp_path, "secret.json", {"secret": True})
+    (root / "link.json").symlink_to(tmp_path / "secret.json")
+    resolver = EvidenceResolver(
+        {"blob_uri": LocalFileBackend(root), "file": LocalFileBackend(root)}
+    )
+
+    out = resolve(
+        [
+            {"type": "blob_uri", "pattern": "../secret*"},
+            {"type": "json", "path": str(tmp_path / "secret.json")},
+            {"type": "blob_uri", "uri": "file:///etc/hostname"},
+            {"type": "blob_uri", "uri": "link.json"},
+            {"type": "blob_uri", "uri": "ok.json"},
+        ],
+        resolver=resolver,
+    )
+
+    assert all("PermissionError" in item["error"] for item in out[:4])
+    assert out[4]["data"] == {"ok": True}
+    lazy = EvidenceResolver({"file": LocalFileBackend(root)}, lazy=True)
+    assert (
+        "PermissionError"
+        in resolve([{"type": "json", "path": "../secret.json"}], resolver=lazy)[0]["error"]
+    )
+
+
+def test_resolve_evidence_replaces_specs_with_data(tmp_path):
+    _write(tmp_path, "logs/a.json", {"n": 1})
+    _write(tmp_path, "logs/b.json", {"n": 2})
+    resolver = EvidenceResolver({"blob_uri": LocalFileBackend(tmp_path)})
+    evidence = {
+        "logs": {"type": "blob_uri", "pattern": "logs/*.json"},
+        "card": [{"type": "inline", "payload": {"name": "m"}}],
+        "plain": {"type": "not-a-spec", "value": 1},
+    }
+
+    resolved = resolve_evidence(evidence, resolver=resolver)
+
+    assert resolved["logs"] == [{"n": 1}, {"n": 2}]
+    assert resolved["card"] == [{"name": "m"}]
+    assert resolved["plain"] == evidence["plain"]
+    with pytest.raises(EvidenceResolutionError):
+        resolve_evidence({"x": {"type": "blob_uri", "uri": "missing.json"}}, resolver=resolver)
+
+
+def test_unresolvable_path_spec_names_its_location(tmp_path):
+    resolver = EvidenceResolver({"file": LocalFileBackend(tmp_path)})
+
+    with pytest.raises(EvidenceResolutionError) as excinfo:
+        resolve_evidence({"x": {"type": "json", "path": "missing/card.json"}}, resolver=resolver)
+
+    assert excinfo.value.location == "missing/card.json"
+
+
+def test_pattern_spec_is_one_record_stream(tmp_path):
+    _write(tmp_path, "logs/a.json", [{"n": 1}, {"n": 2}])
+    _write(tmp_path, "logs/b.json", {"n": 3})
+    (tmp_path / "logs" / "c.ndjson").write_text('{"n": 4}\n{"n": 5}\n', encoding="utf-8")
+    resolver = EvidenceResolver({"blob_uri": LocalFileBackend(tmp_path)}, lazy=True)
+
+    resolved = resolve_evidence(
+        {"logs": {"type": "blob_uri", "pattern": "logs/*"}}, resolver=resolver
+    )
+
+    assert isinstance(resolved["logs"], EvidenceSet)
+    assert all(isinstance(v, EvidenceHandle) for v in resolved["logs"])
+    assert [r["n"] for r in iter_records(resolved["logs"])] == [1, 2, 3, 4, 5]
+    assert list(iter_projected(resolved["logs"], ["n"]))[-1] == {"n": 5}
+
+
+def test_evaluate_fetches_evidence_specs(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVIDENCE_ROOT", str(tmp_path))
+    rows = [{"id": "plain", "url": "http://plain", "kms_key_ref": "kv/k"}]
+    (tmp_path / "encryption.ndjson").write_text(
+        "\n".join(json.dumps(r) for r in rows), encoding="utf-8"
+    )
+    seen = {}
+
+    def spy(evidence):
+        seen.update(evidence)
+        return evidence
+
+    monkeypatch.setattr("policyengine.core.run_rules", lambda **kw: spy(kw["evidence"]) and [])
+    with timing.record() as timer:
+        evaluate(
+            profile_ref="iso_42001-global@1.2.0",
+            context={},
+            evidence={"encryption": {"type": "blob_uri", "uri": "encryption.ndjson"}},
+        )
+
+    assert isinstance(seen["encryption"], EvidenceHandle)
+    assert list(seen["encryption"]) == rows
+    assert "evidence" in timer.phases
+
+
+def test_blob_backend_expands_glob_against_azurite_api():
+    blobs = {
+        "evidence/sys1/logs/a.json": {"n": 1},
+        "evidence/sys1/logs/b.json": {"n": 2},
+        "evidence/sys1/docs/c.json": {"n": 3},
+    }
+    backend = BlobBackend(
+        "http://127.0.0.1:10000/devstoreaccount1", "evidence", transport=_azurite_transport(blobs)
+    )
+    resolver = EvidenceResolver({"blob_uri": backend})
+
+    out = resolve([{"type": "blob_uri", "pattern": "evidence/sys1/logs/*.json"}], resolver=resolver)
+
+    assert [i["uri"] for i in out[0]["items"]] == [
+        "evidence/sys1/logs/a.json",
+        "evidence/sys1/logs/b.json",
+    ]
+
+
+def test_blob_backend_never_sends_sas_outside_its_container():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=b"{}")
+
+    backend = BlobBackend(
+        "http://127.0.0.1:10000/devstoreaccount1",
+        "evidence",
+        sas_token="sv=2021&sig=secret",
+        transport=httpx.MockTransport(handler),
+    )
+    resolver = EvidenceResolver({"blob_uri": backend})
+    foreign = [
+        "https://attacker.example/devstoreaccount1/evidence/card.json",
+        "http://127.0.0.1:10000/devstoreaccount1/other/card.json",
+        "http://127.0.0.1:10000/devstoreaccount1/evidence/../other/card.json",
+        "http://127.0.0.1:10000/devstoreaccount1/evidence/%2e%2e/other/card.json",
+    ]
+
+    out = resolve([{"type": "blob_uri", "uri": u} for u in foreign], resolver=resolver)
+
+    assert all("PermissionError" in item["error"] for item in out)
+    assert requests == []
+    with pytest.raises(EvidenceResolutionError):
+        resolve_evidence({"x": {"type": "blob_uri", "uri": foreign[0]}}, resolver=resolver)
+
+    inside = "http://127.0.0.1:10000/devstoreaccount1/evidence/sys1/card.json"
+    assert resolve([{"type": "blob_uri", "uri": inside}], resolver=resolver)[0]["data"] == {}
+    assert [r.url.host for r in requests] == ["127.0.0.1"]
+    assert requests[0].url.path == "/devstoreaccount1/evidence/sys1/card.json"
+    assert requests[0].url.params["sig"] == "secret"
+
+
+def test_resolver_bounds_concurrency():
+    class SlowBackend(EvidenceBackend):
+        in_flight = 0
+        peak = 0
+
+        async def list(self, pattern):
+            return [f"f{i}.json" for i in range(20)]
+
+        async def read(self, location):
+            SlowBackend.in_flight += 1
+            SlowBackend.peak = max(SlowBackend.peak, SlowBackend.in_flight)
+            await asyncio.sleep(0.01)
+            SlowBackend.in_flight -= 1
+            return b"{}"
+
+    resolver = EvidenceResolver({"blob_uri": SlowBackend(max_concurrency=10)}, concurrency=4)
+
+    out = resolve([{"type": "blob_uri", "pattern": "*.json"}], resolver=resolver)
+
+    assert len(out[0]["items"]) == 20
+    assert SlowBackend.peak == 4
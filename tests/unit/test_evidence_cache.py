@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import threading
+
+import httpx
+
+from policyengine.evidence import BlobBackend, EvidenceResolver, resolve
+from policyengine.evidence_cache import EvidenceCache
+
+
+def test_put_get_is_content_addressed(tmp_path):
+    cache = EvidenceCache(tmp_path)
+
+    digest = cache.put(b'{"suppliers": []}')
+
+    assert digest == EvidenceCache.digest(b'{"suppliers": []}')
+    assert cache.put(b'{"suppliers": []}') == digest
+    assert cache.get(digest) == b'{"suppliers": []}'
+    assert cache.get("0" * 64) is None
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_lru_eviction_under_size_cap(tmp_path):
+    cache = EvidenceCache(tmp_path, max_bytes=250)
+    a = cache.put(b"a" * 100)
+    b = cache.put(b"b" * 100)
+    # Make "a" the most recently used, regardless of filesystem timestamp granularity.
+    os.utime(cache._object_path(b), ns=(1, 1))
+    cache.get(a)
+
+    cache.put(b"c" * 100)
+
+    assert cache.get(b) is None
+    assert cache.get(a) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_blob_backend_revalidates_with_etag(tmp_path):
+    body = json.dumps({"models": ["gpt-4o"]}).encode()
+    served = {"full": 0, "not_modified": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            served["not_modified"] += 1
+            return httpx.Response(304)
+        served["full"] += 1
+        return httpx.Response(200, content=body, headers={"ETag": '"v1"'})
+
+    cache = EvidenceCache(tmp_path)
+    backend = BlobBackend(
+        "http://127.0.0.1:10000/devstoreaccount1",
+        "evidence",
+        transport=httpx.MockTransport(handler),
+        cache=cache,
+    )
+    resolver = EvidenceResolver({"blob_uri": backend})
+    spec = [{"type": "blob_uri", "uri": "inventory/models.json"}]
+
+    first = resolve(spec, resolver=resolver)
+    second = resolve(spec, resolver=resolver)
+
+    assert first[0]["data"] == second[0]["data"] == {"models": ["gpt-4o"]}
+    assert served == {"full": 1, "not_modified": 1}
+    assert cache.stats()["hits"] == 1
+
+
+def test_refs_count_toward_the_size_cap_and_are_evicted(tmp_path):
+    cache = EvidenceCache(tmp_path, max_bytes=2_000)
+    for i in range(50):
+        cache.store(f"https://blob/{i}.json", b"same payload")
+
+    refs = list((tmp_path / "refs").iterdir())
+    assert 0 < len(refs) < 50
+    assert cache.stats()["bytes"] <= 2_000
+    assert cache.lookup("https://blob/49.json") == (None, b"same payload")
+
+
+def test_stale_tmp_files_are_removed(tmp_path):
+    EvidenceCache(tmp_path)
+    stale, fresh = tmp_path / "tmp" / "stale", tmp_path / "tmp" / "fresh"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"in progress")
+    os.utime(stale, (1, 1))
+
+    EvidenceCache(tmp_path)
+
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_changed_blob_counts_as_a_miss(tmp_path):
+    versions = iter([(b'{"v": 1}', '"v1"'), (b'{"v": 2}', '"v2"')])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        content, etag = next(versions)
+        return httpx.Response(200, content=content, headers={"ETag": etag})
+
+    cache = EvidenceCache(tmp_path)
+    backend = BlobBackend(
+        "http://127.0.0.1:10000/devstoreaccount1",
+        "evidence",
+        transport=httpx.MockTransport(handler),
+        cache=cache,
+    )
+    resolver = EvidenceResolver({"blob_uri": backend})
+    spec = [{"type": "blob_uri", "uri": "inventory/models.json"}]
+
+    resolve(spec, resolver=resolver)
+    assert resolve(spec, resolver=resolver)[0]["data"] == {"v": 2}
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["misses"] == 2
+
+
+def test_aclose_closes_clients_of_every_loop():
+    backend = BlobBackend("http://127.0.0.1:10000/devstoreaccount1", "evidence")
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+
+        async def make_client():
+            return backend._client()
+
+        other_client = asyncio.run_coroutine_threadsafe(make_client(), other).result()
+
+        async def close_from_here():
+            own = backend._client()
+            await backend.aclose()
+            return own
+
+        own_client = asyncio.run(close_from_here())
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
+
+    assert own_client.is_closed and other_client.is_closed
@@ -0,0 +1,90 @@
+import json
+import tracemalloc
+
+from policyengine.evidence import EvidenceResolver, LocalFileBackend, resolve
+from policyengine.evidence_handles import EvidenceHandle, iter_records
+from policyengine.rules_engine import evaluate_rule
+
+
+def _records(n):
+    return [
+        {
+            "id": f"ep-{i}",
+            "scheme": "https",
+            "tls_version": "1.2",
+            "kms_key_ref": "kv/k",
+            "notes": "x" * 40,
+            "score": i / 3,
+        }
+        for i in range(n)
+    ]
+
+
+def test_json_array_streams_across_chunk_boundaries(tmp_path):
+    records = _records(500)
+    path = tmp_path / "inventory.json"
+    path.write_text(json.dumps(records, indent=1), encoding="utf-8")
+
+    handle = EvidenceHandle(path, chunk_size=97)
+
+    assert list(handle.iter_records()) == records
+    assert handle.load() == records
+
+
+def test_ndjson_and_field_projection(tmp_path):
+    path = tmp_path / "inventory.ndjson"
+    path.write_text("\n".join(json.dumps(r) for r in _records(10)) + "\n", encoding="utf-8")
+
+    rows = list(EvidenceHandle(path).iter_fields("id", "tls_version", "missing.field"))
+
+    assert rows[3] == {"id": "ep-3", "tls_version": "1.2", "missing.field": None}
+
+
+def test_json_object_is_single_record(tmp_path):
+    path = tmp_path / "card.json"
+    path.write_text(json.dumps({"name": "m"}), encoding="utf-8")
+
+    assert list(iter_records(EvidenceHandle(path))) == [{"name": "m"}]
+
+
+def test_streaming_memory_stays_within_budget(tmp_path):
+    path = tmp_path / "large.json"
+    path.write_text(json.dumps(_records(60_000)), encoding="utf-8")
+    assert path.stat().st_size > 5_000_000
+
+    handle = EvidenceHandle(path, chunk_size=64 * 1024)
+    tracemalloc.start()
+    count = sum(1 for _ in handle.iter_fields("id"))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == 60_000
+    assert peak < 1_000_000
+
+
+def test_ops_accept_handles(tmp_path):
+    path = tmp_path / "encryption.ndjson"
+    rows = _records(3) + [{"id": "plain", "url": "http://plain", "kms_key_ref": "kv/k"}]
+    path.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+
+    finding = evaluate_rule(
+        rule_id="encryption",
+        params={"severity": "high", "title": "Encryption"},
+        context={"system_id": "sys-1"},
+        evidence={"encryption": EvidenceHandle(path)},
+    )
+
+    assert finding.status == "fail"
+    assert finding.data["signals"]["HTTP_ENDPOINTS"] == ["plain"]
+
+
+def test_lazy_resolver_returns_handles(tmp_path):
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "a.json").write_text("[1, 2]", encoding="utf-8")
+    resolver = EvidenceResolver({"blob_uri": LocalFileBackend(tmp_path)}, lazy=True)
+
+    out = resolve([{"type": "blob_uri", "pattern": "logs/*.json"}], resolver=resolver)
+
+    handle = out[0]["items"][0]["data"]
+    assert isinstance(handle, EvidenceHandle)
+    assert list(handle) == [1, 2]
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from policyengine import hot_reload, profiles, rules_catalog
+from policyengine.exceptions import ProfileNotFoundError
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    # Force a distinct mtime even on coarse-grained filesystems.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    profiles_dir, rules_dir = tmp_path / "profiles", tmp_path / "rules"
+    profiles_dir.mkdir()
+    rules_dir.mkdir()
+    _write(profiles_dir / "p.yaml", "profile_id: p\nversion: '1'\nrules:\n  - id: r\n")
+    _write(profiles_dir / "q.yaml", "profile_id: q\nversion: '1'\n")
+    _write(profiles_dir / "broken.yaml", "profile_id: [unclosed\n")
+    _write(rules_dir / "r.yaml", "rule_id: r\nengine_op: none\noutputs:\n  pass_criteria: X > 1\n")
+    yield profiles_dir, rules_dir
+    hot_reload.install(None)
+
+
+def test_lookups_come_from_the_live_registry(dirs):
+    profiles_dir, rules_dir = dirs
+    hot_reload.install(hot_reload.build_registry(profiles_dir, rules_dir))
+    (profiles_dir / "p.yaml").unlink()  # no filesystem access per lookup
+
+    assert profiles.load_profile_by_ref("p@1").profile_id == "p"
+    assert profiles.profile_digest("p@1") is not None
+    assert rules_catalog.load_rule_definition("r").pass_criteria == "X > 1"
+    with pytest.raises(ProfileNotFoundError):
+        profiles.load_profile_by_ref("missing@1")
+    with pytest.raises(Exception):
+        profiles.load_profile_by_ref("broken@1")
+
+
+def test_watcher_swaps_copy_on_write(dirs):
+    profiles_dir, rules_dir = dirs
+    watcher = hot_reload.RegistryWatcher(3600, profiles_dir, rules_dir)
+    old = watcher.start()
+    try:
+        assert watcher.check() is False
+
+        _write(profiles_dir / "p.yaml", "profile_id: p\nversion: '2'\n")
+        assert watcher.check() is True
+    finally:
+        watcher.stop()
+
+    new = hot_reload.current()
+    assert new.generation == old.generation + 1
+    assert new.profiles["q"] is old.profiles["q"]  # unchanged entries are shared
+    assert profiles.load_profile_by_ref("p@2").version == "2"
+
+
+def test_pinned_evaluation_keeps_its_registry(dirs):
+    profiles_dir, rules_dir = dirs
+    old = hot_reload.build_registry(profiles_dir, rules_dir)
+    hot_reload.install(old)
+
+    with hot_reload.pinned():
+        _write(profiles_dir / "p.yaml", "profile_id: p\nversion: '2'\n")
+        hot_reload.install(hot_reload.build_registry(profiles_dir, rules_dir, previous=old))
+        assert profiles.load_profile_by_ref("p").version == "1"
+
+    assert profiles.load_profile_by_ref("p").version == "2"
+
+
+def test_rule_edits_are_seen_without_the_live_registry(dirs, monkeypatch):
+    # Process-pool workers have no live registry and rely on (path, mtime) keys.
+    _, rules_dir = dirs
+    monkeypatch.setattr(rules_catalog, "RULES_DIR", rules_dir)
+    assert rules_catalog.load_rule_definition("r").pass_criteria == "X > 1"
+
+    _write(rules_dir / "r.yaml", "rule_id: r\nengine_op: none\noutputs:\n  pass_criteria: X > 2\n")
+    assert rules_catalog.load_rule_definition("r").pass_criteria == "X > 2"
+
+    (rules_dir / "r.yaml").unlink()
+    assert rules_catalog.load_rule_definition("r") is None
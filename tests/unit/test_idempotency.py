@@ -0,0 +1,153 @@
+import os
+import threading
+
+import pytest
+
+from policyengine.models import EvalRequest, EvalResponse, Summary
+from services.policyengine_svc.idempotency import (
+    IdempotencyConflict,
+    IdempotencyStore,
+    request_fingerprint,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _response(score=1.0):
+    summary = Summary(score=score, verdict="pass", finding_count=0, profile_ref="p@1.0.0")
+    return EvalResponse(profile_ref="p@1.0.0", summary=summary)
+
+
+def test_duplicate_is_replayed_until_ttl_expires():
+    clock = FakeClock()
+    store = IdempotencyStore(ttl_seconds=60, clock=clock)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return _response(1 / len(calls))
+
+    first, replayed = store.run("k", "fp", fn)
+    assert replayed is False
+    again, replayed = store.run("k", "fp", fn)
+    assert replayed is True and again is first
+    clock.now += 61
+    assert store.run("k", "fp", fn) == (_response(0.5), False)
+    assert store.stats()["executed"] == 2 and store.stats()["replayed"] == 1
+
+
+def test_different_content_conflicts_only_when_strict():
+    store = IdempotencyStore()
+    store.run("k", "fp-1", _response)
+
+    with pytest.raises(IdempotencyConflict):
+        store.run("k", "fp-2", _response)
+    assert store.run("k", "fp-2", lambda: _response(0.5), strict=False) == (_response(0.5), False)
+    assert store.run("k", "fp-2", _response)[1] is True
+    assert store.stats()["conflicts"] == 1
+
+
+def test_failures_are_not_stored():
+    store = IdempotencyStore()
+
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        store.run("k", "fp", boom)
+    assert store.run("k", "fp", _response) == (_response(), False)
+
+
+def test_concurrent_duplicate_attaches_to_running_evaluation():
+    store = IdempotencyStore()
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return _response()
+
+    owner = threading.Thread(target=lambda: results.append(store.run("k", "fp", slow)))
+    owner.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(store.run("k", "fp", _response)))
+    waiter.start()
+    while store.stats()["attached"] == 0:
+        pass
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+
+    assert sorted(replayed for _, replayed in results) == [False, True]
+    assert store.stats()["executed"] == 1
+
+
+def test_result_from_an_older_registry_is_recomputed():
+    store = IdempotencyStore()
+    store.run("k", "fp", _response, version="v1")
+
+    assert store.run("k", "fp", lambda: _response(0.5), version="v2") == (_response(0.5), False)
+    assert store.run("k", "fp", _response, version="v2")[1] is True
+    store.clear()
+    assert store.run("k", "fp", _response, version="v2")[1] is False
+
+
+def test_waiter_gives_up_after_wait_timeout():
+    store = IdempotencyStore(wait_timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+
+    def hung():
+        started.set()
+        release.wait(5)
+        return _response()
+
+    owner = threading.Thread(target=store.run, args=("k", "fp", hung))
+    owner.start()
+    started.wait(5)
+    with pytest.raises(TimeoutError):
+        store.run("k", "fp", _response)
+    release.set()
+    owner.join(5)
+    assert store.stats()["timeouts"] == 1
+
+
+def test_oldest_completed_entries_are_evicted():
+    store = IdempotencyStore(max_entries=2)
+    for key in ("a", "b", "c"):
+        store.run(key, "fp", _response)
+
+    assert store.stats()["entries"] == 2
+    assert store.run("a", "fp", _response)[1] is False
+    assert store.run("c", "fp", _response)[1] is True
+
+
+def test_fingerprint_ignores_request_id_and_control_order():
+    a = EvalRequest(profile_ref="p@1", evidence={"x": 1}, controls=["b", "a"], request_id="r1")
+    b = EvalRequest(profile_ref="p@1", evidence={"x": 1}, controls=["a", "b"], request_id="r2")
+
+    assert request_fingerprint(a) == request_fingerprint(b)
+    assert request_fingerprint(a) != request_fingerprint(
+        a.model_copy(update={"evidence": {"x": 2}})
+    )
+
+
+def test_fingerprint_follows_evidence_behind_a_spec(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVIDENCE_ROOT", str(tmp_path))
+    card = tmp_path / "card.json"
+    card.write_text('{"name": "m1"}', encoding="utf-8")
+    request = EvalRequest(
+        profile_ref="p@1", evidence={"card": {"type": "blob_uri", "uri": "card.json"}}
+    )
+    fingerprint = request_fingerprint(request)
+
+    card.write_text('{"name": "m2"}', encoding="utf-8")
+    os.utime(card, ns=(card.stat().st_atime_ns, card.stat().st_mtime_ns + 10**9))
+
+    assert request_fingerprint(request) != fingerprint
@@ -0,0 +1,156 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pytest
+
+from policyengine.models import EvalRequest
+from services.policyengine_svc import jobs
+
+
+def _request(**overrides):
+    data = {
+        "profile_ref": "iso_42001-global@1.2.0",
+        "context": {"system_id": "demo"},
+        "evidence": {},
+    }
+    data.update(overrides)
+    return EvalRequest.model_validate(data)
+
+
+def test_job_lifecycle_is_persisted(tmp_path):
+    store = jobs.JobStore(tmp_path / "jobs.sqlite3")
+    job_id = store.create(_request())
+
+    assert store.get(job_id)["status"] == jobs.QUEUED
+    assert store.claim(job_id).profile_ref == "iso_42001-global@1.2.0"
+    assert store.claim(job_id) is None  # already running
+
+    store.finish(job_id, jobs.SUCCEEDED, result='{"ok": true}', status_code=200)
+
+    reopened = jobs.JobStore(tmp_path / "jobs.sqlite3").get(job_id)
+    assert reopened["status"] == jobs.SUCCEEDED
+    assert reopened["result"] == '{"ok": true}'
+    assert reopened["finished_at"] >= reopened["started_at"]
+
+
+def test_journal_mode_for_network_shares(tmp_path):
+    store = jobs.JobStore(tmp_path / "jobs.sqlite3", journal_mode="delete")
+    store.create(_request())
+
+    with closing(store._connect()) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert not (tmp_path / "jobs.sqlite3-wal").exists()
+    with pytest.raises(ValueError):
+        jobs.JobStore(tmp_path / "other.sqlite3", journal_mode="WAL; DROP TABLE jobs")
+
+
+def test_cancel_queued_and_running(tmp_path):
+    store = jobs.JobStore(tmp_path / "jobs.sqlite3")
+    queued, running = store.create(_request()), store.create(_request())
+    store.claim(running)
+
+    assert store.cancel(queued) == jobs.CANCELLED
+    assert store.claim(queued) is None
+    assert store.cancel(running) == jobs.RUNNING
+    store.finish(running, jobs.SUCCEEDED, result="{}", status_code=200)
+
+    job = store.get(running)
+    assert job["status"] == jobs.CANCELLED
+    assert job["result"] is None
+    assert store.cancel("missing") is None
+
+
+def test_unfinished_jobs_are_resumed_after_restart(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    store = jobs.JobStore(path)
+    interrupted, waiting, done = (
+        store.create(_request()),
+        store.create(_request()),
+        store.create(_request()),
+    )
+    store.claim(interrupted)
+    store.claim(done)
+    store.finish(done, jobs.SUCCEEDED, result="{}", status_code=200)
+
+    # The interrupted job's owner is gone: its heartbeat is older than the stale limit.
+    time.sleep(0.02)
+    assert list(jobs.JobStore(path).requeue_unfinished(0.01)) == [interrupted, waiting]
+    assert store.get(interrupted)["status"] == jobs.QUEUED
+    assert store.get(interrupted)["owner"] is None
+
+
+def test_jobs_of_live_owners_are_not_requeued(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    live, dead = jobs.JobStore(path, owner="live"), jobs.JobStore(path, owner="dead")
+    mine, orphaned = live.create(_request()), dead.create(_request())
+    live.claim(mine)
+    dead.claim(orphaned)
+    time.sleep(0.05)
+    live.heartbeat()
+
+    starting = jobs.JobStore(path, owner="new")
+    assert list(starting.requeue_unfinished(0.04)) == [orphaned]
+    assert starting.get(mine)["status"] == jobs.RUNNING
+
+    # The dead owner's late result is discarded; the new claimant finishes it.
+    starting.claim(orphaned)
+    dead.finish(orphaned, jobs.SUCCEEDED, result='{"stale": true}', status_code=200)
+    assert starting.get(orphaned)["status"] == jobs.RUNNING
+    starting.finish(orphaned, jobs.SUCCEEDED, result="{}", status_code=200)
+    assert starting.get(orphaned)["result"] == "{}"
+
+
+class _Response(dict):
+    def model_dump_json(self):
+        return json.dumps(self)
+
+
+def test_runner_records_success_and_failure(tmp_path, monkeypatch):
+    finished = threading.Semaphore(0)
+
+    def fake_run_evaluation(request):
+        try:
+            if request.profile_ref.startswith("missing"):
+                raise jobs.HTTPException(status_code=404, detail="Profile not found: missing")
+            return _Response(profile_ref=request.profile_ref)
+        finally:
+            finished.release()
+
+    monkeypatch.setattr(jobs, "run_evaluation", fake_run_evaluation)
+    runner = jobs.JobRunner(jobs.JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+    try:
+        ok, bad = runner.store.create(_request()), runner.store.create(
+            _request(profile_ref="missing@1")
+        )
+        runner.submit(ok)
+        runner.submit(bad)
+        assert finished.acquire(timeout=5) and finished.acquire(timeout=5)
+    finally:
+        runner._pool.shutdown(wait=True)
+
+    assert jobs._job_document(runner.store.get(ok))["result"] == {
+        "profile_ref": "iso_42001-global@1.2.0"
+    }
+    assert jobs._job_document(runner.store.get(bad))["error"] == {
+        "status": 404,
+        "detail": "Profile not found: missing",
+    }
+
+
+def test_store_migrates_databases_without_owner_columns(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    with closing(sqlite3.connect(path)) as conn:
+        conn.executescript(
+            "CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, request TEXT NOT NULL, "
+            "result TEXT, error TEXT, status_code INTEGER, "
+            "cancel_requested INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+            "started_at REAL, finished_at REAL);"
+        )
+
+    store = jobs.JobStore(path)
+    job_id = store.create(_request())
+    store.claim(job_id)
+    assert store.get(job_id)["owner"] == store.owner
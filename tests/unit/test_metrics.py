@@ -0,0 +1,19 @@
+from services.policyengine_svc.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = registry.histogram("op_seconds", "Op time.", ("engine_op",), buckets=(0.1, 1.0))
+    hist.observe(0.05, "enc")
+    hist.observe(0.5, "enc")
+    hist.observe(5, "enc")
+    registry.counter("reads_total", "Reads.").inc(amount=3)
+
+    text = registry.render()
+
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{engine_op="enc",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{engine_op="enc",le="1"} 2' in text
+    assert 'op_seconds_bucket{engine_op="enc",le="+Inf"} 3' in text
+    assert 'op_seconds_count{engine_op="enc"} 3' in text
+    assert "reads_total 3" in text
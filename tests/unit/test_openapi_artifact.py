@@ -0,0 +1,50 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.policyengine_svc.openapi_overrides import (
+    apply_openapi_overrides,
+    serve_openapi,
+    write_openapi_artifact,
+)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping() -> dict:
+        return {"ok": True}
+
+    apply_openapi_overrides(app)
+    return app
+
+
+def test_artifact_is_served_without_generating_the_schema(tmp_path):
+    path = tmp_path / "openapi.json"
+    etag = write_openapi_artifact(_app(), path)
+    assert "x-logo" in json.loads(path.read_bytes())["info"]
+
+    app = _app()
+    serve_openapi(app, str(path))
+    client = TestClient(app)
+    response = client.get("/openapi.json")
+
+    assert response.content == path.read_bytes()
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert client.get("/openapi.json", headers={"If-None-Match": etag}).status_code == 304
+    assert app.openapi_schema is None
+
+
+def test_schema_is_generated_lazily_without_artifact(tmp_path):
+    app = _app()
+    serve_openapi(app, str(tmp_path / "missing.json"))
+    assert app.openapi_schema is None
+
+    response = TestClient(app).get("/openapi.json")
+
+    assert response.status_code == 200
+    assert "/ping" in response.json()["paths"]
+    assert app.openapi_schema is not None
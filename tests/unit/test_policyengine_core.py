@@ -1,10 +1,14 @@
+import time
 from pathlib import Path
 
 import yaml
 import pytest
 
 import policyengine.profiles as pe_profiles
-from policyengine import evaluate
+from policyengine import core, evaluate, evaluate_stream, rules_engine
+from policyengine.exceptions import ProfileNotFoundError
+from policyengine.models import Finding
+from policyengine.schema import PolicyProfile
 
 
 def test_evaluate_returns_summary_and_findings(monkeypatch, data_profiles_dir: Path):
@@ -28,3 +32,34 @@ def test_evaluate_returns_summary_and_findings(monkeypatch, data_profiles_dir: P
     assert summary["verdict"] in ("pass", "warn", "fail")
     assert isinstance(findings, list)
     assert len(findings) >= 1
+
+
+def test_evaluate_stream_yields_findings_in_completion_order(monkeypatch):
+    profile = PolicyProfile.model_validate(
+        {
+            "profile_id": "p",
+            "version": "1",
+            "rules": [{"id": "slow"}, {"id": "fast"}, {"id": "skip"}],
+        }
+    )
+    monkeypatch.setattr(core, "load_profile_by_ref", lambda ref: profile)
+
+    def fake_rule(rule_id, params, context, evidence):
+        if rule_id == "skip":
+            return None
+        time.sleep(0.2 if rule_id == "slow" else 0.0)
+        return Finding(id=rule_id, title=rule_id, severity="low", status="pass", message="ok")
+
+    monkeypatch.setattr(rules_engine, "evaluate_rule", fake_rule)
+
+    events = list(core.evaluate_stream("p@1", {}, {}, max_workers=3))
+
+    assert [(e, f.id) for e, f in events[:-1]] == [("finding", "fast"), ("finding", "slow")]
+    event, result = events[-1]
+    assert event == "summary"
+    assert [f.id for f in result["findings"]] == ["slow", "fast"]
+
+
+def test_evaluate_stream_raises_profile_errors_eagerly():
+    with pytest.raises(ProfileNotFoundError):
+        evaluate_stream("does-not-exist@0.0.1", {}, {})
@@ -0,0 +1,79 @@
+import base64
+import json
+import math
+
+from starlette.requests import Request
+
+from services.policyengine_svc.rate_limit import RateLimiter, caller_id, cost_class
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _request(headers=None, client=("10.0.0.9", 1234)):
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw, "client": client})
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2.0, burst=3, clock=clock)
+
+    assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("a") == 0.5  # one token short at 2 tokens/s
+    assert limiter.acquire("b") == 0.0  # callers are independent
+
+    clock.now += 0.5
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("a", cost=5) == math.inf
+
+    stats = limiter.stats()
+    assert stats["allowed"] == 5
+    assert stats["top_rejected"][0] == {"caller": "a", "rejected": 2}
+
+
+def test_idle_full_buckets_are_swept():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=1.0, burst=1, max_callers=2, clock=clock)
+    limiter.acquire("a")
+    limiter.acquire("b")
+    clock.now += 10
+
+    limiter.acquire("c")
+
+    assert limiter.stats()["callers"] == 1
+
+
+def test_caller_identity_preference():
+    claims = base64.urlsafe_b64encode(json.dumps({"sub": "agent-7"}).encode()).decode().rstrip("=")
+
+    assert caller_id(_request({"Ocp-Apim-Subscription-Key": "secret"})).startswith("sub:")
+    assert "secret" not in caller_id(_request({"Ocp-Apim-Subscription-Key": "secret"}))
+    bearer = _request({"Authorization": f"Bearer h.{claims}.s"})
+    assert caller_id(bearer, trust_bearer=True) == "bearer:agent-7"
+    assert caller_id(bearer) == "ip:10.0.0.9"  # unverified sub is ignored by default
+    assert caller_id(_request({"Authorization": "Bearer opaque"}), trust_bearer=True).startswith(
+        "bearer:"
+    )
+    assert caller_id(_request()) == "ip:10.0.0.9"
+
+
+def test_forwarded_for_uses_the_hop_added_by_trusted_proxies():
+    spoofed = _request({"X-Forwarded-For": "6.6.6.6, 1.2.3.4"})
+
+    assert caller_id(spoofed) == "ip:1.2.3.4"  # the ingress appended 1.2.3.4
+    assert caller_id(spoofed, trusted_proxies=2) == "ip:6.6.6.6"
+    assert caller_id(spoofed, trusted_proxies=0) == "ip:10.0.0.9"
+    assert caller_id(_request({"X-Forwarded-For": "1.2.3.4"}), trusted_proxies=2) == "ip:10.0.0.9"
+
+
+def test_cost_class_by_profile_id():
+    classes = {"nist_800-53-fedramp-moderate": "heavy"}
+
+    assert cost_class("nist_800-53-fedramp-moderate@1.0.0", classes) == "heavy"
+    assert cost_class("iso_42001-global", classes) == "default"
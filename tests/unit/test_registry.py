@@ -0,0 +1,36 @@
+from policyengine import profiles, registry
+from policyengine.rules_catalog import compile_pass_criteria
+
+
+def test_preload_parses_profiles_and_compiles_rules(data_profiles_dir):
+    result = registry.preload(data_profiles_dir)
+
+    assert "iso_42001-global@1.2.0" in result["profiles"]
+    assert "malformed" in result["skipped"]
+
+    profiles._parse_profile.cache_clear()
+    profile = profiles.load_profile_file(data_profiles_dir / "iso_42001-global.yaml")
+    assert profiles.load_profile_file(data_profiles_dir / "iso_42001-global.yaml") is profile
+    assert registry.compile_profile(profile) == result["compiled_rules"]
+
+
+def test_compile_profile_warms_pass_criteria(data_profiles_dir):
+    profile = profiles.load_profile_file(data_profiles_dir / "iso_42001-global.yaml")
+    compile_pass_criteria.cache_clear()
+
+    compiled = registry.compile_profile(profile)
+
+    assert compiled > 0
+    assert compile_pass_criteria.cache_info().currsize == compiled
+
+
+def test_preload_skips_profiles_whose_rules_fail_to_compile(data_profiles_dir, monkeypatch):
+    def broken(profile):
+        raise SyntaxError("bad pass_criteria")
+
+    monkeypatch.setattr(registry, "compile_profile", broken)
+
+    result = registry.preload(data_profiles_dir)
+
+    assert result["profiles"] == []
+    assert "iso_42001-global" in result["skipped"]
@@ -0,0 +1,101 @@
+import os
+import shutil
+
+from policyengine import rules_catalog
+from policyengine.models import EvalRequest, EvalResponse
+from services.policyengine_svc.result_cache import (
+    ResultCache,
+    etag_matches,
+    request_key,
+)
+
+
+def _response(ref="p@1"):
+    return EvalResponse.model_validate(
+        {
+            "profile_ref": ref,
+            "summary": {"score": 1.0, "verdict": "pass", "finding_count": 0, "profile_ref": ref},
+        }
+    )
+
+
+def test_ttl_expiry_and_lru_eviction():
+    now = [0.0]
+    cache = ResultCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", _response())
+    cache.put("b", _response())
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", _response())
+
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_request_key_is_canonical():
+    base = {
+        "profile_ref": "iso_42001-global@1.2.0",
+        "context": {"a": 1, "b": 2},
+        "evidence": {"x": [1]},
+    }
+    reordered = {
+        "profile_ref": "iso_42001-global@1.2.0",
+        "context": {"b": 2, "a": 1},
+        "evidence": {"x": [1]},
+    }
+    changed = dict(base, evidence={"x": [2]})
+
+    key = request_key(EvalRequest.model_validate(base))
+    assert key == request_key(EvalRequest.model_validate(reordered))
+    assert key != request_key(EvalRequest.model_validate(changed))
+
+
+def test_request_key_changes_when_a_referenced_rule_changes(tmp_path, monkeypatch):
+    rules_dir = tmp_path / "rules"
+    shutil.copytree(rules_catalog.RULES_DIR, rules_dir)
+    monkeypatch.setattr(rules_catalog, "RULES_DIR", rules_dir)
+    request = EvalRequest(profile_ref="iso_42001-global@1.2.0")
+    key = request_key(request)
+
+    rule = rules_dir / "bias_fairness.yaml"
+    rule.write_text(rule.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+    os.utime(rule, ns=(rule.stat().st_atime_ns, rule.stat().st_mtime_ns + 10**9))
+
+    assert request_key(request) != key
+
+
+def test_request_key_changes_when_evidence_changes_under_the_same_spec(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVIDENCE_ROOT", str(tmp_path))
+    card = tmp_path / "cards" / "model.json"
+    card.parent.mkdir()
+    card.write_text('{"name": "m1"}', encoding="utf-8")
+    request = EvalRequest(
+        profile_ref="iso_42001-global@1.2.0",
+        evidence={
+            "card": {"type": "blob_uri", "uri": "cards/model.json"},
+            "cards": {"type": "blob_uri", "pattern": "cards/*.json"},
+        },
+    )
+    key = request_key(request)
+    assert request_key(request) == key
+
+    card.write_text('{"name": "m2"}', encoding="utf-8")
+    os.utime(card, ns=(card.stat().st_atime_ns, card.stat().st_mtime_ns + 10**9))
+    changed = request_key(request)
+    assert changed != key
+
+    (tmp_path / "cards" / "other.json").write_text("{}", encoding="utf-8")
+    assert request_key(request) != changed
+
+
+def test_etag_matching():
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
@@ -0,0 +1,61 @@
+import pytest
+
+from policyengine import evaluate
+from policyengine.exceptions import UnknownControlError
+from policyengine.rules_engine import select_rules
+from policyengine.schema import PolicyProfile
+
+
+def _profile():
+    return PolicyProfile.model_validate(
+        {
+            "profile_id": "p",
+            "version": "1",
+            "rules": [
+                {"id": "inventory"},
+                {"id": "encryption", "controls": ["SC-13", "SC-28"], "depends_on": ["inventory"]},
+                {"id": "logging", "controls": ["AU-2"]},
+                {"id": "retention", "depends_on": ["logging"]},
+            ],
+        }
+    )
+
+
+def test_index_maps_rule_and_control_ids():
+    index = _profile().rule_index()
+
+    assert index["encryption"] == index["SC-13"] == index["SC-28"] == [1]
+    assert index["AU-2"] == [2]
+
+
+def test_select_rules_adds_dependencies_in_profile_order():
+    profile = _profile()
+
+    assert select_rules(profile, None) is None
+    assert select_rules(profile, ["SC-28"]) == [0, 1]
+    assert select_rules(profile, ["retention", "inventory"]) == [0, 2, 3]
+
+
+def test_unknown_controls_are_rejected():
+    with pytest.raises(UnknownControlError) as exc:
+        select_rules(_profile(), ["SC-13", "XX-1"])
+
+    assert exc.value.controls == ["XX-1"]
+
+
+def test_empty_controls_are_rejected_not_passed():
+    with pytest.raises(UnknownControlError, match="No controls requested"):
+        select_rules(_profile(), [])
+    with pytest.raises(UnknownControlError):
+        evaluate("iso_42001-global@1.2.0", {"system_id": "demo"}, {}, controls=[])
+
+
+def test_evaluate_runs_only_selected_rules():
+    full = evaluate("iso_42001-global@1.2.0", {"system_id": "demo"}, {})
+    subset = evaluate(
+        "iso_42001-global@1.2.0", {"system_id": "demo"}, {}, controls=["ISO42001-6.3.2", "pii"]
+    )
+
+    assert len(full["findings"]) > 2
+    assert [f.id for f in subset["findings"]] == ["bias_fairness", "pii"]
+    assert subset["summary"]["finding_count"] == 2
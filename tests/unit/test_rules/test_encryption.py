@@ -0,0 +1,111 @@
+import pytest
+
+from policyengine.ops import encryption
+from policyengine.rules_engine import evaluate_rule
+
+PARAMS = {"require_tls_min": "1.2", "require_kms": True, "disallow_http": True}
+
+ENDPOINTS = [
+    {
+        "id": "api",
+        "system_id": "sys-1",
+        "url": "https://api",
+        "tls_version": "1.3",
+        "cipher": "TLS_AES_256_GCM_SHA384",
+        "kms_key_ref": "kv/key-1",
+    },
+    {
+        "id": "blob",
+        "system_id": "sys-1",
+        "scheme": "https",
+        "tls_version": "TLSv1.2",
+        "kms_key_ref": "kv/key-1",
+    },
+    {
+        "id": "legacy",
+        "system_id": "sys-2",
+        "scheme": "https",
+        "tls_version": "1.0",
+        "kms_key_ref": "kv/key-2",
+    },
+    {"id": "plain", "system_id": "sys-2", "url": "http://plain", "kms_key_ref": "kv/gone"},
+    {
+        "id": "rc4",
+        "system_id": "sys-3",
+        "scheme": "https",
+        "tls_version": "1.2",
+        "cipher": "RC4-SHA",
+        "kms_key_ref": "kv/key-1",
+    },
+]
+KEYS = [{"id": "kv/key-1"}, {"id": "kv/key-2"}, {"id": "kv/gone", "enabled": False}]
+
+
+def test_normalize_endpoints_builds_columns():
+    cols = encryption.normalize_endpoints(ENDPOINTS, KEYS)
+
+    assert len(cols) == 5
+    assert cols.systems == ["sys-1", "sys-2", "sys-3"]
+    assert list(cols.tls) == [13, 12, 10, 0, 12]
+    assert list(cols.kms) == [1, 1, 1, 0, 1]
+    assert cols.scheme[3] == encryption.SCHEME_HTTP
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_compute_signals_per_system(use_numpy):
+    if use_numpy and encryption.np is None:
+        pytest.skip("numpy not installed")
+
+    cols = encryption.normalize_endpoints(ENDPOINTS, KEYS)
+    signals = encryption.compute_signals(cols, PARAMS, use_numpy=use_numpy)
+
+    assert signals["sys-1"] == {"TLS_OK": True, "KMS_PRESENT": True, "HTTP_ENDPOINTS": []}
+    assert signals["sys-2"] == {"TLS_OK": False, "KMS_PRESENT": False, "HTTP_ENDPOINTS": ["plain"]}
+    assert signals["sys-3"]["TLS_OK"] is False
+
+
+def test_evaluate_fleet_batches_match_single_pass():
+    cols = encryption.normalize_endpoints(ENDPOINTS, KEYS)
+    expected = encryption.compute_signals(cols, PARAMS)
+
+    assert encryption.evaluate_fleet(ENDPOINTS, PARAMS, KEYS, batch_size=2) == expected
+
+
+def test_encryption_rule_uses_op():
+    finding = evaluate_rule(
+        rule_id="encryption",
+        params={"severity": "high", "title": "Encryption"},
+        context={"system_id": "sys-2"},
+        evidence={"encryption": {"endpoints": ENDPOINTS, "keys": KEYS}},
+    )
+
+    assert finding.status == "fail"
+    assert finding.data["signals"]["HTTP_ENDPOINTS"] == ["plain"]
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_unknown_scheme_endpoints_are_not_compliant(use_numpy):
+    if use_numpy and encryption.np is None:
+        pytest.skip("numpy not installed")
+
+    endpoints = [
+        {"id": "ftp", "system_id": "sys-4", "url": "ftp://files", "kms_key_ref": "kv/key-1"},
+        {"id": "bare", "system_id": "sys-5", "kms_key_ref": "kv/key-1"},
+    ]
+    cols = encryption.normalize_endpoints(endpoints, KEYS)
+    signals = encryption.compute_signals(cols, PARAMS, use_numpy=use_numpy)
+
+    assert signals["sys-4"]["TLS_OK"] is False
+    assert signals["sys-5"]["TLS_OK"] is False
+
+
+def test_system_without_endpoints_fails_even_without_kms_requirement():
+    finding = evaluate_rule(
+        rule_id="encryption",
+        params={"severity": "high", "title": "Encryption", "require_kms": False},
+        context={"system_id": "sys-unknown"},
+        evidence={"encryption": {"endpoints": ENDPOINTS, "keys": KEYS}},
+    )
+
+    assert finding.status == "fail"
+    assert finding.data["signals"]["TLS_OK"] is False
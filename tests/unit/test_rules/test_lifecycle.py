@@ -0,0 +1,70 @@
+from policyengine.ops import lifecycle
+from policyengine.rules_engine import evaluate_rule
+
+LISTING = [
+    {"system_id": "sys-1", "artifact_type": "dpia", "timestamp": "2025-01-01T00:00:00Z"},
+    {"system_id": "sys-1", "artifact_type": "dpia", "timestamp": "2025-03-01T00:00:00Z"},
+    {"system_id": "sys-1", "artifact_type": "model_card", "timestamp": "2025-02-01T00:00:00Z"},
+    {
+        "system_id": "sys-1",
+        "artifact_type": "gate_approval",
+        "status": "approved",
+        "timestamp": "2025-03-02T00:00:00Z",
+    },
+    {"system_id": "sys-2", "artifact_type": "raichecklist", "timestamp": "2025-01-05T00:00:00Z"},
+    {"path": "mlops/lifecycle/raichecklist.json", "timestamp": "2024-12-01T00:00:00Z"},
+]
+
+
+def test_manifest_index_keeps_latest_artifact_per_type():
+    index = lifecycle.build_manifest_index(LISTING)
+
+    assert index["sys-1"]["dpia"]["timestamp"] == "2025-03-01T00:00:00Z"
+    assert set(index["sys-2"]) == {"raichecklist"}
+    assert set(index[lifecycle.ANY_SYSTEM]) == {"raichecklist"}
+
+
+def test_manifest_index_is_cached_by_listing_digest():
+    lifecycle.clear_manifest_cache()
+
+    first = lifecycle.get_manifest_index(list(LISTING))
+    second = lifecycle.get_manifest_index([dict(r) for r in LISTING])
+
+    assert first is second
+
+
+def test_lifecycle_rule_passes_with_all_artifacts_and_approval():
+    finding = evaluate_rule(
+        rule_id="lifecycle",
+        params={"severity": "high", "title": "Lifecycle gates"},
+        context={"system_id": "sys-1"},
+        evidence={"lifecycle": LISTING},
+    )
+
+    assert finding.status == "pass"
+    assert finding.data["signals"]["ARTIFACT_GAPS"] == []
+    assert finding.data["signals"]["GATE_STATUS"] == "approved"
+
+
+def test_lifecycle_rule_fails_on_gaps():
+    finding = evaluate_rule(
+        rule_id="lifecycle",
+        params={"severity": "high", "title": "Lifecycle gates"},
+        context={"system_id": "sys-2"},
+        evidence={"lifecycle": LISTING},
+    )
+
+    assert finding.status == "fail"
+    assert finding.data["signals"]["ARTIFACT_GAPS"] == ["dpia", "model_card"]
+    assert finding.data["signals"]["GATE_STATUS"] == "pending"
+
+
+def test_lifecycle_rule_warns_without_evidence():
+    finding = evaluate_rule(
+        rule_id="lifecycle",
+        params={"severity": "high", "title": "Lifecycle gates"},
+        context={"system_id": "sys-1"},
+        evidence={},
+    )
+
+    assert finding.status == "warn"
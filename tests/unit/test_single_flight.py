@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.policyengine_svc.single_flight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers=5):
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, fn) for _ in range(callers)]
+        while flight.stats()["calls"] < callers:
+            pass
+        return futures
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"verdict": "pass"}
+
+    futures = _run_concurrently(flight, "k", compute)
+    release.set()
+    results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    stats = flight.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["dedup_ratio"] == pytest.approx(0.8)
+    assert stats["in_flight"] == 0
+
+    # The key is released once the leader finishes.
+    assert flight.do("k", lambda: "fresh") == "fresh"
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise ValueError("boom")
+
+    futures = _run_concurrently(flight, "k", compute, callers=3)
+    release.set()
+
+    for future in futures:
+        with pytest.raises(ValueError, match="boom"):
+            future.result()
+
+
+def test_waiter_times_out_on_a_hung_leader():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def hung():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    leader = threading.Thread(target=flight.do, args=("k", hung))
+    leader.start()
+    started.wait(5)
+    with pytest.raises(TimeoutError):
+        flight.do("k", hung, timeout=0.05)
+    release.set()
+    leader.join(5)
+    assert flight.stats()["timeouts"] == 1
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from policyengine import profiles, rules_catalog, snapshot
+
+
+@pytest.fixture
+def attached(tmp_path, data_profiles_dir):
+    path = tmp_path / "registry.snap"
+    snapshot.build_snapshot(path, profiles_dir=data_profiles_dir)
+    snap = snapshot.attach(path)
+    profiles._parse_profile.cache_clear()
+    rules_catalog.parse_rule_file.cache_clear()
+    yield snap
+    snapshot.detach()
+    profiles._parse_profile.cache_clear()
+    rules_catalog.parse_rule_file.cache_clear()
+
+
+def test_lookups_are_served_from_snapshot(attached, data_profiles_dir):
+    expected = profiles.PolicyProfile.model_validate(
+        profiles.yaml.safe_load(
+            (data_profiles_dir / "iso_42001-global.yaml").read_text(encoding="utf-8")
+        )
+    )
+
+    profile = profiles.load_profile_file(data_profiles_dir / "iso_42001-global.yaml")
+    definition = rules_catalog.load_rule_definition(profile.rules[0].id)
+
+    assert profile == expected
+    assert definition is not None and definition.rule_id == profile.rules[0].id
+    assert attached.stats()["hits"] == 2
+    assert snapshot.is_current(attached, profiles_dir=data_profiles_dir)
+
+
+def test_edited_file_falls_back_to_yaml(tmp_path):
+    profiles_dir = tmp_path / "profiles"
+    profiles_dir.mkdir()
+    source = profiles_dir / "p.yaml"
+    source.write_text("profile_id: p\nversion: '1'\n", encoding="utf-8")
+    snap_path = tmp_path / "registry.snap"
+    snapshot.build_snapshot(snap_path, profiles_dir=profiles_dir)
+    snap = snapshot.RegistrySnapshot(snap_path)
+
+    assert snap.profile(str(source), source.stat().st_mtime_ns).version == "1"
+
+    source.write_text("profile_id: p\nversion: '2'\n", encoding="utf-8")
+    os.utime(source, ns=(0, source.stat().st_mtime_ns + 1))
+
+    assert snap.profile(str(source), source.stat().st_mtime_ns) is None
+    assert not snapshot.is_current(snap, profiles_dir=profiles_dir)
+    snap.close()
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "not-a-snapshot"
+    path.write_bytes(b"hello world, definitely not a snapshot")
+
+    with pytest.raises(ValueError):
+        snapshot.RegistrySnapshot(path)
@@ -0,0 +1,22 @@
+from policyengine import evaluate, timing
+
+
+def test_evaluate_records_phases_only_when_recording():
+    assert timing.current() is timing.NULL_TIMER
+
+    with timing.record(per_rule=True) as timer:
+        evaluate("iso_42001-global@1.2.0", {"system_id": "demo"}, {})
+
+    assert {"profile", "rules", "scoring"} <= set(timer.phases)
+    assert len(timer.rules) == 18
+    assert timing.current() is timing.NULL_TIMER
+
+
+def test_server_timing_header_format():
+    timer = timing.PhaseTimer()
+    timer.add("rules", 0.0125)
+    timer.add("rules", 0.0025)
+    timer.add("profile", 0.001)
+
+    assert timer.server_timing() == "rules;dur=15.000, profile;dur=1.000"
+    assert "rules_ms" not in timer.as_dict()